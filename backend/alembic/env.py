@@ -7,7 +7,7 @@ from app.db.base import Base
 from app.core.config import settings
 
 # Import all models to ensure they are registered with Base.metadata
-from app.models import User, Session, Photo, EditHistory
+from app.models import User, Session, Photo, EditHistory, ChangeLog, PhotoFacet
 
 config = context.config
 # Convert async URL to sync URL for Alembic
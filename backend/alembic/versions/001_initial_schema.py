@@ -28,7 +28,7 @@ def upgrade() -> None:
     sa.Column('name', sa.String(length=100), nullable=False),
     sa.Column('email', sa.String(length=255), nullable=False),
     sa.Column('password_hash', sa.String(length=255), nullable=False),
-    sa.Column('role', sa.Enum('teacher', 'student', name='user_role'), nullable=False),
+    sa.Column('role', postgresql.ENUM('teacher', 'student', name='user_role', create_type=False), nullable=False),
     sa.Column('teacher_id', postgresql.UUID(as_uuid=True), nullable=True),
     sa.Column('is_active', sa.Boolean(), nullable=False, server_default='true'),
     sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
@@ -0,0 +1,43 @@
+"""Edit history compaction: delta column and (photo_id, created_at) index.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "edit_history",
+        sa.Column("delta", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    # The composite index also serves photo_id-only lookups
+    op.create_index(
+        "idx_edit_history_photo_created",
+        "edit_history",
+        ["photo_id", "created_at"],
+        unique=False,
+    )
+    op.drop_index("idx_edit_history_photo_id", table_name="edit_history")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "idx_edit_history_photo_id", "edit_history", ["photo_id"], unique=False
+    )
+    op.drop_index("idx_edit_history_photo_created", table_name="edit_history")
+    op.drop_column("edit_history", "delta")
@@ -0,0 +1,29 @@
+"""Add sessions.updated_at for list ETags.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sessions", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE sessions SET updated_at = created_at")
+    op.alter_column("sessions", "updated_at", nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column("sessions", "updated_at")
@@ -0,0 +1,49 @@
+"""Search indexes: pg_trgm on photo title/topic, GIN on session keywords.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "idx_photos_title_trgm",
+        "photos",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "idx_photos_topic_trgm",
+        "photos",
+        ["topic"],
+        postgresql_using="gin",
+        postgresql_ops={"topic": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "idx_sessions_keywords",
+        "sessions",
+        [sa.text("(keywords::jsonb)")],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_sessions_keywords", table_name="sessions")
+    op.drop_index("idx_photos_topic_trgm", table_name="photos")
+    op.drop_index("idx_photos_title_trgm", table_name="photos")
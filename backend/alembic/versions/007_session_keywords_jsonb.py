@@ -0,0 +1,112 @@
+"""Session keywords: JSON -> JSONB with a jsonb_path_ops GIN index (online).
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 18:00:00.000000
+
+``ALTER COLUMN ... TYPE jsonb`` would rewrite the table under an ACCESS
+EXCLUSIVE lock, so the conversion is done online instead:
+
+1. add a nullable ``keywords_jsonb`` column, kept in sync for concurrent
+   writes by a trigger;
+2. backfill it in short autocommitted batches (BACKFILL_BATCH_SIZE rows)
+   until no NULL row is left;
+3. build the GIN index CONCURRENTLY;
+4. swap the columns in one short transaction. NOT NULL is proven through a
+   validated CHECK constraint, so SET NOT NULL does not rescan the table.
+
+The application keeps writing ``keywords`` throughout; deploy the code that
+expects JSONB after this migration has finished.
+"""
+
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+BACKFILL_RETRY_SECONDS = 0.1
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sessions",
+        sa.Column("keywords_jsonb", sa.dialects.postgresql.JSONB(), nullable=True),
+    )
+    op.execute(
+        """
+        CREATE FUNCTION sessions_keywords_jsonb_sync() RETURNS trigger AS $$
+        BEGIN
+            NEW.keywords_jsonb := NEW.keywords::jsonb;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER sessions_keywords_jsonb_sync BEFORE INSERT OR UPDATE OF keywords "
+        "ON sessions FOR EACH ROW EXECUTE FUNCTION sessions_keywords_jsonb_sync()"
+    )
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        # FOR NO KEY UPDATE does not conflict with the FOR KEY SHARE locks
+        # taken by FK checks (photo uploads); rows locked by other session
+        # updates are skipped and retried until none are left
+        backfill = sa.text(
+            "UPDATE sessions SET keywords_jsonb = keywords::jsonb "
+            "WHERE id IN (SELECT id FROM sessions WHERE keywords_jsonb IS NULL "
+            "LIMIT :batch FOR NO KEY UPDATE SKIP LOCKED)"
+        )
+        remaining = sa.text(
+            "SELECT EXISTS (SELECT 1 FROM sessions WHERE keywords_jsonb IS NULL)"
+        )
+        while connection.execute(remaining).scalar():
+            if not connection.execute(backfill, {"batch": BACKFILL_BATCH_SIZE}).rowcount:
+                time.sleep(BACKFILL_RETRY_SECONDS)
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sessions_keywords_path "
+            "ON sessions USING gin (keywords_jsonb jsonb_path_ops)"
+        )
+        op.execute(
+            "ALTER TABLE sessions ADD CONSTRAINT sessions_keywords_jsonb_not_null "
+            "CHECK (keywords_jsonb IS NOT NULL) NOT VALID"
+        )
+        # Only SHARE UPDATE EXCLUSIVE: writes continue while this scans
+        op.execute(
+            "ALTER TABLE sessions VALIDATE CONSTRAINT sessions_keywords_jsonb_not_null"
+        )
+
+    # Swap: metadata-only changes under a brief exclusive lock
+    op.execute("DROP TRIGGER sessions_keywords_jsonb_sync ON sessions")
+    op.execute("DROP FUNCTION sessions_keywords_jsonb_sync()")
+    op.alter_column("sessions", "keywords_jsonb", nullable=False)
+    op.drop_constraint("sessions_keywords_jsonb_not_null", "sessions", type_="check")
+    # Also drops 006's (keywords::jsonb) expression index
+    op.drop_column("sessions", "keywords")
+    op.alter_column("sessions", "keywords_jsonb", new_column_name="keywords")
+    op.execute("ALTER INDEX idx_sessions_keywords_path RENAME TO idx_sessions_keywords")
+
+
+def downgrade() -> None:
+    op.drop_index("idx_sessions_keywords", table_name="sessions")
+    op.alter_column(
+        "sessions",
+        "keywords",
+        type_=sa.JSON(),
+        postgresql_using="keywords::json",
+    )
+    op.create_index(
+        "idx_sessions_keywords",
+        "sessions",
+        [sa.text("(keywords::jsonb)")],
+        postgresql_using="gin",
+    )
@@ -0,0 +1,143 @@
+"""Photo facet counts maintained by triggers.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 20:00:00.000000
+
+The table is backfilled from existing photos after the triggers are in
+place, inside the same transaction, so no write is counted twice or missed.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACET_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION photo_facets_bump(
+        p_user uuid, p_topic text, p_created timestamp, p_session uuid, p_delta integer
+    ) RETURNS void AS $$
+        INSERT INTO photo_facets (user_id, facet, value, count)
+        SELECT p_user, f.facet, f.value, p_delta
+        FROM (
+            VALUES ('total', ''), ('month', to_char(p_created, 'YYYY-MM'))
+            UNION ALL
+            SELECT 'topic', p_topic WHERE p_topic IS NOT NULL
+            UNION ALL
+            SELECT DISTINCT 'keyword', k.value
+            FROM sessions s, jsonb_array_elements_text(s.keywords) AS k(value)
+            WHERE s.id = p_session
+        ) AS f(facet, value)
+        ON CONFLICT (user_id, facet, value)
+        DO UPDATE SET count = photo_facets.count + EXCLUDED.count
+    $$ LANGUAGE sql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION photos_facets_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE'
+            AND (OLD.user_id, OLD.topic, OLD.created_at, OLD.session_id)
+                IS NOT DISTINCT FROM (NEW.user_id, NEW.topic, NEW.created_at, NEW.session_id)
+        THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM photo_facets_bump(OLD.user_id, OLD.topic, OLD.created_at, OLD.session_id, -1);
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            PERFORM photo_facets_bump(NEW.user_id, NEW.topic, NEW.created_at, NEW.session_id, 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER photos_facets_sync
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, topic, created_at, session_id ON photos
+    FOR EACH ROW EXECUTE FUNCTION photos_facets_sync()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION sessions_facets_sync() RETURNS trigger AS $$
+    BEGIN
+        IF OLD.keywords IS NOT DISTINCT FROM NEW.keywords THEN
+            RETURN NULL;
+        END IF;
+        INSERT INTO photo_facets (user_id, facet, value, count)
+        SELECT p.user_id, 'keyword', k.value, sum(k.delta)
+        FROM photos p
+        CROSS JOIN (
+            SELECT value, -1 AS delta FROM jsonb_array_elements_text(OLD.keywords)
+            UNION ALL
+            SELECT value, 1 FROM jsonb_array_elements_text(NEW.keywords)
+        ) AS k
+        WHERE p.session_id = NEW.id
+        GROUP BY p.user_id, k.value
+        HAVING sum(k.delta) <> 0
+        ON CONFLICT (user_id, facet, value)
+        DO UPDATE SET count = photo_facets.count + EXCLUDED.count;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER sessions_facets_sync
+    AFTER UPDATE OF keywords ON sessions
+    FOR EACH ROW EXECUTE FUNCTION sessions_facets_sync()
+    """,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "photo_facets",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("facet", sa.String(length=10), nullable=False),
+        sa.Column("value", sa.Text(), nullable=False),
+        sa.Column("count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "facet", "value"),
+    )
+    # Blocks photo/session writes until commit, so the backfill is exact
+    op.execute("LOCK TABLE photos, sessions IN SHARE MODE")
+    for statement in FACET_TRIGGERS:
+        op.execute(statement)
+    op.execute(
+        """
+        INSERT INTO photo_facets (user_id, facet, value, count)
+        SELECT user_id, facet, value, count(*)
+        FROM (
+            SELECT user_id, 'total' AS facet, '' AS value FROM photos
+            UNION ALL
+            SELECT user_id, 'month', to_char(created_at, 'YYYY-MM') FROM photos
+            UNION ALL
+            SELECT user_id, 'topic', topic FROM photos WHERE topic IS NOT NULL
+            UNION ALL
+            SELECT user_id, 'keyword', value
+            FROM (
+                SELECT DISTINCT p.id, p.user_id, k.value
+                FROM photos p
+                JOIN sessions s ON s.id = p.session_id
+                CROSS JOIN jsonb_array_elements_text(s.keywords) AS k(value)
+            ) AS photo_keywords
+        ) AS f
+        GROUP BY user_id, facet, value
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER sessions_facets_sync ON sessions")
+    op.execute("DROP TRIGGER photos_facets_sync ON photos")
+    op.execute("DROP FUNCTION sessions_facets_sync()")
+    op.execute("DROP FUNCTION photos_facets_sync()")
+    op.execute("DROP FUNCTION photo_facets_bump(uuid, text, timestamp, uuid, integer)")
+    op.drop_table("photo_facets")
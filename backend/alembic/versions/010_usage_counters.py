@@ -0,0 +1,164 @@
+"""Maintained photo_count/bytes_used on users and sessions.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 22:00:00.000000
+
+photos.size_bytes of existing photos is read from the uploaded files (0
+when the file is missing) in short autocommitted batches
+(SIZE_BATCH_SIZE photos) while uploads continue. Then photos is locked
+(SHARE: writes wait, reads continue) only to stat the photos added with
+size 0 meanwhile by the running old code, install the trigger and
+backfill the counters, so no write is counted twice or missed.
+
+Photos whose file was missing keep size 0. Once the files are restored,
+``python -m app.services.usage_counters --restat-sizes`` fills them in
+(the trigger adjusts the counters).
+"""
+
+import os
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Original URLs are /uploads/photos/<user>/<file>, stored under backend/uploads
+UPLOAD_ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+
+SIZE_BATCH_SIZE = 1000
+
+_SET_SIZE = sa.text("UPDATE photos SET size_bytes = :size WHERE id = :id AND size_bytes = 0")
+
+USAGE_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION photos_usage_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE'
+            AND (OLD.user_id, OLD.session_id, OLD.size_bytes)
+                IS NOT DISTINCT FROM (NEW.user_id, NEW.session_id, NEW.size_bytes)
+        THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE users
+            SET photo_count = photo_count - 1, bytes_used = bytes_used - OLD.size_bytes
+            WHERE id = OLD.user_id;
+            UPDATE sessions
+            SET photo_count = photo_count - 1, bytes_used = bytes_used - OLD.size_bytes,
+                updated_at = now() AT TIME ZONE 'utc'
+            WHERE id = OLD.session_id;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            UPDATE users
+            SET photo_count = photo_count + 1, bytes_used = bytes_used + NEW.size_bytes
+            WHERE id = NEW.user_id;
+            UPDATE sessions
+            SET photo_count = photo_count + 1, bytes_used = bytes_used + NEW.size_bytes,
+                updated_at = now() AT TIME ZONE 'utc'
+            WHERE id = NEW.session_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER photos_usage_sync
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, session_id, size_bytes ON photos
+    FOR EACH ROW EXECUTE FUNCTION photos_usage_sync()
+    """,
+)
+
+COUNTER_COLUMNS = (
+    ("users", "photo_count", sa.Integer()),
+    ("users", "bytes_used", sa.BigInteger()),
+    ("sessions", "photo_count", sa.Integer()),
+    ("sessions", "bytes_used", sa.BigInteger()),
+)
+
+
+def _file_size(original_url: str) -> int:
+    path = os.path.join(UPLOAD_ROOT, original_url.lstrip("/"))
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _set_sizes(conn, photos, missing: set) -> None:
+    """Store the file sizes of ``photos``; remember those without a file."""
+    sizes = []
+    for photo in photos:
+        if size := _file_size(photo.original_url):
+            sizes.append({"id": photo.id, "size": size})
+        else:
+            missing.add(photo.id)
+    if sizes:
+        conn.execute(_SET_SIZE, sizes)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "photos",
+        sa.Column("size_bytes", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+    )
+    for table, name, type_ in COUNTER_COLUMNS:
+        op.add_column(
+            table, sa.Column(name, type_, server_default=sa.text("0"), nullable=False)
+        )
+    # Photos already checked whose file is missing; not checked again under the lock
+    missing = set()
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        batch = sa.text(
+            "SELECT id, original_url FROM photos WHERE size_bytes = 0 AND id > :after "
+            "ORDER BY id LIMIT :batch"
+        )
+        last_id = uuid.UUID(int=0)
+        while True:
+            photos = conn.execute(batch, {"after": last_id, "batch": SIZE_BATCH_SIZE}).all()
+            if not photos:
+                break
+            _set_sizes(conn, photos, missing)
+            last_id = photos[-1].id
+
+    # Blocks photo writes until commit, so the counter backfill is exact
+    op.execute("LOCK TABLE photos IN SHARE MODE")
+    conn = op.get_bind()
+    # Uploaded by the old code since the scan, without a size
+    added = conn.execute(
+        sa.text("SELECT id, original_url FROM photos WHERE size_bytes = 0")
+    ).all()
+    _set_sizes(conn, [photo for photo in added if photo.id not in missing], missing)
+
+    for statement in USAGE_TRIGGERS:
+        op.execute(statement)
+    for table, key in (("users", "user_id"), ("sessions", "session_id")):
+        op.execute(
+            f"""
+            UPDATE {table} t
+            SET photo_count = p.photo_count, bytes_used = p.bytes_used
+            FROM (
+                SELECT {key} AS id, count(*) AS photo_count, sum(size_bytes) AS bytes_used
+                FROM photos
+                WHERE {key} IS NOT NULL
+                GROUP BY {key}
+            ) AS p
+            WHERE t.id = p.id
+            """
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER photos_usage_sync ON photos")
+    op.execute("DROP FUNCTION photos_usage_sync()")
+    for table, name, _type in reversed(COUNTER_COLUMNS):
+        op.drop_column(table, name)
+    op.drop_column("photos", "size_bytes")
@@ -0,0 +1,61 @@
+"""Lock the session row when photo_facets_bump reads its keywords.
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-20 09:00:00.000000
+
+Without the lock, a photo insert and a concurrent keyword update each
+applied their keyword deltas against the other's old state and the
+counts drifted. Run ``python -m app.services.facet_counts`` once after
+upgrading to repair counts that already drifted.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _bump(keyword_source: str) -> str:
+    return f"""
+    CREATE OR REPLACE FUNCTION photo_facets_bump(
+        p_user uuid, p_topic text, p_created timestamp, p_session uuid, p_delta integer
+    ) RETURNS void AS $$
+        INSERT INTO photo_facets (user_id, facet, value, count)
+        SELECT p_user, f.facet, f.value, p_delta
+        FROM (
+            VALUES ('total', ''), ('month', to_char(p_created, 'YYYY-MM'))
+            UNION ALL
+            SELECT 'topic', p_topic WHERE p_topic IS NOT NULL
+            UNION ALL
+            SELECT DISTINCT 'keyword', k.value
+            FROM {keyword_source}
+        ) AS f(facet, value)
+        ON CONFLICT (user_id, facet, value)
+        DO UPDATE SET count = photo_facets.count + EXCLUDED.count
+    $$ LANGUAGE sql
+    """
+
+
+def upgrade() -> None:
+    op.execute(
+        _bump(
+            "(SELECT keywords FROM sessions WHERE id = p_session FOR NO KEY UPDATE) AS s, "
+            "jsonb_array_elements_text(s.keywords) AS k(value)"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        _bump(
+            "sessions s, jsonb_array_elements_text(s.keywords) AS k(value) "
+            "WHERE s.id = p_session"
+        )
+    )
@@ -0,0 +1,145 @@
+"""Take photo trigger locks in one order: sessions, photo_facets, users.
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-20 10:00:00.000000
+
+photos_facets_sync (which fires first) locked facet rows before
+photos_usage_sync updated the session, while a keyword update locks the
+session before its facet rows; concurrently the two deadlocked. Moves now
+lock both sessions in id order up front, and photos_usage_sync updates the
+session before the user.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UPGRADE = (
+    """
+    CREATE OR REPLACE FUNCTION photos_facets_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE'
+            AND (OLD.user_id, OLD.topic, OLD.created_at, OLD.session_id)
+                IS NOT DISTINCT FROM (NEW.user_id, NEW.topic, NEW.created_at, NEW.session_id)
+        THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'UPDATE' AND OLD.session_id IS DISTINCT FROM NEW.session_id THEN
+            -- A move locks both sessions in id order before any facet row,
+            -- like every other writer (see photos_usage_sync)
+            PERFORM 1 FROM sessions WHERE id IN (OLD.session_id, NEW.session_id)
+            ORDER BY id FOR NO KEY UPDATE;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM photo_facets_bump(OLD.user_id, OLD.topic, OLD.created_at, OLD.session_id, -1);
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            PERFORM photo_facets_bump(NEW.user_id, NEW.topic, NEW.created_at, NEW.session_id, 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION photos_usage_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE'
+            AND (OLD.user_id, OLD.session_id, OLD.size_bytes)
+                IS NOT DISTINCT FROM (NEW.user_id, NEW.session_id, NEW.size_bytes)
+        THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE sessions
+            SET photo_count = photo_count - 1, bytes_used = bytes_used - OLD.size_bytes,
+                updated_at = now() AT TIME ZONE 'utc'
+            WHERE id = OLD.session_id;
+            UPDATE users
+            SET photo_count = photo_count - 1, bytes_used = bytes_used - OLD.size_bytes
+            WHERE id = OLD.user_id;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            UPDATE sessions
+            SET photo_count = photo_count + 1, bytes_used = bytes_used + NEW.size_bytes,
+                updated_at = now() AT TIME ZONE 'utc'
+            WHERE id = NEW.session_id;
+            UPDATE users
+            SET photo_count = photo_count + 1, bytes_used = bytes_used + NEW.size_bytes
+            WHERE id = NEW.user_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+)
+
+DOWNGRADE = (
+    """
+    CREATE OR REPLACE FUNCTION photos_facets_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE'
+            AND (OLD.user_id, OLD.topic, OLD.created_at, OLD.session_id)
+                IS NOT DISTINCT FROM (NEW.user_id, NEW.topic, NEW.created_at, NEW.session_id)
+        THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM photo_facets_bump(OLD.user_id, OLD.topic, OLD.created_at, OLD.session_id, -1);
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            PERFORM photo_facets_bump(NEW.user_id, NEW.topic, NEW.created_at, NEW.session_id, 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION photos_usage_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE'
+            AND (OLD.user_id, OLD.session_id, OLD.size_bytes)
+                IS NOT DISTINCT FROM (NEW.user_id, NEW.session_id, NEW.size_bytes)
+        THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE users
+            SET photo_count = photo_count - 1, bytes_used = bytes_used - OLD.size_bytes
+            WHERE id = OLD.user_id;
+            UPDATE sessions
+            SET photo_count = photo_count - 1, bytes_used = bytes_used - OLD.size_bytes,
+                updated_at = now() AT TIME ZONE 'utc'
+            WHERE id = OLD.session_id;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            UPDATE users
+            SET photo_count = photo_count + 1, bytes_used = bytes_used + NEW.size_bytes
+            WHERE id = NEW.user_id;
+            UPDATE sessions
+            SET photo_count = photo_count + 1, bytes_used = bytes_used + NEW.size_bytes,
+                updated_at = now() AT TIME ZONE 'utc'
+            WHERE id = NEW.session_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+)
+
+
+def upgrade() -> None:
+    for statement in UPGRADE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in DOWNGRADE:
+        op.execute(statement)
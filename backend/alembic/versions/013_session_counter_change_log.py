@@ -0,0 +1,123 @@
+"""Log a change_log upsert for sessions whose photo counters change.
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-21 10:00:00.000000
+
+photos_usage_sync moves sessions.photo_count and updated_at, but only the
+API wrote change_log rows, so /sync clients kept stale counts. The trigger
+now logs one sessions upsert per session and transaction.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UPGRADE = (
+    """
+    CREATE OR REPLACE FUNCTION change_log_session_upsert(p_user uuid, p_session uuid)
+    RETURNS void AS $$
+        INSERT INTO change_log (user_id, entity, entity_id, op)
+        SELECT p_user, 'sessions', p_session, 'upsert'
+        WHERE NOT EXISTS (
+            SELECT 1 FROM change_log
+            WHERE user_id = p_user
+                AND txid = (pg_current_xact_id()::text)::bigint
+                AND entity = 'sessions' AND entity_id = p_session
+        )
+    $$ LANGUAGE sql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION photos_usage_sync() RETURNS trigger AS $$
+    DECLARE
+        session_owner uuid;
+    BEGIN
+        IF TG_OP = 'UPDATE'
+            AND (OLD.user_id, OLD.session_id, OLD.size_bytes)
+                IS NOT DISTINCT FROM (NEW.user_id, NEW.session_id, NEW.size_bytes)
+        THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE sessions
+            SET photo_count = photo_count - 1, bytes_used = bytes_used - OLD.size_bytes,
+                updated_at = now() AT TIME ZONE 'utc'
+            WHERE id = OLD.session_id
+            RETURNING user_id INTO session_owner;
+            IF FOUND THEN
+                PERFORM change_log_session_upsert(session_owner, OLD.session_id);
+            END IF;
+            UPDATE users
+            SET photo_count = photo_count - 1, bytes_used = bytes_used - OLD.size_bytes
+            WHERE id = OLD.user_id;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            UPDATE sessions
+            SET photo_count = photo_count + 1, bytes_used = bytes_used + NEW.size_bytes,
+                updated_at = now() AT TIME ZONE 'utc'
+            WHERE id = NEW.session_id
+            RETURNING user_id INTO session_owner;
+            IF FOUND THEN
+                PERFORM change_log_session_upsert(session_owner, NEW.session_id);
+            END IF;
+            UPDATE users
+            SET photo_count = photo_count + 1, bytes_used = bytes_used + NEW.size_bytes
+            WHERE id = NEW.user_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+)
+
+DOWNGRADE = (
+    """
+    CREATE OR REPLACE FUNCTION photos_usage_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE'
+            AND (OLD.user_id, OLD.session_id, OLD.size_bytes)
+                IS NOT DISTINCT FROM (NEW.user_id, NEW.session_id, NEW.size_bytes)
+        THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE sessions
+            SET photo_count = photo_count - 1, bytes_used = bytes_used - OLD.size_bytes,
+                updated_at = now() AT TIME ZONE 'utc'
+            WHERE id = OLD.session_id;
+            UPDATE users
+            SET photo_count = photo_count - 1, bytes_used = bytes_used - OLD.size_bytes
+            WHERE id = OLD.user_id;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            UPDATE sessions
+            SET photo_count = photo_count + 1, bytes_used = bytes_used + NEW.size_bytes,
+                updated_at = now() AT TIME ZONE 'utc'
+            WHERE id = NEW.session_id;
+            UPDATE users
+            SET photo_count = photo_count + 1, bytes_used = bytes_used + NEW.size_bytes
+            WHERE id = NEW.user_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP FUNCTION IF EXISTS change_log_session_upsert(uuid, uuid)",
+)
+
+
+def upgrade() -> None:
+    for statement in UPGRADE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in DOWNGRADE:
+        op.execute(statement)
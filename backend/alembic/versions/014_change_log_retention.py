@@ -0,0 +1,46 @@
+"""Change log retention: token-order index and the pruned horizon.
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-22 10:00:00.000000
+
+app.services.change_log_prune deletes entries older than
+CHANGE_LOG_RETENTION_DAYS in (txid, id) order and records the newest
+pruned position in change_log_horizon; /sync asks clients with older
+tokens to resync.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("idx_change_log_txid", "change_log", ["txid", "id"], unique=False)
+    op.create_table(
+        "change_log_horizon",
+        sa.Column("id", sa.SmallInteger(), nullable=False),
+        sa.Column("txid", sa.BigInteger(), nullable=False),
+        sa.Column("log_id", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "pruned_at",
+            sa.DateTime(),
+            server_default=sa.text("(now() AT TIME ZONE 'utc')"),
+            nullable=False,
+        ),
+        sa.CheckConstraint("id = 1", name="ck_change_log_horizon_single_row"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("change_log_horizon")
+    op.drop_index("idx_change_log_txid", table_name="change_log")
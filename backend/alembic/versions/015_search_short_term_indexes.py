@@ -0,0 +1,53 @@
+"""Indexes for search terms too short for pg_trgm (1-2 characters).
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-23 10:00:00.000000
+
+pg_trgm extracts no trigram from a needle shorter than 3 characters, so
+``ILIKE '%바다%'`` cannot use the 006 indexes. Short terms are matched on
+title/topic prefixes (text_pattern_ops btree on lower()) and whole title
+words (GIN on the word array) instead. Built CONCURRENTLY.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("idx_photos_title_prefix", "lower(title) text_pattern_ops", "btree"),
+    ("idx_photos_topic_prefix", "lower(topic) text_pattern_ops", "btree"),
+    ("idx_photos_title_words", "string_to_array(lower(title), ' ')", "gin"),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, expression, using in INDEXES:
+            op.create_index(
+                name,
+                "photos",
+                [sa.text(expression)],
+                postgresql_using=using,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _expression, _using in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="photos",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
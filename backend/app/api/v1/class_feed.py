@@ -0,0 +1,94 @@
+"""Feed of the latest photos across a teacher's class."""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.deps import RequireTeacher, get_db_read
+from app.core.shared_cache import SharedTTLCache
+from app.models.photo import Photo
+from app.models.user import User
+from app.schemas.class_feed import ClassFeedPhoto, ClassFeedResponse
+
+router = APIRouter(prefix="/class", tags=["class"])
+
+# Serialized pages by (teacher id, cursor, limit)
+class_feed_cache: SharedTTLCache[bytes] = SharedTTLCache(
+    ttl_seconds=settings.CLASS_FEED_CACHE_TTL_SECONDS,
+    maxsize=settings.CLASS_FEED_CACHE_SIZE,
+)
+
+
+def _encode_cursor(created_at: datetime, photo_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{photo_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, photo_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(photo_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+async def _load_page(
+    db: AsyncSession, teacher_id: UUID, after: tuple[datetime, UUID] | None, limit: int
+) -> bytes:
+    newest_first = (Photo.created_at.desc(), Photo.id.desc())
+    students = (
+        select(User.id, User.name).where(User.teacher_id == teacher_id).subquery("students")
+    )
+    # Per student, only the next page's worth of photos, read from the
+    # (user_id, created_at) index; the outer sort merges ~students * limit rows
+    latest = select(Photo).where(Photo.user_id == students.c.id)
+    if after is not None:
+        latest = latest.where(tuple_(Photo.created_at, Photo.id) < tuple_(*after))
+    latest = latest.order_by(*newest_first).limit(limit + 1).subquery().lateral("latest")
+    query = (
+        select(latest, students.c.name.label("student_name"))
+        .select_from(students)
+        .join(latest, true())
+        .order_by(latest.c.created_at.desc(), latest.c.id.desc())
+        .limit(limit + 1)
+    )
+    rows = (await db.execute(query)).all()
+
+    items = [ClassFeedPhoto.model_validate(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = _encode_cursor(items[-1].created_at, items[-1].id)
+    return ClassFeedResponse(items=items, next_cursor=next_cursor).model_dump_json().encode()
+
+
+@router.get("/photos", response_model=ClassFeedResponse)
+async def get_class_photos(
+    teacher: RequireTeacher,
+    db: Annotated[AsyncSession, Depends(get_db_read)],
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(30, ge=1, le=100),
+):
+    """Latest photos of all the teacher's students, newest first.
+
+    One query joining the students (users.teacher_id) to each student's
+    newest photos (photos(user_id, created_at)), keyset-paginated by
+    (created_at, id) so deep pages cost the same as the first. Pages are
+    cached per worker for CLASS_FEED_CACHE_TTL_SECONDS and concurrent
+    requests for the same page share one query, so new uploads may take
+    that long to appear.
+    """
+    after = _decode_cursor(cursor) if cursor is not None else None
+    body = await class_feed_cache.get_or_load(
+        (teacher.id, cursor, limit), lambda: _load_page(db, teacher.id, after, limit)
+    )
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,41 @@
+"""Server-Sent Events stream of a teacher's class activity."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.deps import RequireTeacher
+from app.db.session import get_db
+from app.services.events import event_hub, sse_stream
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.get("", response_class=StreamingResponse)
+async def stream_class_events(
+    teacher: RequireTeacher,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Push ``photo.created`` and ``edit.created`` events for the teacher's students.
+
+    Events carry ids and a few display fields only; fetch the full rows
+    (e.g. the class feed) when needed. Buffered autosaves are not announced,
+    only saved edits. Streams that fall too far behind are
+    closed; clients should reconnect.
+    """
+    # The stream may stay open for hours: give the connection back now
+    await db.close()
+
+    async def events():
+        with event_hub.subscribe(teacher.id) as subscription:
+            async for chunk in sse_stream(subscription, settings.EVENTS_HEARTBEAT_SECONDS):
+                yield chunk
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
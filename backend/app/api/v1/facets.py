@@ -0,0 +1,77 @@
+"""Photo counts by topic, keyword, month and student for the gallery."""
+
+from typing import Annotated, Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Text, cast, func, literal, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import CurrentUser, get_db_read
+from app.models.photo_facet import KEYWORD, MONTH, TOPIC, TOTAL, PhotoFacet
+from app.models.user import User
+from app.schemas.facet import FacetCount, FacetsResponse, StudentFacetCount
+
+router = APIRouter(prefix="/facets", tags=["facets"])
+
+
+def _most_photos_first(item: FacetCount) -> tuple[int, str]:
+    return -item.count, item.value
+
+
+@router.get("", response_model=FacetsResponse)
+async def get_facets(
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db_read)],
+    scope: Literal["mine", "class"] = Query(
+        "mine", description="class: photos of the teacher's students (teachers only)"
+    ),
+):
+    """Count photos per topic, session keyword, month and student.
+
+    Reads the photo_facets summary table (kept current by triggers on photos
+    and sessions), so the cost depends on the number of distinct values,
+    not photos. All four groupings come back from one query.
+    """
+    if scope == "class":
+        if current_user.role != "teacher":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only teachers can view their class facets",
+            )
+        owner = PhotoFacet.user_id.in_(
+            select(User.id).where(User.teacher_id == current_user.id)
+        )
+    else:
+        owner = PhotoFacet.user_id == current_user.id
+
+    total = func.sum(PhotoFacet.count)
+    values = (
+        select(PhotoFacet.facet, PhotoFacet.value, null().label("name"), total)
+        .where(owner, PhotoFacet.facet != TOTAL)
+        .group_by(PhotoFacet.facet, PhotoFacet.value)
+        .having(total > 0)
+    )
+    students = (
+        select(literal(TOTAL), cast(PhotoFacet.user_id, Text), User.name, PhotoFacet.count)
+        .join(User, User.id == PhotoFacet.user_id)
+        .where(owner, PhotoFacet.facet == TOTAL, PhotoFacet.count > 0)
+    )
+    result = await db.execute(union_all(values, students))
+
+    groups: dict[str, list[FacetCount]] = {TOPIC: [], KEYWORD: [], MONTH: []}
+    student_counts: list[StudentFacetCount] = []
+    for facet, value, name, count in result:
+        if facet == TOTAL:
+            student_counts.append(
+                StudentFacetCount(student_id=UUID(value), name=name, count=count)
+            )
+        else:
+            groups[facet].append(FacetCount(value=value, count=count))
+
+    return FacetsResponse(
+        topics=sorted(groups[TOPIC], key=_most_photos_first),
+        keywords=sorted(groups[KEYWORD], key=_most_photos_first),
+        months=sorted(groups[MONTH], key=lambda item: item.value, reverse=True),
+        students=sorted(student_counts, key=lambda item: (-item.count, item.name)),
+    )
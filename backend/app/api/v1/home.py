@@ -0,0 +1,27 @@
+"""Home screen aggregate endpoint."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import CurrentUser
+from app.db.session import get_db
+from app.schemas.home import HomeResponse
+from app.services.home import get_home
+
+router = APIRouter(prefix="/home", tags=["home"])
+
+
+@router.get("", response_model=HomeResponse)
+async def get_home_screen(
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Profile, recent sessions and photos, and session/photo totals in one call.
+
+    Replaces /users/me + /sessions + /photos on the home screen; served
+    from a per-user cache that the user's own writes invalidate. Cache
+    misses read the primary: a replica page could be cached for the TTL.
+    """
+    return Response(content=await get_home(db, current_user), media_type="application/json")
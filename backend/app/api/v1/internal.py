@@ -0,0 +1,20 @@
+"""Internal operational endpoints (per-worker diagnostics)."""
+from fastapi import APIRouter
+
+from app.core.deps import InternalAccess
+from app.db.database import engine
+from app.db.pool_metrics import pool_metrics
+
+router = APIRouter(
+    prefix="/internal", tags=["internal"], dependencies=[InternalAccess]
+)
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats():
+    """Report connection pool usage for this worker process.
+
+    Includes checked-out and overflow connections, checkout wait-time
+    histogram and checkout timeouts, for sizing the pool per worker.
+    """
+    return pool_metrics.snapshot(engine.pool)
@@ -0,0 +1,136 @@
+"""Photo search over titles, topics and session keywords."""
+
+import sys
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Text, any_, case, func, literal_column, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import CurrentUser, get_db_read
+from app.models.photo import Photo
+from app.models.session import Session
+from app.models.user import User
+from app.schemas.photo import PhotoResponse
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+# pg_trgm extracts no trigram from a shorter needle, so its indexes can't
+# serve a substring match on it
+MIN_TRIGRAM_TERM = 3
+
+# Whether pg_trgm (migration 006) is installed; checked once per process
+_trgm_installed: bool | None = None
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def _has_trgm(db: AsyncSession) -> bool:
+    global _trgm_installed
+    if _trgm_installed is None:
+        _trgm_installed = bool(
+            await db.scalar(
+                text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            )
+        )
+    return _trgm_installed
+
+
+def _starts_with(column, lowered: str):
+    """lower(column) starts with ``lowered``, as a range the
+    text_pattern_ops index can serve (unlike LIKE with a bound pattern)."""
+    lowered_column = func.lower(column)
+    condition = lowered_column.op("~>=~")(lowered)
+    if ord(lowered[-1]) < sys.maxunicode:
+        condition &= lowered_column.op("~<~")(lowered[:-1] + chr(ord(lowered[-1]) + 1))
+    return condition
+
+
+@router.get("", response_model=list[PhotoResponse])
+async def search_photos(
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db_read)],
+    q: str = Query(..., min_length=1, max_length=100, description="Search term"),
+    scope: Literal["mine", "class"] = Query(
+        "mine", description="class: photos of the teacher's students (teachers only)"
+    ),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+):
+    """Search photos by title, topic or their session's keywords.
+
+    Title/topic matches are substring matches (served by pg_trgm GIN
+    indexes), keywords must match exactly (GIN index on keywords). Terms
+    shorter than MIN_TRIGRAM_TERM characters, which trigrams can't serve,
+    match title/topic prefixes and whole title words instead. Results are
+    ranked: exact title, exact topic, keyword, title prefix, then any other
+    match; within a rank by trigram word similarity (when pg_trgm is
+    installed), then newest first.
+    """
+    term = q.strip()
+    if not term:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Search term must not be blank",
+        )
+
+    if scope == "class":
+        if current_user.role != "teacher":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only teachers can search their class",
+            )
+        owner = Photo.user_id.in_(
+            select(User.id).where(User.teacher_id == current_user.id)
+        )
+    else:
+        owner = Photo.user_id == current_user.id
+
+    escaped, lowered = _escape_like(term), term.lower()
+    contains, prefix = f"%{escaped}%", f"{escaped}%"
+    # Sessions tagged with the term, collected into an array up front: a join
+    # or an IN (subquery) would keep the planner from OR-ing the index scans
+    # on photos and fall back to a sequential scan
+    keyword_sessions = func.array(
+        select(Session.id).where(Session.keywords.contains([term])).scalar_subquery(),
+        type_=ARRAY(Session.id.type),
+    )
+    keyword_match = Photo.session_id == any_(keyword_sessions)
+    if len(term) >= MIN_TRIGRAM_TERM:
+        text_match = Photo.title.ilike(contains, escape="\\") | Photo.topic.ilike(
+            contains, escape="\\"
+        )
+    else:
+        # Same expression as idx_photos_title_words (the separator inlined)
+        title_words = func.string_to_array(
+            func.lower(Photo.title), literal_column("' '"), type_=ARRAY(Text)
+        )
+        text_match = (
+            _starts_with(Photo.title, lowered)
+            | _starts_with(Photo.topic, lowered)
+            | title_words.contains([lowered])
+        )
+    rank = case(
+        (func.lower(Photo.title) == lowered, 5),
+        (func.lower(Photo.topic) == lowered, 4),
+        (keyword_match, 3),
+        (Photo.title.ilike(prefix, escape="\\"), 2),
+        else_=1,
+    )
+    order_by = [rank.desc()]
+    if await _has_trgm(db):
+        # Closer matches first, e.g. within the substring rank
+        order_by.append(
+            func.word_similarity(term, func.concat_ws(" ", Photo.title, Photo.topic)).desc()
+        )
+    result = await db.execute(
+        select(Photo)
+        .where(owner, text_match | keyword_match)
+        .order_by(*order_by, Photo.created_at.desc(), Photo.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
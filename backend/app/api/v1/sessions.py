@@ -1,16 +1,35 @@
 """Sessions API endpoints."""
 
+import os
 from datetime import date as dt_date
 from typing import Annotated, List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from ...db.session import get_db
-from ...core.deps import CurrentUser
+from ...db.writes import insert_returning, update_owned_returning
+from ...core.conditional import (
+    etag_matches,
+    fetch_list_version,
+    list_etag,
+    list_version_columns,
+    list_version_from_rows,
+    not_modified,
+    set_list_validators,
+)
+from ...core.config import settings
+from ...core.deps import CurrentUser, get_db_read
+from ...core.fast_json import json_list_response
+from ...core.uploads import safe_resolve_path
+from ...models.photo import Photo
 from ...models.session import Session
+from ...models.user import User
 from ...schemas.session import SessionCreate, SessionKeywordsUpdate, SessionResponse
+from ...services.session_export import ExportEntry, archive_name, stream_zip
+from ...services.suggest import suggestion_index
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
@@ -58,33 +77,41 @@ async def create_session(
     Requires authentication. The session will be associated with the current user.
     """
     # Create new session
-    new_session = Session(
-        user_id=current_user.id,
-        title=session_data.title,
-        location=session_data.location,
-        date=session_data.date,
-        keywords=_normalize_keywords(session_data.keywords),
+    new_session = await insert_returning(
+        db,
+        Session,
+        dict(
+            user_id=current_user.id,
+            title=session_data.title,
+            location=session_data.location,
+            date=session_data.date,
+            keywords=_normalize_keywords(session_data.keywords),
+        ),
+        log_changes_for=current_user.id,
     )
-
-    db.add(new_session)
     await db.commit()
-    await db.refresh(new_session)
+    suggestion_index.record(current_user, added=new_session.keywords)
 
     return new_session
 
 
 @router.get("", response_model=List[SessionResponse])
 async def list_sessions(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_db_read)],
     skip: int = 0,
     limit: int = 50,
     year: int | None = Query(default=None, ge=2000, le=2100),
     month: int | None = Query(default=None, ge=1, le=12),
+    keyword: str | None = Query(default=None, min_length=1, max_length=30),
 ):
     """List all sessions for the current user.
 
     Requires authentication. Returns only sessions belonging to the current user.
+    keyword= keeps sessions tagged with that exact keyword. Supports
+    conditional requests: a matching If-None-Match gets a 304.
     """
     if month is not None and year is None:
         raise HTTPException(
@@ -93,12 +120,12 @@ async def list_sessions(
         )
 
     limit = min(limit, 100)
-    query = select(Session).where(Session.user_id == current_user.id)
+    conditions = [Session.user_id == current_user.id]
 
     if year is not None and month is None:
         year_start = dt_date(year, 1, 1)
         next_year_start = dt_date(year + 1, 1, 1)
-        query = query.where(Session.date >= year_start, Session.date < next_year_start)
+        conditions += [Session.date >= year_start, Session.date < next_year_start]
 
     if year is not None and month is not None:
         month_start = dt_date(year, month, 1)
@@ -106,17 +133,40 @@ async def list_sessions(
             next_month_start = dt_date(year + 1, 1, 1)
         else:
             next_month_start = dt_date(year, month + 1, 1)
-        query = query.where(
-            Session.date >= month_start, Session.date < next_month_start
-        )
+        conditions += [Session.date >= month_start, Session.date < next_month_start]
 
+    if keyword is not None:
+        # keywords @> '["..."]', served by the jsonb_path_ops GIN index
+        conditions.append(Session.keywords.contains([keyword.strip()]))
+
+    version = None
+    if "if-none-match" in request.headers:
+        version = await fetch_list_version(db, Session.updated_at, *conditions)
+        etag = list_etag(request, current_user.id, version)
+        if etag_matches(request, etag):
+            return not_modified(etag, version)
+
+    columns = [Session]
+    if version is None:
+        columns.extend(list_version_columns(Session.updated_at))
     result = await db.execute(
-        query.order_by(Session.date.asc(), Session.created_at.desc())
+        select(*columns)
+        .where(*conditions)
+        .order_by(Session.date.asc(), Session.created_at.desc())
         .offset(skip)
         .limit(limit)
     )
-    sessions = result.scalars().all()
+    rows = result.all()
+    if version is None:
+        version = await list_version_from_rows(db, rows, Session.updated_at, *conditions)
+        etag = list_etag(request, current_user.id, version)
+    sessions = [row[0] for row in rows]
 
+    if settings.FAST_JSON_RESPONSES:
+        page = json_list_response(SessionResponse, sessions)
+        set_list_validators(page, etag, version)
+        return page
+    set_list_validators(response, etag, version)
     return sessions
 
 
@@ -128,21 +178,94 @@ async def update_session_keywords(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Update theme keywords for a session."""
-    result = await db.execute(
-        select(Session).where(
-            Session.id == session_id,
-            Session.user_id == current_user.id,
-        )
+    session = await update_owned_returning(
+        db,
+        Session,
+        session_id,
+        current_user.id,
+        {"keywords": _normalize_keywords(payload.keywords)},
+        log_changes_for=current_user.id,
     )
-    session = result.scalar_one_or_none()
 
     if not session:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
         )
 
-    session.keywords = _normalize_keywords(payload.keywords)
     await db.commit()
-    await db.refresh(session)
+    # The replaced keywords aren't known here; rebuild the class index lazily
+    suggestion_index.invalidate(current_user)
 
     return session
+
+
+@router.get("/{session_id}/export.zip")
+async def export_session_zip(
+    session_id: UUID,
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db_read)],
+    edited: bool = Query(
+        default=False, description="Use edited versions where a photo has one"
+    ),
+):
+    """Download the session's photos as a ZIP with a manifest.csv.
+
+    Available to the session's owner and to the owner's teacher. The
+    archive is streamed from disk as it is built; photos whose file is
+    missing are listed in the manifest without a file name.
+    """
+    session = await db.scalar(
+        select(Session)
+        .join(User, User.id == Session.user_id)
+        .where(
+            Session.id == session_id,
+            or_(Session.user_id == current_user.id, User.teacher_id == current_user.id),
+        )
+    )
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found",
+        )
+
+    result = await db.execute(
+        select(
+            Photo.id,
+            Photo.title,
+            Photo.topic,
+            Photo.original_url,
+            Photo.edited_url,
+            Photo.created_at,
+        )
+        .where(Photo.session_id == session_id, Photo.user_id == session.user_id)
+        .order_by(Photo.created_at.asc(), Photo.id.asc())
+    )
+    entries = []
+    for index, row in enumerate(result.all(), start=1):
+        url = (row.edited_url if edited else None) or row.original_url
+        path = safe_resolve_path("uploads", url)
+        size = 0
+        if path is not None:
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                path = None
+        entries.append(
+            ExportEntry(
+                photo_id=row.id,
+                title=row.title,
+                topic=row.topic,
+                created_at=row.created_at,
+                arcname=archive_name(index, row.id, row.title, url),
+                path=path,
+                size=size,
+            )
+        )
+
+    return StreamingResponse(
+        stream_zip(entries),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="session-{session.date}.zip"'
+        },
+    )
@@ -0,0 +1,27 @@
+"""Keyword and topic autocomplete."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import CurrentUser, get_db_read
+from app.schemas.suggest import SuggestionResponse
+from app.services.suggest import suggestion_index
+
+router = APIRouter(prefix="/suggest", tags=["suggest"])
+
+
+@router.get("", response_model=list[SuggestionResponse])
+async def suggest_terms(
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db_read)],
+    prefix: str = Query(..., min_length=1, max_length=30),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Complete a keyword or topic from the terms used in the user's class.
+
+    Matching is case-insensitive; the most used terms come first.
+    """
+    completions = await suggestion_index.suggest(db, current_user, prefix, limit)
+    return [SuggestionResponse(text=text, count=count) for text, count in completions]
@@ -0,0 +1,148 @@
+"""Delta sync for offline-capable clients.
+
+Clients first call ``GET /sync`` without ``since`` to get a starting token,
+then fetch the full lists, then call ``GET /sync?since=<next_token>``
+whenever they reconnect. Each call returns the current state of every
+photo, session and edit history entry written since the token, plus
+tombstones for deleted photos. Replaying a change twice is harmless, so
+clients may safely retry with an older token.
+
+The log keeps at least CHANGE_LOG_RETENTION_DAYS of changes (see
+app.services.change_log_prune). A token older than the pruned horizon gets
+``resync: true`` and a fresh token instead of changes: the client refetches
+its lists, like on first sync, and continues from there.
+
+Entries are ordered by (transaction id, log id) and only entries of
+transactions older than every transaction still in flight are returned,
+so a slow transaction's changes are picked up by a later sync instead of
+being skipped.
+"""
+
+import base64
+import binascii
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import literal_column, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import CurrentUser
+from app.db.change_log import DELETE
+from app.db.session import get_db
+from app.models.change_log import ChangeLog, ChangeLogHorizon
+from app.models.edit_history import EditHistory
+from app.models.photo import Photo
+from app.models.session import Session
+from app.schemas.edit_history import EditHistoryResponse
+from app.schemas.photo import PhotoResponse
+from app.schemas.session import SessionResponse
+from app.schemas.sync import SyncResponse
+from app.services.edit_compaction import expand_edit_entries
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+# Oldest transaction still in flight; everything below it has finished
+_SNAPSHOT_XMIN = literal_column("(pg_snapshot_xmin(pg_current_snapshot())::text)::bigint")
+
+
+def _encode_token(txid: int, log_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{txid}:{log_id}".encode()).decode().rstrip("=")
+
+
+def _decode_token(token: str) -> tuple[int, int]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        txid, log_id = raw.split(":")
+        return int(txid), int(log_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token"
+        )
+
+
+@router.get("", response_model=SyncResponse)
+async def sync_changes(
+    current_user: CurrentUser,
+    db: AsyncSession = Depends(get_db),
+    since: str | None = Query(None, description="next_token from the previous sync"),
+    limit: int = Query(500, ge=1, le=1000, description="Maximum change log entries"),
+):
+    """Return what changed for the current user since ``since``."""
+    if since is None:
+        xmin = await db.scalar(select(_SNAPSHOT_XMIN))
+        return SyncResponse(next_token=_encode_token(xmin, 0))
+
+    txid, log_id = _decode_token(since)
+    horizon = (
+        await db.execute(select(ChangeLogHorizon.txid, ChangeLogHorizon.log_id))
+    ).first()
+    if horizon is not None and (txid, log_id) < tuple(horizon):
+        # Changes after the token may have been pruned
+        xmin = await db.scalar(select(_SNAPSHOT_XMIN))
+        return SyncResponse(next_token=_encode_token(xmin, 0), resync=True)
+    result = await db.execute(
+        select(ChangeLog.txid, ChangeLog.id, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.op)
+        .where(
+            ChangeLog.user_id == current_user.id,
+            tuple_(ChangeLog.txid, ChangeLog.id) > tuple_(txid, log_id),
+            ChangeLog.txid < _SNAPSHOT_XMIN,
+        )
+        .order_by(ChangeLog.txid, ChangeLog.id)
+        .limit(limit + 1)
+    )
+    entries = result.all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if not entries:
+        return SyncResponse(next_token=since)
+
+    # Latest operation per row wins
+    latest: dict[tuple[str, UUID], str] = {}
+    for entry in entries:
+        latest[(entry.entity, entry.entity_id)] = entry.op
+
+    response = SyncResponse(
+        next_token=_encode_token(entries[-1].txid, entries[-1].id), has_more=has_more
+    )
+    changed: dict[str, list[UUID]] = {}
+    for (entity, entity_id), op in latest.items():
+        if op == DELETE:
+            getattr(response, entity).deleted.append(entity_id)
+        else:
+            changed.setdefault(entity, []).append(entity_id)
+
+    # Rows deleted after their upsert was logged are skipped; their
+    # tombstone arrives in this or a later sync
+    if ids := changed.get(Photo.__tablename__):
+        result = await db.execute(
+            select(Photo).where(Photo.id.in_(ids), Photo.user_id == current_user.id)
+        )
+        response.photos.updated = [PhotoResponse.model_validate(p) for p in result.scalars()]
+    if ids := changed.get(Session.__tablename__):
+        result = await db.execute(
+            select(Session).where(Session.id.in_(ids), Session.user_id == current_user.id)
+        )
+        response.sessions.updated = [
+            SessionResponse.model_validate(s) for s in result.scalars()
+        ]
+    if ids := changed.get(EditHistory.__tablename__):
+        result = await db.execute(
+            select(EditHistory)
+            .join(Photo, Photo.id == EditHistory.photo_id)
+            .where(EditHistory.id.in_(ids), Photo.user_id == current_user.id)
+            .order_by(EditHistory.created_at, EditHistory.id)
+        )
+        by_photo: dict[UUID, list[EditHistory]] = {}
+        for entry in result.scalars():
+            by_photo.setdefault(entry.photo_id, []).append(entry)
+        for photo_id, photo_entries in by_photo.items():
+            if any(e.delta is not None for e in photo_entries):
+                response.edit_history.updated.extend(
+                    await expand_edit_entries(db, photo_id, photo_entries)
+                )
+            else:
+                response.edit_history.updated.extend(
+                    EditHistoryResponse.model_validate(e) for e in photo_entries
+                )
+
+    return response
@@ -3,26 +3,39 @@
 @TASK P1-R2-T1 - Users API
 """
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.db.session import get_db
-from app.schemas.user import UserResponse, UserCreate
-from app.core.deps import CurrentUser, RequireTeacher
+from app.db.writes import insert_returning
+from app.schemas.user import UserCreate, UserMeResponse, UserResponse
+from app.core.config import settings
+from app.core.deps import CurrentUser, RequireTeacher, get_db_read
+from app.core.fast_json import json_list_response
 from app.models.user import User
 from app.core.security import get_password_hash
+from app.services.class_export import stream_class_export
+from app.services.quota import storage_usage
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.get("/me", response_model=UserResponse)
-async def get_current_user_profile(current_user: CurrentUser):
+@router.get("/me", response_model=UserMeResponse)
+async def get_current_user_profile(
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db_read)],
+):
     """Get current user's profile.
 
     Accessible by both teachers and students.
-    Returns the authenticated user's information.
+    Returns the authenticated user's information and storage usage
+    (their own and their class's bytes against the quotas).
     """
-    return current_user
+    profile = UserResponse.model_validate(current_user)
+    return UserMeResponse(
+        **profile.model_dump(), storage=await storage_usage(db, current_user)
+    )
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -36,29 +49,28 @@ async def create_student(
     Only teachers can create student accounts.
     The student will be automatically associated with the teacher.
     """
-    # Check if email already exists
-    result = await db.execute(select(User).where(User.email == user_in.email))
-    existing_user = result.scalar_one_or_none()
+    # Create new student; an existing email makes the insert a no-op
+    new_student = await insert_returning(
+        db,
+        User,
+        dict(
+            name=user_in.name,
+            email=user_in.email,
+            password_hash=get_password_hash(user_in.password),
+            role="student",
+            teacher_id=current_teacher.id,
+            is_active=True,
+        ),
+        skip_on_conflict=True,
+    )
 
-    if existing_user:
+    if new_student is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already registered"
         )
 
-    # Create new student
-    new_student = User(
-        name=user_in.name,
-        email=user_in.email,
-        password_hash=get_password_hash(user_in.password),
-        role="student",
-        teacher_id=current_teacher.id,
-        is_active=True,
-    )
-
-    db.add(new_student)
     await db.commit()
-    await db.refresh(new_student)
 
     return new_student
 
@@ -66,7 +78,7 @@ async def create_student(
 @router.get("", response_model=list[UserResponse])
 async def list_students(
     current_teacher: RequireTeacher,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_db_read)],
     skip: int = 0,
     limit: int = 50,
 ):
@@ -84,4 +96,31 @@ async def list_students(
     )
     students = result.scalars().all()
 
+    if settings.FAST_JSON_RESPONSES:
+        return json_list_response(UserResponse, students)
     return students
+
+
+@router.get("/export.ndjson")
+async def export_class(
+    request: Request,
+    current_teacher: RequireTeacher,
+    db: Annotated[AsyncSession, Depends(get_db_read)],
+):
+    """Stream the whole class as NDJSON: students, sessions, photos, edits.
+
+    Only teachers can access this endpoint. The body is gzip-compressed on
+    the fly when the client accepts it.
+    """
+    gzip = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {
+        "Content-Disposition": 'attachment; filename="class-export.ndjson"',
+        "Vary": "Accept-Encoding",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream_class_export(db, current_teacher.id, gzip=gzip),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
@@ -0,0 +1,17 @@
+"""Response compression."""
+
+from starlette.middleware.gzip import GZipMiddleware as _GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+# Downloads that are already compressed (ZIP archives)
+UNCOMPRESSED_SUFFIXES = (".zip",)
+
+
+class GZipMiddleware(_GZipMiddleware):
+    """GZipMiddleware that passes already-compressed downloads through."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].endswith(UNCOMPRESSED_SUFFIXES):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
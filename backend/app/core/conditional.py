@@ -0,0 +1,87 @@
+"""Conditional GET (ETag / Last-Modified) for per-user list endpoints.
+
+A list's version is the row count and latest ``updated_at`` of the rows it
+is drawn from; inserts, updates and deletes all change one of the two. The
+weak ETag hashes that version together with the user and the query string.
+
+When the request carries ``If-None-Match`` the version is read first with
+one aggregate query so a 304 can be returned before any row is fetched.
+Otherwise the version rides along on the page query as window aggregates,
+so unconditional requests cost no extra round trip. ``If-Modified-Since``
+is not honored: a delete does not move ``max(updated_at)``.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, NamedTuple, Sequence
+from uuid import UUID
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ListVersion(NamedTuple):
+    count: int
+    last_modified: datetime | None
+
+
+def list_version_columns(updated_at) -> tuple:
+    """Window aggregates to append to a page query's columns."""
+    return func.count().over(), func.max(updated_at).over()
+
+
+async def fetch_list_version(db: AsyncSession, updated_at, *conditions) -> ListVersion:
+    result = await db.execute(select(func.count(), func.max(updated_at)).where(*conditions))
+    count, last_modified = result.one()
+    return ListVersion(count, last_modified)
+
+
+async def list_version_from_rows(
+    db: AsyncSession, rows: Sequence[Any], updated_at, *conditions
+) -> ListVersion:
+    """Version from a page fetched with list_version_columns (trailing columns).
+
+    An empty page (e.g. an offset past the end) carries no aggregates, so the
+    version is queried separately in that case.
+    """
+    if rows:
+        return ListVersion(rows[0][-2], rows[0][-1])
+    return await fetch_list_version(db, updated_at, *conditions)
+
+
+def list_etag(request: Request, user_id: UUID, version: ListVersion) -> str:
+    query = sorted(request.query_params.multi_items())
+    last_modified = version.last_modified.isoformat() if version.last_modified else ""
+    key = f"{user_id}|{request.url.path}|{query}|{version.count}|{last_modified}"
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match (RFC 9110 13.1.2)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in header.split(",")
+    )
+
+
+def set_list_validators(response: Response, etag: str, version: ListVersion) -> None:
+    response.headers["ETag"] = etag
+    # Clients must revalidate, which is cheap thanks to the ETag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if version.last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(
+            version.last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
+
+
+def not_modified(etag: str, version: ListVersion) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_list_validators(response, etag, version)
+    return response
@@ -1,5 +1,7 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
+from pydantic import Field, field_validator
 
 
 class Settings(BaseSettings):
@@ -14,10 +16,91 @@ class Settings(BaseSettings):
     )
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_CACHE_SIZE: int = 1024
+    DATABASE_READ_URL: str | None = Field(
+        default=None,
+        description="Read replica for read-only endpoints. Unset to read from the primary.",
+    )
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_CHECK_INTERVAL_SECONDS: float = 1.0
+    REPLICA_RETRY_SECONDS: float = 30.0
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_PRE_PING: bool = Field(
+        default=True,
+        description="Ping on every checkout. Disable to save a round trip and rely on DB_POOL_RECYCLE.",
+    )
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        default=100,
+        description="asyncpg prepared statement cache size per connection (0 for pgbouncer).",
+    )
+    INTERNAL_API_TOKEN: str | None = None
+    SQL_QUERY_BUDGET: int = 20
+    SQL_STRICT_MODE: bool = Field(
+        default=False,
+        description="Raise when a request exceeds SQL_QUERY_BUDGET or lazy-loads a relationship (dev/test).",
+    )
+    EDIT_HISTORY_WRITE_MODE: Literal["sync", "buffered"] = Field(
+        default="buffered",
+        description="How autosave edits are stored: buffered (write-behind) or sync (every edit written immediately).",
+    )
+    EDIT_BUFFER_WINDOW_SECONDS: float = 2.0
+    EDIT_BUFFER_MAX_PENDING: int = 500
+    EDIT_HISTORY_KEEP_LATEST: int = 20
+    EDIT_HISTORY_CHECKPOINT_EVERY: int = 10
+    FAST_JSON_RESPONSES: bool = Field(
+        default=False,
+        description="Serialize list endpoints with precompiled pydantic serializers instead of response_model + json.",
+    )
+    SUGGEST_INDEX_TTL_SECONDS: float = Field(
+        default=300.0,
+        description="Rebuild a class's autocomplete index after this long (picks up other workers' writes).",
+    )
+    SUGGEST_INDEX_MAX_CLASSES: int = 256
+    CLASS_FEED_CACHE_TTL_SECONDS: float = Field(
+        default=5.0,
+        description="How long a class feed page is served from the worker's cache (0 disables).",
+    )
+    CLASS_FEED_CACHE_SIZE: int = 512
+    HOME_CACHE_TTL_SECONDS: float = Field(
+        default=15.0,
+        description="Upper bound on home screen staleness. The user's own writes invalidate it at once on the writing worker, and on every worker with EVENTS_PG_NOTIFY; reloads read the primary.",
+    )
+    HOME_CACHE_SIZE: int = 2048
+    EVENTS_QUEUE_SIZE: int = Field(
+        default=100,
+        description="Events buffered per open event stream before it is dropped as too slow.",
+    )
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    EVENTS_PG_NOTIFY: bool = Field(
+        default=False,
+        description="Relay class events and cache invalidations between workers with Postgres LISTEN/NOTIFY.",
+    )
+    USER_STORAGE_QUOTA_BYTES: int | None = Field(
+        default=None,
+        description="Photo bytes one user may store. Unset or empty for no limit.",
+    )
+    CLASS_STORAGE_QUOTA_BYTES: int | None = Field(
+        default=None,
+        description="Photo bytes a teacher and their students may store together. Unset or empty for no limit.",
+    )
+    CHANGE_LOG_RETENTION_DAYS: float = Field(
+        default=30.0,
+        description="Sync changes kept at least this long; older sync tokens get a resync answer once pruned.",
+    )
     DEBUG: bool = False
     ENVIRONMENT: str = "development"
     ALLOWED_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
 
+    @field_validator("USER_STORAGE_QUOTA_BYTES", "CLASS_STORAGE_QUOTA_BYTES", mode="before")
+    @classmethod
+    def _empty_quota_is_unlimited(cls, value):
+        # Compose files and .env templates often leave the variable as "KEY="
+        return None if value == "" else value
+
 
 settings = Settings()
 
@@ -1,19 +1,22 @@
 """Dependencies for authentication."""
 
-from typing import Annotated
+import secrets
+from typing import Annotated, AsyncGenerator
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.db.session import get_db
+from app.db.replica import WRITER_INFO_KEY, replica_router
 from app.models.user import User
 from app.schemas.auth import TokenPayload
 from app.core.config import settings
 from app.core.security import ALGORITHM
+from app.core.token_cache import token_claims_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -30,7 +33,13 @@ async def get_current_user(
     )
 
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        # Repeat callers skip signature verification until the token expires
+        payload = token_claims_cache.get(token)
+        if payload is None:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[ALGORITHM]
+            )
+            token_claims_cache.put(token, payload)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
@@ -56,12 +65,30 @@ async def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user"
         )
 
+    # Commits on this session count as the user's writes (replica stickiness)
+    db.info[WRITER_INFO_KEY] = user.id
     return user
 
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+async def get_db_read(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentUser,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints.
+
+    Uses the read replica unless the user wrote recently or the replica is
+    lagging/down, in which case the request's primary session is reused.
+    """
+    if not await replica_router.use_replica(current_user.id):
+        yield db
+        return
+    async with replica_router.sessionmaker() as session:
+        yield session
+
+
 async def require_teacher(current_user: CurrentUser) -> User:
     """Require current user to be a teacher."""
     if current_user.role != "teacher":
@@ -73,3 +100,23 @@ async def require_teacher(current_user: CurrentUser) -> User:
 
 
 RequireTeacher = Annotated[User, Depends(require_teacher)]
+
+
+async def require_internal_access(
+    x_internal_token: Annotated[str | None, Header()] = None,
+) -> None:
+    """Guard operational endpoints.
+
+    Open outside production when INTERNAL_API_TOKEN is unset; otherwise the
+    X-Internal-Token header must match. Failures look like a missing route.
+    """
+    expected = settings.INTERNAL_API_TOKEN
+    if expected is None:
+        if settings.ENVIRONMENT.lower() not in {"prod", "production"}:
+            return
+    elif x_internal_token and secrets.compare_digest(x_internal_token, expected):
+        return
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+InternalAccess = Depends(require_internal_access)
@@ -0,0 +1,27 @@
+"""Fast JSON responses for list endpoints.
+
+FastAPI validates a returned ORM list against ``response_model``, dumps it
+to Python primitives and then encodes that with the stdlib ``json``. The
+precompiled TypeAdapters here validate once (from attributes) and let
+pydantic-core write the JSON bytes directly. Enabled by FAST_JSON_RESPONSES;
+``response_model`` stays on the routes for OpenAPI.
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    """Compiled validator/serializer for ``list[schema]``, built once per schema."""
+    return TypeAdapter(list[schema])
+
+
+def json_list_response(schema: type[BaseModel], items: Iterable[Any]) -> Response:
+    """Serialize ORM objects as ``list[schema]`` straight to JSON bytes."""
+    adapter = list_adapter(schema)
+    validated = adapter.validate_python(list(items), from_attributes=True)
+    return Response(content=adapter.dump_json(validated), media_type="application/json")
@@ -0,0 +1,86 @@
+"""Short-lived cache shared by all requests of a worker, with single-flight loads.
+
+Meant for expensive reads that many clients poll at once and that may be a
+few seconds stale. While a value is being loaded, other requests for the
+same key wait for that load instead of starting their own, so a burst of
+identical requests costs one query.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+
+class SharedTTLCache(Generic[V]):
+    """LRU of values that expire ``ttl_seconds`` after being loaded.
+
+    Not thread-safe; it is only used from the event loop.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 512):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._loading: dict[Hashable, asyncio.Future] = {}
+        # Keys invalidated while loading: that load's result is not stored
+        self._stale: set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _fresh(self, key: Hashable) -> tuple[bool, V | None]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        loaded_at, value = entry
+        if time.monotonic() - loaded_at > self.ttl_seconds:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable[V]]) -> V:
+        """Return the cached value for ``key``, loading it at most once at a time."""
+        while True:
+            hit, value = self._fresh(key)
+            if hit:
+                return value
+            loading = self._loading.get(key)
+            if loading is None:
+                break
+            try:
+                return await asyncio.shield(loading)
+            except asyncio.CancelledError:
+                # The loading request failed or went away: load it ourselves
+                if not loading.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await load()
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._loading[key]
+            stale = key in self._stale
+            self._stale.discard(key)
+        if not stale and self.ttl_seconds > 0 and self.maxsize > 0:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+        if key in self._loading:
+            self._stale.add(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,66 @@
+"""Bounded cache of verified JWT claims.
+
+Access tokens are reused for up to ACCESS_TOKEN_EXPIRE_MINUTES, so the
+signature check and claim parsing in ``jwt.decode`` only need to run once
+per token. Entries are keyed by a digest of the token (the raw token is
+never retained) and are dropped as soon as the token's ``exp`` has passed.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.core.config import settings
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class TokenClaimsCache:
+    """LRU mapping of token digest -> already-validated claims.
+
+    Not thread-safe; it is only used from the event loop.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[float, dict[str, Any]]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """Return cached claims for a token, or None if absent or expired."""
+        key = _token_digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        """Store verified claims. Tokens without a numeric ``exp`` are skipped."""
+        if self.maxsize <= 0:
+            return
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)) or expires_at <= time.time():
+            return
+        key = _token_digest(token)
+        self._entries[key] = (float(expires_at), claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_claims_cache = TokenClaimsCache(maxsize=settings.TOKEN_CACHE_SIZE)
@@ -0,0 +1,16 @@
+"""Filesystem helpers for uploaded files."""
+
+from pathlib import Path
+
+
+def safe_resolve_path(base_dir: str, url_path: str) -> str | None:
+    """Resolve a URL path to a safe filesystem path under base_dir.
+    Returns None if the path escapes the base directory."""
+    cleaned = url_path.lstrip("/")
+    base_path = Path(base_dir).resolve()
+    resolved_path = Path(cleaned).resolve()
+    try:
+        resolved_path.relative_to(base_path)
+    except ValueError:
+        return None
+    return str(resolved_path)
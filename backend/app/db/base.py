@@ -1,4 +1,12 @@
+from datetime import datetime, timezone
+
 from sqlalchemy.orm import DeclarativeBase
 
+
+def utc_now_naive() -> datetime:
+    """Current UTC time without tzinfo, as the timestamp columns store it."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Base(DeclarativeBase):
     pass
@@ -0,0 +1,34 @@
+"""Change log writes for delta sync.
+
+Entries are written by the same statement that changes the data: the
+write runs as a data-modifying CTE and ``log_changes`` adds a second CTE
+inserting one change_log row per written id. See app/api/v1/sync.py for
+the reading side.
+"""
+
+from uuid import UUID
+
+from sqlalchemy import CTE, insert, literal, select
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.models.change_log import ChangeLog
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+
+def log_changes(written: CTE, user_id: UUID, entity: str, op: str = UPSERT) -> CTE:
+    """CTE logging every ``written.c.id`` for ``user_id``.
+
+    ``entity`` is the table name of the written rows. Attach the result to
+    the executed statement with ``add_cte``.
+    """
+    return insert(ChangeLog).from_select(
+        ["user_id", "entity", "entity_id", "op"],
+        select(
+            literal(user_id, PG_UUID(as_uuid=True)),
+            literal(entity),
+            written.c.id,
+            literal(op),
+        ),
+    ).cte(f"{written.name}_log")
@@ -0,0 +1,126 @@
+"""Per-request SQL instrumentation.
+
+Counts statements and DB time for each HTTP request, reports them in a
+``Server-Timing`` header and in the log, and flags lazy relationship loads
+(the usual source of N+1 queries). With SQL_STRICT_MODE enabled (dev/test),
+exceeding SQL_QUERY_BUDGET or triggering a lazy load raises instead.
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session as OrmSession
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in strict mode when a request issues too many statements."""
+
+
+class LazyLoadDetected(RuntimeError):
+    """Raised in strict mode when a relationship is lazily loaded."""
+
+
+class QueryStats:
+    """Statement count and DB time accumulated during one request."""
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.count = 0
+        self.db_seconds = 0.0
+        self.lazy_loads: list[str] = []
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_seconds * 1000:.1f};desc="{self.count} queries"'
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "sql_query_stats", default=None
+)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start")
+    if starts:
+        stats.db_seconds += time.perf_counter() - starts.pop()
+    stats.count += 1
+    if settings.SQL_STRICT_MODE and stats.count > stats.budget:
+        raise QueryBudgetExceeded(
+            f"Request exceeded query budget of {stats.budget}: {statement[:200]}"
+        )
+
+
+@event.listens_for(OrmSession, "do_orm_execute")
+def _detect_lazy_load(orm_execute_state: ORMExecuteState) -> None:
+    stats = _current_stats.get()
+    if (
+        stats is None
+        or not orm_execute_state.is_select
+        or orm_execute_state.lazy_loaded_from is None
+    ):
+        return
+    path = str(orm_execute_state.loader_strategy_path or "")
+    stats.lazy_loads.append(path)
+    if settings.SQL_STRICT_MODE:
+        raise LazyLoadDetected(f"Lazy load of {path}")
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware that scopes QueryStats to each HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(budget=settings.SQL_QUERY_BUDGET)
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", stats.server_timing()
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            level = logging.DEBUG
+            if stats.count > stats.budget or stats.lazy_loads:
+                level = logging.WARNING
+            logger.log(
+                level,
+                "%s %s: %d queries, %.1f ms db%s",
+                scope["method"],
+                scope["path"],
+                stats.count,
+                stats.db_seconds * 1000,
+                f", lazy loads: {stats.lazy_loads}" if stats.lazy_loads else "",
+            )
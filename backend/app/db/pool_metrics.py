@@ -0,0 +1,80 @@
+"""Connection pool instrumentation.
+
+Each worker process owns its own pool, so these numbers are per worker.
+"""
+
+import bisect
+import os
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+
+class PoolMetrics:
+    """Checkout wait-time histogram and timeout counter."""
+
+    # Upper bounds (milliseconds) of the wait-time histogram buckets
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_histogram = [0] * (len(self.BUCKETS_MS) + 1)
+
+    def observe_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        index = bisect.bisect_left(self.BUCKETS_MS, seconds * 1000)
+        self.wait_histogram[index] += 1
+
+    def record_timeout(self) -> None:
+        self.checkout_timeouts += 1
+
+    def snapshot(self, pool: Pool) -> dict[str, object]:
+        """Return live pool state plus the accumulated wait statistics."""
+        labels = [f"le_{bound}ms" for bound in self.BUCKETS_MS] + ["inf"]
+        stats: dict[str, object] = {"pid": os.getpid(), "pool_class": type(pool).__name__}
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+                timeout_seconds=pool.timeout(),
+            )
+        stats.update(
+            checkouts=self.checkouts,
+            checkout_timeouts=self.checkout_timeouts,
+            wait_ms_avg=(
+                self.wait_seconds_total / self.checkouts * 1000 if self.checkouts else 0.0
+            ),
+            wait_ms_max=self.wait_seconds_max * 1000,
+            wait_histogram=dict(zip(labels, self.wait_histogram)),
+        )
+        return stats
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times how long each checkout waits."""
+
+    metrics = pool_metrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.observe_wait(time.perf_counter() - start)
+        return conn
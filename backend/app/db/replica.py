@@ -0,0 +1,158 @@
+"""Read-replica routing.
+
+Read-only endpoints use the replica configured by DATABASE_READ_URL, except:
+
+* for a short window after the same user committed a write
+  (read-your-writes stickiness), and
+* while the replica lags more than REPLICA_MAX_LAG_SECONDS or is unreachable.
+
+In both cases the request falls back to the primary. Write marks are kept
+per worker process; with EVENTS_PG_NOTIFY each writing transaction also
+NOTIFYs the mark, so every worker has it by the time the write commits and
+the user's next read stays on the primary wherever it lands.
+"""
+
+import logging
+import time
+from uuid import UUID
+
+from sqlalchemy import Select, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session as OrmSession
+
+from app.core.config import settings
+from app.services.events import event_hub
+
+logger = logging.getLogger(__name__)
+
+# Seconds since the last replayed transaction, or 0 when fully caught up
+_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+# Key in Session.info identifying the user whose commits should be tracked
+WRITER_INFO_KEY = "user_id"
+
+# Event bridge name of the write marks
+REPLICA_WRITES = "replica_writes"
+
+
+class ReplicaRouter:
+    """Decides per request whether reads may go to the replica."""
+
+    def __init__(
+        self,
+        engine: AsyncEngine | None,
+        sticky_seconds: float,
+        max_lag_seconds: float,
+        check_interval: float,
+        retry_seconds: float,
+    ):
+        self.engine = engine
+        self.sessionmaker = (
+            async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            if engine is not None
+            else None
+        )
+        self.sticky_seconds = sticky_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.retry_seconds = retry_seconds
+        self._last_write: dict[UUID, float] = {}
+        self._checked_at = float("-inf")
+        self._usable = True
+
+    def mark_write(self, user_id: UUID) -> None:
+        now = time.monotonic()
+        self._last_write[user_id] = now
+        if len(self._last_write) > 10000:
+            cutoff = now - self.sticky_seconds
+            self._last_write = {
+                uid: ts for uid, ts in self._last_write.items() if ts > cutoff
+            }
+
+    def is_sticky(self, user_id: UUID) -> bool:
+        last = self._last_write.get(user_id)
+        return last is not None and time.monotonic() - last < self.sticky_seconds
+
+    async def replica_usable(self) -> bool:
+        """Replica health, re-checked at most once per check interval."""
+        if self.engine is None:
+            return False
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._usable
+        # Claim the check before awaiting so concurrent requests don't pile on
+        self._checked_at = now
+        try:
+            async with self.engine.connect() as conn:
+                lag = float(await conn.scalar(_LAG_SQL) or 0)
+        except Exception as e:
+            logger.warning("Read replica unavailable, using primary: %s", e)
+            self._usable = False
+            self._checked_at = now + self.retry_seconds - self.check_interval
+            return False
+        self._usable = lag <= self.max_lag_seconds
+        if not self._usable:
+            logger.warning("Read replica lagging %.1fs, using primary", lag)
+        return self._usable
+
+    async def use_replica(self, user_id: UUID) -> bool:
+        if self.engine is None or self.is_sticky(user_id):
+            return False
+        return await self.replica_usable()
+
+
+def _create_read_engine() -> AsyncEngine | None:
+    if not settings.DATABASE_READ_URL:
+        return None
+    return create_async_engine(
+        settings.DATABASE_READ_URL,
+        echo=settings.DEBUG,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args={"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+
+
+replica_router = ReplicaRouter(
+    _create_read_engine(),
+    sticky_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_CHECK_INTERVAL_SECONDS,
+    retry_seconds=settings.REPLICA_RETRY_SECONDS,
+)
+
+
+def write_mark_statement(user_id: UUID) -> Select | None:
+    """Run in a writing transaction to mark the user's write on every worker.
+
+    None when there is no event bridge (single worker or marks stay local).
+    """
+    return event_hub.invalidate_on_commit(REPLICA_WRITES, user_id)
+
+
+def _mark_write(user_id: UUID) -> None:
+    replica_router.mark_write(user_id)
+
+
+event_hub.register_invalidator(REPLICA_WRITES, _mark_write)
+
+
+@event.listens_for(OrmSession, "before_commit")
+def _broadcast_user_write(session: OrmSession) -> None:
+    user_id = session.info.get(WRITER_INFO_KEY)
+    if user_id is not None and (statement := write_mark_statement(user_id)) is not None:
+        session.execute(statement)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _record_user_write(session: OrmSession) -> None:
+    user_id = session.info.get(WRITER_INFO_KEY)
+    if user_id is not None:
+        replica_router.mark_write(user_id)
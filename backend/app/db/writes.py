@@ -0,0 +1,95 @@
+"""Single-statement write helpers.
+
+Each helper issues one INSERT/UPDATE ... RETURNING and maps the returned
+row onto the ORM entity, replacing the usual SELECT (ownership check) +
+flush + commit + refresh sequence. The caller still commits.
+
+With ``log_changes_for`` the write runs as a CTE and the same statement
+records the row in the change log under that user (see app.db.change_log).
+"""
+
+from typing import Any, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Select, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.db.base import Base
+from app.db.change_log import log_changes
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+
+async def _fetch_returning(
+    db: AsyncSession, model: type[ModelT], stmt, log_changes_for: UUID | None
+) -> ModelT | None:
+    if log_changes_for is None:
+        result = await db.execute(stmt.returning(model))
+        return result.scalar_one_or_none()
+    written = stmt.returning(*model.__table__.c).cte("written")
+    result = await db.execute(
+        select(aliased(model, written))
+        .add_cte(log_changes(written, log_changes_for, model.__tablename__))
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def insert_returning(
+    db: AsyncSession,
+    model: type[ModelT],
+    values: dict[str, Any],
+    *,
+    skip_on_conflict: bool = False,
+    log_changes_for: UUID | None = None,
+) -> ModelT | None:
+    """INSERT ... RETURNING *.
+
+    With ``skip_on_conflict`` the row is inserted with ON CONFLICT DO NOTHING
+    and None is returned when it already existed.
+    """
+    if skip_on_conflict:
+        stmt = pg_insert(model).values(**values).on_conflict_do_nothing()
+    else:
+        stmt = insert(model).values(**values)
+    return await _fetch_returning(db, model, stmt, log_changes_for)
+
+
+async def insert_from_select_returning(
+    db: AsyncSession,
+    model: type[ModelT],
+    columns: list[str],
+    source: Select,
+    *,
+    log_changes_for: UUID | None = None,
+) -> ModelT | None:
+    """INSERT INTO model (columns) SELECT ... RETURNING *.
+
+    Lets an ownership condition live in ``source``'s WHERE clause; returns
+    None when the SELECT matched nothing.
+    """
+    stmt = insert(model).from_select(columns, source)
+    return await _fetch_returning(db, model, stmt, log_changes_for)
+
+
+async def update_owned_returning(
+    db: AsyncSession,
+    model: type[ModelT],
+    obj_id: UUID,
+    user_id: UUID,
+    values: dict[str, Any],
+    *,
+    log_changes_for: UUID | None = None,
+) -> ModelT | None:
+    """UPDATE ... WHERE id = :id AND user_id = :uid RETURNING *.
+
+    Returns None when the row does not exist or belongs to another user.
+    """
+    stmt = (
+        update(model)
+        .where(model.id == obj_id, model.user_id == user_id)
+        .values(**values)
+    )
+    return await _fetch_returning(db, model, stmt, log_changes_for)
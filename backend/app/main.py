@@ -2,19 +2,34 @@
 
 import logging
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from app.api.v1 import auth, users, sessions, filters
+from app.api.v1 import auth, users, sessions, filters, internal, search, suggest, sync, facets, class_feed, events, home
+from app.core.compression import GZipMiddleware
 from app.core.config import settings
+from app.db.instrumentation import QueryStatsMiddleware
 from app.routes import photos, edit_history
+from app.services.edit_buffer import edit_history_buffer
+from app.services.events import event_hub
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.EVENTS_PG_NOTIFY:
+        event_hub.start_bridge(settings.DATABASE_URL)
+    yield
+    await event_hub.close()
+    # Write buffered autosave edits before the worker exits
+    await edit_history_buffer.close()
+
+
+app = FastAPI(title="API", version="0.1.0", lifespan=lifespan)
 
 # Mount static files for uploads
 UPLOAD_DIR = "uploads"
@@ -22,7 +37,10 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 if settings.DEBUG:
     app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
 
-# GZip compression for responses > 1KB
+# Per-request query count / DB time (Server-Timing header)
+app.add_middleware(QueryStatsMiddleware)
+
+# GZip compression for responses > 1KB (ZIP downloads pass through)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 # CORS: restrict origins in production
@@ -42,9 +60,18 @@ app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api/v1")
 app.include_router(sessions.router, prefix="/api/v1")
 app.include_router(photos.router, prefix="/api/v1")
+app.include_router(sync.router, prefix="/api/v1")
+app.include_router(search.router, prefix="/api/v1")
+app.include_router(suggest.router, prefix="/api/v1")
+app.include_router(facets.router, prefix="/api/v1")
+app.include_router(class_feed.router, prefix="/api/v1")
+app.include_router(events.router, prefix="/api/v1")
+app.include_router(home.router, prefix="/api/v1")
 app.include_router(filters.router, prefix="/api")
 # Edit history router (nested under /api)
 app.include_router(edit_history.router, prefix="/api", tags=["edit_history"])
+# Operational endpoints (pool stats etc.), not versioned
+app.include_router(internal.router)
 
 
 @app.get("/health")
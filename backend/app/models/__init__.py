@@ -5,10 +5,15 @@ from app.models.user import User
 from app.models.session import Session
 from app.models.photo import Photo
 from app.models.edit_history import EditHistory
+from app.models.change_log import ChangeLog, ChangeLogHorizon
+from app.models.photo_facet import PhotoFacet
 
 __all__ = [
     "User",
     "Session",
     "Photo",
     "EditHistory",
+    "ChangeLog",
+    "ChangeLogHorizon",
+    "PhotoFacet",
 ]
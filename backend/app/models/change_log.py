@@ -0,0 +1,62 @@
+"""ChangeLog model: per-user log of created, updated and deleted rows."""
+
+from datetime import datetime
+from uuid import UUID as PyUUID
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, ForeignKey, Identity, Index
+from sqlalchemy import SmallInteger, String, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from ..db.base import Base
+
+
+class ChangeLog(Base):
+    """One row per write: ``op`` is "upsert" or "delete" (a tombstone).
+
+    ``entity`` is the written table's name. ``txid`` is the writing
+    transaction's id; sync tokens order by (txid, id) so entries of
+    transactions still in flight are never skipped.
+    """
+
+    __tablename__ = "change_log"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    user_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    entity: Mapped[str] = mapped_column(String(20), nullable=False)
+    entity_id: Mapped[PyUUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    op: Mapped[str] = mapped_column(String(10), nullable=False)
+    txid: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=text("(pg_current_xact_id()::text)::bigint"),
+        nullable=False,
+    )
+    # Server-side defaults: entries are written by INSERT ... SELECT in CTEs
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=text("(now() AT TIME ZONE 'utc')"), nullable=False
+    )
+
+    __table_args__ = (
+        Index("idx_change_log_user_txid", "user_id", "txid", "id"),
+        # Pruning walks the log in token order
+        Index("idx_change_log_txid", "txid", "id"),
+    )
+
+
+class ChangeLogHorizon(Base):
+    """The newest (txid, id) pruned from change_log; a single row.
+
+    Sync tokens below it may have missed pruned entries, so their clients
+    must resync. Written by app.services.change_log_prune.
+    """
+
+    __tablename__ = "change_log_horizon"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=1)
+    txid: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    log_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    pruned_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=text("(now() AT TIME ZONE 'utc')"), nullable=False
+    )
+
+    __table_args__ = (CheckConstraint("id = 1", name="ck_change_log_horizon_single_row"),)
@@ -2,22 +2,18 @@
 # @SPEC docs/planning/04-database-design.md#edit-history-table
 """EditHistory model for tracking photo edits."""
 
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 from uuid import UUID as PyUUID, uuid4
 from sqlalchemy import String, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from ..db.base import Base
+from ..db.base import Base, utc_now_naive
 
 if TYPE_CHECKING:
     from .photo import Photo
 
 
-def _utc_now_naive() -> datetime:
-    return datetime.now(timezone.utc).replace(tzinfo=None)
-
-
 class EditHistory(Base):
     __tablename__ = "edit_history"
 
@@ -32,11 +28,17 @@ class EditHistory(Base):
         JSONB, nullable=True
     )
     crop_data: Mapped[Optional[dict[str, object]]] = mapped_column(JSONB, nullable=True)
+    # Set by compaction: changes against the previous entry (fields above cleared)
+    delta: Mapped[Optional[dict[str, object]]] = mapped_column(
+        JSONB(none_as_null=True), nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=_utc_now_naive, nullable=False
+        DateTime, default=utc_now_naive, nullable=False
     )
 
     # Relationships
     photo: Mapped["Photo"] = relationship("Photo", backref="edit_histories")
 
-    __table_args__ = (Index("idx_edit_history_photo_id", "photo_id"),)
+    __table_args__ = (
+        Index("idx_edit_history_photo_created", "photo_id", "created_at"),
+    )
@@ -2,23 +2,19 @@
 # @SPEC docs/planning/04-database-design.md#photos-table
 """Photo model for storing photo information."""
 
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 from uuid import UUID as PyUUID, uuid4
-from sqlalchemy import String, DateTime, ForeignKey, Index
+from sqlalchemy import DDL, BigInteger, String, DateTime, ForeignKey, Index, event, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from ..db.base import Base
+from ..db.base import Base, utc_now_naive
 
 if TYPE_CHECKING:
     from .session import Session
     from .user import User
 
 
-def _utc_now_naive() -> datetime:
-    return datetime.now(timezone.utc).replace(tzinfo=None)
-
-
 class Photo(Base):
     __tablename__ = "photos"
 
@@ -36,13 +32,17 @@ class Photo(Base):
     title: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     topic: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     thumbnail_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # Size of the uploaded original; summed into users/sessions.bytes_used
+    size_bytes: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text("0"), nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=_utc_now_naive, nullable=False
+        DateTime, default=utc_now_naive, nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
-        default=_utc_now_naive,
-        onupdate=_utc_now_naive,
+        default=utc_now_naive,
+        onupdate=utc_now_naive,
         nullable=False,
     )
 
@@ -53,4 +53,98 @@ class Photo(Base):
     __table_args__ = (
         Index("idx_photos_user_id", "user_id"),
         Index("idx_photos_session_id", "session_id"),
+        # Class feed: newest photos per student
+        Index("idx_photos_user_created", "user_id", "created_at"),
+        # pg_trgm GIN indexes on title/topic for search live in migration 006
+        # only (they need the extension, which create_all can't assume).
+        # Search terms too short for trigrams use these instead (015)
+        Index("idx_photos_title_prefix", text("lower(title) text_pattern_ops")),
+        Index("idx_photos_topic_prefix", text("lower(topic) text_pattern_ops")),
+        Index(
+            "idx_photos_title_words",
+            text("string_to_array(lower(title), ' ')"),
+            postgresql_using="gin",
+        ),
+    )
+
+
+# Installed here for create_all (tests); must match migrations 010/012/013,
+# which tests/api/test_migrations.py checks. The owner's and the session's
+# photo_count/bytes_used move in the same transaction as the photo row.
+# Sessions also get a new updated_at so list ETags change with their
+# counts, and one change_log upsert per transaction so /sync clients pick
+# up the new counts.
+#
+# Lock order, to avoid deadlocks between writers: sessions (by id), then
+# photo_facets rows, then users. photos_facets_sync fires first (triggers
+# run in name order) and takes the session locks; keyword updates lock
+# their session before their facet rows. Row triggers of a multi-row
+# statement would lock sessions in row order, so batch_photos locks the
+# batch's sessions by id first.
+USAGE_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION change_log_session_upsert(p_user uuid, p_session uuid)
+    RETURNS void AS $$
+        INSERT INTO change_log (user_id, entity, entity_id, op)
+        SELECT p_user, 'sessions', p_session, 'upsert'
+        WHERE NOT EXISTS (
+            SELECT 1 FROM change_log
+            WHERE user_id = p_user
+                AND txid = (pg_current_xact_id()::text)::bigint
+                AND entity = 'sessions' AND entity_id = p_session
+        )
+    $$ LANGUAGE sql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION photos_usage_sync() RETURNS trigger AS $$
+    DECLARE
+        session_owner uuid;
+    BEGIN
+        IF TG_OP = 'UPDATE'
+            AND (OLD.user_id, OLD.session_id, OLD.size_bytes)
+                IS NOT DISTINCT FROM (NEW.user_id, NEW.session_id, NEW.size_bytes)
+        THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE sessions
+            SET photo_count = photo_count - 1, bytes_used = bytes_used - OLD.size_bytes,
+                updated_at = now() AT TIME ZONE 'utc'
+            WHERE id = OLD.session_id
+            RETURNING user_id INTO session_owner;
+            IF FOUND THEN
+                PERFORM change_log_session_upsert(session_owner, OLD.session_id);
+            END IF;
+            UPDATE users
+            SET photo_count = photo_count - 1, bytes_used = bytes_used - OLD.size_bytes
+            WHERE id = OLD.user_id;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            UPDATE sessions
+            SET photo_count = photo_count + 1, bytes_used = bytes_used + NEW.size_bytes,
+                updated_at = now() AT TIME ZONE 'utc'
+            WHERE id = NEW.session_id
+            RETURNING user_id INTO session_owner;
+            IF FOUND THEN
+                PERFORM change_log_session_upsert(session_owner, NEW.session_id);
+            END IF;
+            UPDATE users
+            SET photo_count = photo_count + 1, bytes_used = bytes_used + NEW.size_bytes
+            WHERE id = NEW.user_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER photos_usage_sync
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, session_id, size_bytes ON photos
+    FOR EACH ROW EXECUTE FUNCTION photos_usage_sync()
+    """,
+)
+
+for _statement in USAGE_TRIGGERS:
+    # After every table exists: the trigger updates users and sessions
+    event.listen(
+        Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql")
     )
@@ -0,0 +1,123 @@
+"""PhotoFacet model: per-user photo counts by topic, keyword and month."""
+
+from uuid import UUID as PyUUID
+from sqlalchemy import DDL, ForeignKey, Integer, String, Text, event, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from ..db.base import Base
+
+TOTAL = "total"
+TOPIC = "topic"
+KEYWORD = "keyword"
+MONTH = "month"
+
+
+class PhotoFacet(Base):
+    """How many of a user's photos fall under one facet value.
+
+    ``facet`` is "topic", "keyword" (of the photo's session), "month"
+    ("YYYY-MM" of created_at) or "total" (value ""). Rows are maintained by
+    the triggers below in the transaction that writes photos/sessions, and
+    are left at 0 rather than deleted when the last photo goes away.
+    app.services.facet_counts recomputes them to fix any drift.
+    """
+
+    __tablename__ = "photo_facets"
+
+    user_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    facet: Mapped[str] = mapped_column(String(10), primary_key=True)
+    value: Mapped[str] = mapped_column(Text, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, server_default=text("0"), nullable=False)
+
+
+# Installed here for create_all (tests); must match migrations 008/011/012,
+# which tests/api/test_migrations.py checks. The bump's FOR NO KEY UPDATE
+# waits for a concurrent keyword update and reads its result, which then
+# sees this photo (its trigger runs after ours).
+FACET_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION photo_facets_bump(
+        p_user uuid, p_topic text, p_created timestamp, p_session uuid, p_delta integer
+    ) RETURNS void AS $$
+        INSERT INTO photo_facets (user_id, facet, value, count)
+        SELECT p_user, f.facet, f.value, p_delta
+        FROM (
+            VALUES ('total', ''), ('month', to_char(p_created, 'YYYY-MM'))
+            UNION ALL
+            SELECT 'topic', p_topic WHERE p_topic IS NOT NULL
+            UNION ALL
+            SELECT DISTINCT 'keyword', k.value
+            FROM (SELECT keywords FROM sessions WHERE id = p_session FOR NO KEY UPDATE) AS s,
+                jsonb_array_elements_text(s.keywords) AS k(value)
+        ) AS f(facet, value)
+        ON CONFLICT (user_id, facet, value)
+        DO UPDATE SET count = photo_facets.count + EXCLUDED.count
+    $$ LANGUAGE sql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION photos_facets_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE'
+            AND (OLD.user_id, OLD.topic, OLD.created_at, OLD.session_id)
+                IS NOT DISTINCT FROM (NEW.user_id, NEW.topic, NEW.created_at, NEW.session_id)
+        THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'UPDATE' AND OLD.session_id IS DISTINCT FROM NEW.session_id THEN
+            -- A move locks both sessions in id order before any facet row,
+            -- like every other writer (see photos_usage_sync)
+            PERFORM 1 FROM sessions WHERE id IN (OLD.session_id, NEW.session_id)
+            ORDER BY id FOR NO KEY UPDATE;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM photo_facets_bump(OLD.user_id, OLD.topic, OLD.created_at, OLD.session_id, -1);
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            PERFORM photo_facets_bump(NEW.user_id, NEW.topic, NEW.created_at, NEW.session_id, 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER photos_facets_sync
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, topic, created_at, session_id ON photos
+    FOR EACH ROW EXECUTE FUNCTION photos_facets_sync()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION sessions_facets_sync() RETURNS trigger AS $$
+    BEGIN
+        IF OLD.keywords IS NOT DISTINCT FROM NEW.keywords THEN
+            RETURN NULL;
+        END IF;
+        INSERT INTO photo_facets (user_id, facet, value, count)
+        SELECT p.user_id, 'keyword', k.value, sum(k.delta)
+        FROM photos p
+        CROSS JOIN (
+            SELECT value, -1 AS delta FROM jsonb_array_elements_text(OLD.keywords)
+            UNION ALL
+            SELECT value, 1 FROM jsonb_array_elements_text(NEW.keywords)
+        ) AS k
+        WHERE p.session_id = NEW.id
+        GROUP BY p.user_id, k.value
+        HAVING sum(k.delta) <> 0
+        ON CONFLICT (user_id, facet, value)
+        DO UPDATE SET count = photo_facets.count + EXCLUDED.count;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER sessions_facets_sync
+    AFTER UPDATE OF keywords ON sessions
+    FOR EACH ROW EXECUTE FUNCTION sessions_facets_sync()
+    """,
+)
+
+for _statement in FACET_TRIGGERS:
+    # After every table exists: the triggers live on photos and sessions
+    event.listen(
+        Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql")
+    )
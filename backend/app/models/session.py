@@ -2,22 +2,18 @@
 # @SPEC docs/planning/04-database-design.md#sessions-table
 """Session model for photo shooting sessions."""
 
-from datetime import datetime, date, timezone
+from datetime import datetime, date
 from typing import Optional, TYPE_CHECKING
 from uuid import UUID as PyUUID, uuid4
-from sqlalchemy import String, DateTime, Date, ForeignKey, Index, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from ..db.base import Base
+from ..db.base import Base, utc_now_naive
 
 if TYPE_CHECKING:
     from .user import User
 
 
-def _utc_now_naive() -> datetime:
-    return datetime.now(timezone.utc).replace(tzinfo=None)
-
-
 class Session(Base):
     __tablename__ = "sessions"
 
@@ -30,12 +26,34 @@ class Session(Base):
     location: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     date: Mapped[date] = mapped_column(Date, nullable=False)
     title: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    keywords: Mapped[list[str]] = mapped_column(JSON, default=list, nullable=False)
+    keywords: Mapped[list[str]] = mapped_column(JSONB, default=list, nullable=False)
+    # Maintained by the photos_usage_sync trigger (see models/photo.py)
+    photo_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default=text("0"), nullable=False
+    )
+    bytes_used: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text("0"), nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=_utc_now_naive, nullable=False
+        DateTime, default=utc_now_naive, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=utc_now_naive,
+        onupdate=utc_now_naive,
+        nullable=False,
     )
 
     # Relationships
     user: Mapped["User"] = relationship("User", backref="sessions")
 
-    __table_args__ = (Index("idx_sessions_user_id", "user_id"),)
+    __table_args__ = (
+        Index("idx_sessions_user_id", "user_id"),
+        # Keyword containment (keywords @> '["term"]')
+        Index(
+            "idx_sessions_keywords",
+            "keywords",
+            postgresql_using="gin",
+            postgresql_ops={"keywords": "jsonb_path_ops"},
+        ),
+    )
@@ -2,17 +2,13 @@
 # @SPEC docs/planning/04-database-design.md#users-table
 """User model for authentication and authorization."""
 
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 from uuid import UUID as PyUUID, uuid4
-from sqlalchemy import String, Boolean, DateTime, Enum as SQLEnum, ForeignKey, Index
+from sqlalchemy import BigInteger, String, Boolean, DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from ..db.base import Base
-
-
-def _utc_now_naive() -> datetime:
-    return datetime.now(timezone.utc).replace(tzinfo=None)
+from ..db.base import Base, utc_now_naive
 
 
 class User(Base):
@@ -33,11 +29,18 @@ class User(Base):
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=True
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # Maintained by the photos_usage_sync trigger (see models/photo.py)
+    photo_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default=text("0"), nullable=False
+    )
+    bytes_used: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text("0"), nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=_utc_now_naive, nullable=False
+        DateTime, default=utc_now_naive, nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=_utc_now_naive, onupdate=_utc_now_naive, nullable=False
+        DateTime, default=utc_now_naive, onupdate=utc_now_naive, nullable=False
     )
 
     # Relationships
@@ -2,12 +2,16 @@
 # @SPEC docs/planning/05-api-design.md#edit-history-api
 """EditHistory routes for photo edit tracking."""
 from typing import List
-from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from uuid import UUID, uuid4
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.base import utc_now_naive
 from app.db.session import get_db
-from app.core.deps import get_current_user
+from app.db.writes import insert_from_select_returning
+from app.core.deps import get_current_user, get_db_read
 from app.models.user import User
 from app.models.photo import Photo
 from app.models.edit_history import EditHistory
@@ -15,6 +19,9 @@ from app.schemas.edit_history import (
     EditHistoryCreate,
     EditHistoryResponse
 )
+from app.services.edit_buffer import edit_history_buffer
+from app.services.edit_compaction import expand_edit_entries
+from app.services.events import publish_edit_created
 
 router = APIRouter()
 
@@ -49,7 +56,8 @@ async def get_photo_and_verify_ownership(
 async def get_edit_history_list(
     photo_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_read),
+    primary: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 50,
 ):
@@ -63,6 +71,12 @@ async def get_edit_history_list(
     # Verify photo ownership
     await get_photo_and_verify_ownership(photo_id, current_user, db)
 
+    # Autosave edits still waiting in the write-behind buffer
+    if edit_history_buffer.has_pending(photo_id):
+        await edit_history_buffer.flush()
+        # The replica may not have the flushed rows yet
+        db = primary
+
     # Get edit history list
     result = await db.execute(
         select(EditHistory)
@@ -72,7 +86,8 @@ async def get_edit_history_list(
     )
     edits = result.scalars().all()
 
-    return edits
+    # Compacted entries are stored as deltas; return full states
+    return await expand_edit_entries(db, photo_id, list(edits))
 
 
 @router.post(
@@ -83,28 +98,54 @@ async def get_edit_history_list(
 async def create_edit_history(
     photo_id: UUID,
     edit_data: EditHistoryCreate,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    autosave: bool = False,
 ):
     """
     Create a new edit history entry for a photo.
 
     Saves the filter, adjustments, and crop data applied to the photo.
     Only the photo owner can create edit history entries.
+
+    With ``autosave=true`` (editor sliders) the edit goes to the write-behind
+    buffer and 202 is returned; autosaves for the same photo within the
+    flush window are coalesced into one entry with a stable id.
     """
-    # Verify photo ownership
-    await get_photo_and_verify_ownership(photo_id, current_user, db)
+    if autosave and settings.EDIT_HISTORY_WRITE_MODE == "buffered":
+        if not edit_history_buffer.is_owner(photo_id, current_user.id):
+            await get_photo_and_verify_ownership(photo_id, current_user, db)
+            edit_history_buffer.remember_owner(photo_id, current_user.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return edit_history_buffer.add(
+            photo_id,
+            edit_data.filter_name,
+            edit_data.adjustments,
+            edit_data.crop_data,
+        )
 
-    # Create edit history entry
-    edit_history = EditHistory(
-        photo_id=photo_id,
-        filter_name=edit_data.filter_name,
-        adjustments=edit_data.adjustments,
-        crop_data=edit_data.crop_data
+    # Insert only if the photo belongs to the user, in a single statement
+    edit_history = await insert_from_select_returning(
+        db,
+        EditHistory,
+        ["id", "photo_id", "filter_name", "adjustments", "crop_data", "created_at"],
+        select(
+            literal(uuid4()),
+            Photo.id,
+            literal(edit_data.filter_name),
+            literal(edit_data.adjustments, JSONB),
+            literal(edit_data.crop_data, JSONB),
+            literal(utc_now_naive()),
+        ).where(Photo.id == photo_id, Photo.user_id == current_user.id),
+        log_changes_for=current_user.id,
     )
 
-    db.add(edit_history)
+    if edit_history is None:
+        # Nothing inserted: find out whether the photo is missing or not owned
+        await get_photo_and_verify_ownership(photo_id, current_user, db)
+
     await db.commit()
-    await db.refresh(edit_history)
+    publish_edit_created(current_user, edit_history)
 
     return edit_history
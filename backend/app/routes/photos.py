@@ -4,20 +4,68 @@
 
 import logging
 import os
-from pathlib import Path
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID, uuid4
 
 import anyio
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    UploadFile,
+    File,
+    Form,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Boolean, String, case, column, delete, or_, select, true, update
+from sqlalchemy import values as sa_values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import aliased
 
+from app.api.v1.filters import FILTERS
+from app.db.change_log import DELETE, log_changes
 from app.db.session import get_db
-from app.core.deps import CurrentUser
+from app.db.writes import insert_returning, update_owned_returning
+from app.core.conditional import (
+    etag_matches,
+    fetch_list_version,
+    list_etag,
+    list_version_columns,
+    list_version_from_rows,
+    not_modified,
+    set_list_validators,
+)
+from app.core.config import settings
+from app.core.deps import CurrentUser, get_db_read
+from app.core.fast_json import json_list_response
+from app.core.uploads import safe_resolve_path
+from app.models.edit_history import EditHistory
 from app.models.photo import Photo
 from app.models.session import Session
-from app.schemas.photo import PhotoResponse, PhotoUpdate
+from app.schemas.photo import (
+    PhotoBatchItemResult,
+    PhotoBatchRequest,
+    PhotoBatchResponse,
+    PhotoDeleteOperation,
+    PhotoEditorResponse,
+    PhotoResponse,
+    PhotoSetMetadataOperation,
+    PhotoSetSessionOperation,
+    PhotoUpdate,
+)
+from app.schemas.edit_history import EditHistoryResponse
+from app.services.edit_buffer import edit_history_buffer
+from app.services.edit_compaction import expand_edit_entries
+from app.services.events import publish_photo_created
+from app.services.quota import quota_exceeded, upload_allowance
+from app.services.suggest import suggestion_index
 
 logger = logging.getLogger(__name__)
 
@@ -28,17 +76,44 @@ MAX_UPLOAD_SIZE = 20 * 1024 * 1024  # 20MB
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 
 
-def _safe_resolve_path(base_dir: str, url_path: str) -> str | None:
-    """Resolve a URL path to a safe filesystem path under base_dir.
-    Returns None if the path escapes the base directory."""
-    cleaned = url_path.lstrip("/")
-    base_path = Path(base_dir).resolve()
-    resolved_path = Path(cleaned).resolve()
-    try:
-        resolved_path.relative_to(base_path)
-    except ValueError:
-        return None
-    return str(resolved_path)
+def _encode_uuid(value: UUID) -> str:
+    return str(value)
+
+
+def _encode_datetime(value: datetime) -> str:
+    return value.isoformat()
+
+
+def _encode_plain(value):
+    return value
+
+
+# JSON encoder per PhotoResponse field, matching pydantic's output
+_PHOTO_FIELD_ENCODERS = {
+    name: (
+        _encode_uuid
+        if field.annotation in (UUID, Optional[UUID])
+        else _encode_datetime
+        if field.annotation is datetime
+        else _encode_plain
+    )
+    for name, field in PhotoResponse.model_fields.items()
+}
+
+
+def _parse_photo_fields(fields: str) -> list[str]:
+    """Validate a ``fields=`` value; id always comes first."""
+    names = ["id"]
+    for name in (item.strip() for item in fields.split(",")):
+        if not name or name in names:
+            continue
+        if name not in _PHOTO_FIELD_ENCODERS:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=f"Unknown field: {name}",
+            )
+        names.append(name)
+    return names
 
 
 @router.post("", response_model=PhotoResponse, status_code=status.HTTP_201_CREATED)
@@ -88,6 +163,11 @@ async def upload_photo(
                 detail="Invalid session_id format",
             )
 
+    # Refuse before copying anything once the user or class is at quota
+    allowance = await upload_allowance(db, current_user)
+    if allowance is not None and allowance <= 0:
+        raise quota_exceeded()
+
     # Create user directory if it doesn't exist
     user_dir = os.path.join(UPLOAD_DIR, str(current_user.id))
     os.makedirs(user_dir, exist_ok=True)
@@ -107,16 +187,22 @@ async def upload_photo(
                 if not chunk:
                     break
                 written_size += len(chunk)
+                error = None
                 if written_size > MAX_UPLOAD_SIZE:
+                    error = HTTPException(
+                        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                        detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE // (1024 * 1024)}MB",
+                    )
+                elif allowance is not None and written_size > allowance:
+                    # Stop at the chunk that crosses the quota, not after the copy
+                    error = quota_exceeded()
+                if error is not None:
                     await out_file.aclose()
                     try:
                         os.remove(file_path)
                     except OSError:
                         pass
-                    raise HTTPException(
-                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                        detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE // (1024 * 1024)}MB",
-                    )
+                    raise error
                 await out_file.write(chunk)
     except HTTPException:
         raise
@@ -128,45 +214,100 @@ async def upload_photo(
 
     # Create photo record
     original_url = f"/uploads/photos/{current_user.id}/{filename}"
-    photo = Photo(
-        user_id=current_user.id,
-        session_id=session_uuid,
-        original_url=original_url,
-        title=title,
-        topic=topic.strip() if topic and topic.strip() else None,
+    photo = await insert_returning(
+        db,
+        Photo,
+        dict(
+            user_id=current_user.id,
+            session_id=session_uuid,
+            original_url=original_url,
+            size_bytes=written_size,
+            title=title,
+            topic=topic.strip() if topic and topic.strip() else None,
+        ),
+        log_changes_for=current_user.id,
     )
-
-    db.add(photo)
     await db.commit()
-    await db.refresh(photo)
+    suggestion_index.record(current_user, added=[photo.topic])
+    publish_photo_created(current_user, photo)
 
     return photo
 
 
 @router.get("", response_model=List[PhotoResponse])
 async def get_photos(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db_read),
     current_user: CurrentUser = None,
     skip: int = 0,
     limit: int = 50,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated PhotoResponse fields to return, e.g. "
+        "id,thumbnail_url,edited_url,created_at. id is always included.",
+    ),
 ):
-    """Get list of user's photos."""
+    """Get list of user's photos.
+
+    Responses carry a weak ETag; a matching If-None-Match gets a 304 without
+    fetching the page.
+    """
     limit = min(limit, 100)
+    names = _parse_photo_fields(fields) if fields is not None else None
+    conditions = (Photo.user_id == current_user.id,)
+
+    version = None
+    if "if-none-match" in request.headers:
+        version = await fetch_list_version(db, Photo.updated_at, *conditions)
+        etag = list_etag(request, current_user.id, version)
+        if etag_matches(request, etag):
+            return not_modified(etag, version)
+
+    # Sparse fieldset: select only those columns and skip the ORM/pydantic
+    # round trip entirely
+    columns = [getattr(Photo, name) for name in names] if names else [Photo]
+    if version is None:
+        columns.extend(list_version_columns(Photo.updated_at))
     result = await db.execute(
-        select(Photo)
-        .where(Photo.user_id == current_user.id)
+        select(*columns)
+        .where(*conditions)
         .order_by(Photo.created_at.desc())
         .offset(skip)
         .limit(limit)
     )
-    photos = result.scalars().all()
+    rows = result.all()
+    if version is None:
+        version = await list_version_from_rows(db, rows, Photo.updated_at, *conditions)
+        etag = list_etag(request, current_user.id, version)
+
+    if names:
+        encoders = [_PHOTO_FIELD_ENCODERS[name] for name in names]
+        page = JSONResponse(
+            [
+                {
+                    name: None if value is None else encode(value)
+                    for name, encode, value in zip(names, encoders, row)
+                }
+                for row in rows
+            ]
+        )
+        set_list_validators(page, etag, version)
+        return page
+
+    photos = [row[0] for row in rows]
+    if settings.FAST_JSON_RESPONSES:
+        page = json_list_response(PhotoResponse, photos)
+        set_list_validators(page, etag, version)
+        return page
+    set_list_validators(response, etag, version)
     return photos
 
 
 @router.get("/{photo_id}", response_model=PhotoResponse)
 async def get_photo(
     photo_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_read),
     current_user: CurrentUser = None,
 ):
     """Get a single photo by ID."""
@@ -186,84 +327,308 @@ async def get_photo(
     return photo
 
 
-@router.put("/{photo_id}", response_model=PhotoResponse)
-async def update_photo(
+@router.get("/{photo_id}/editor", response_model=PhotoEditorResponse)
+async def get_photo_editor(
     photo_id: UUID,
-    photo_update: PhotoUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_read),
     current_user: CurrentUser = None,
 ):
-    """Update a photo (for saving edits)."""
+    """Photo, filter presets and latest edit for opening the editor.
+
+    The photo and its latest edit history entry come from one query (a
+    LATERAL join on the (photo_id, created_at) index), which also checks
+    ownership; a buffered autosave, if any, is newer than both.
+    """
+    latest = (
+        select(EditHistory)
+        .where(EditHistory.photo_id == Photo.id)
+        .order_by(EditHistory.created_at.desc(), EditHistory.id.desc())
+        .limit(1)
+        .lateral("latest_edit")
+    )
+    latest_edit = aliased(EditHistory, latest)
     result = await db.execute(
-        select(Photo).where(
-            Photo.id == photo_id,
-            Photo.user_id == current_user.id,
-        )
+        select(Photo, latest_edit)
+        .outerjoin(latest, true())
+        .where(Photo.id == photo_id, Photo.user_id == current_user.id)
     )
-    photo = result.scalar_one_or_none()
-
-    if not photo:
+    row = result.one_or_none()
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found"
         )
+    photo, edit = row
 
-    # Update fields
+    pending = edit_history_buffer.pending(photo_id)
+    if pending is not None:
+        edit = EditHistoryResponse(**pending)
+    elif edit is not None:
+        # Compacted entries are stored as deltas
+        (edit,) = await expand_edit_entries(db, photo_id, [edit])
+
+    return PhotoEditorResponse(photo=photo, filters=FILTERS, latest_edit=edit)
+
+
+@router.put("/{photo_id}", response_model=PhotoResponse)
+async def update_photo(
+    photo_id: UUID,
+    photo_update: PhotoUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = None,
+):
+    """Update a photo (for saving edits)."""
+    values: dict[str, object] = {}
     if photo_update.title is not None:
-        photo.title = photo_update.title
+        values["title"] = photo_update.title
     if photo_update.topic is not None:
         trimmed = photo_update.topic.strip()
-        photo.topic = trimmed if trimmed else None
+        values["topic"] = trimmed if trimmed else None
     if photo_update.edited_url is not None:
         if not photo_update.edited_url.startswith("/uploads/photos/"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid edited_url"
             )
-        photo.edited_url = photo_update.edited_url
+        values["edited_url"] = photo_update.edited_url
+
+    if values:
+        # Ownership check, update and reload in one statement
+        photo = await update_owned_returning(
+            db, Photo, photo_id, current_user.id, values, log_changes_for=current_user.id
+        )
+    else:
+        result = await db.execute(
+            select(Photo).where(
+                Photo.id == photo_id,
+                Photo.user_id == current_user.id,
+            )
+        )
+        photo = result.scalar_one_or_none()
+
+    if not photo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found"
+        )
 
     await db.commit()
-    await db.refresh(photo)
+    if "topic" in values:
+        suggestion_index.invalidate(current_user)
 
     return photo
 
 
+def _remove_upload_files(url_paths: list[str]) -> None:
+    """Unlink uploaded files (runs after the response has been sent)."""
+    for url_path in url_paths:
+        # Path traversal protection
+        safe_path = safe_resolve_path("uploads", url_path)
+        if not safe_path:
+            continue
+        try:
+            os.remove(safe_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Failed to delete photo file %s: %s", safe_path, e)
+
+
+async def _delete_owned_photos(
+    db: AsyncSession, user_id: UUID, photo_ids: list[UUID]
+) -> list:
+    """Delete the user's photos and their edit history in one statement.
+
+    Returns (id, original_url, edited_url, topic) rows for the photos actually deleted
+    and writes their sync tombstones. Foreign keys are checked at statement
+    end, so the CTEs can run together.
+    """
+    deleted_photos = (
+        delete(Photo)
+        .where(Photo.id.in_(photo_ids), Photo.user_id == user_id)
+        .returning(Photo.id, Photo.original_url, Photo.edited_url, Photo.topic)
+        .cte("deleted_photos")
+    )
+    deleted_edits = (
+        delete(EditHistory)
+        .where(EditHistory.photo_id.in_(select(deleted_photos.c.id)))
+        .cte("deleted_edits")
+    )
+    result = await db.execute(
+        select(
+            deleted_photos.c.id,
+            deleted_photos.c.original_url,
+            deleted_photos.c.edited_url,
+            deleted_photos.c.topic,
+        )
+        .add_cte(deleted_edits)
+        .add_cte(log_changes(deleted_photos, user_id, Photo.__tablename__, DELETE))
+    )
+    return list(result.all())
+
+
+def _file_urls(rows) -> list[str]:
+    return [
+        url for row in rows for url in (row.original_url, row.edited_url) if url
+    ]
+
+
+@router.post(":batch", response_model=PhotoBatchResponse)
+async def batch_photos(
+    payload: PhotoBatchRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = None,
+):
+    """Apply delete / set_session / set_metadata operations in one transaction.
+
+    Each kind of operation is one set-based statement scoped to the current
+    user. Results are returned per item in request order; photos that do not
+    exist or belong to someone else get status 404.
+    """
+    operations = payload.operations
+    photo_ids = [op.photo_id for op in operations]
+    if len(set(photo_ids)) != len(photo_ids):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Each photo may appear only once per batch",
+        )
+
+    statuses: dict[UUID, tuple[int, str | None]] = {}
+
+    # The photo triggers lock sessions row by row; take every session this
+    # batch touches up front, in id order, so concurrent writers can't
+    # deadlock on them (see USAGE_TRIGGERS in models/photo.py)
+    move_ops = [op for op in operations if isinstance(op, PhotoSetSessionOperation)]
+    requested = {op.session_id for op in move_ops if op.session_id is not None}
+    locked = await db.execute(
+        select(Session.id)
+        .where(
+            Session.user_id == current_user.id,
+            or_(
+                Session.id.in_(
+                    select(Photo.session_id).where(
+                        Photo.id.in_(photo_ids), Photo.user_id == current_user.id
+                    )
+                ),
+                Session.id.in_(requested),
+            ),
+        )
+        .order_by(Session.id)
+        .with_for_update(key_share=True)
+    )
+    owned = requested & set(locked.scalars())
+
+    # set_metadata: UPDATE photos ... FROM (VALUES ...) in one statement
+    metadata_ops = [op for op in operations if isinstance(op, PhotoSetMetadataOperation)]
+    if metadata_ops:
+        rows = []
+        for op in metadata_ops:
+            topic = (op.topic.strip() or None) if op.topic is not None else None
+            rows.append(
+                (op.photo_id, op.title, topic, op.title is not None, op.topic is not None)
+            )
+        changes = sa_values(
+            column("id", PG_UUID(as_uuid=True)),
+            column("title", String),
+            column("topic", String),
+            column("set_title", Boolean),
+            column("set_topic", Boolean),
+            name="changes",
+        ).data(rows)
+        updated = (
+            update(Photo)
+            .where(Photo.id == changes.c.id, Photo.user_id == current_user.id)
+            .values(
+                title=case((changes.c.set_title, changes.c.title), else_=Photo.title),
+                topic=case((changes.c.set_topic, changes.c.topic), else_=Photo.topic),
+            )
+            .returning(Photo.id)
+            .cte("updated")
+        )
+        result = await db.execute(
+            select(updated.c.id).add_cte(
+                log_changes(updated, current_user.id, Photo.__tablename__)
+            )
+        )
+        for photo_id in result.scalars():
+            statuses[photo_id] = (status.HTTP_200_OK, None)
+
+    # set_session: target sessions must belong to the user
+    if move_ops:
+        valid_moves = []
+        for op in move_ops:
+            if op.session_id is not None and op.session_id not in owned:
+                statuses[op.photo_id] = (
+                    status.HTTP_404_NOT_FOUND,
+                    "Session not found or does not belong to you",
+                )
+            else:
+                valid_moves.append((op.photo_id, op.session_id))
+        if valid_moves:
+            moves = sa_values(
+                column("id", PG_UUID(as_uuid=True)),
+                column("session_id", PG_UUID(as_uuid=True)),
+                name="moves",
+            ).data(valid_moves)
+            moved = (
+                update(Photo)
+                .where(Photo.id == moves.c.id, Photo.user_id == current_user.id)
+                .values(session_id=moves.c.session_id)
+                .returning(Photo.id)
+                .cte("moved")
+            )
+            result = await db.execute(
+                select(moved.c.id).add_cte(
+                    log_changes(moved, current_user.id, Photo.__tablename__)
+                )
+            )
+            for photo_id in result.scalars():
+                statuses[photo_id] = (status.HTTP_200_OK, None)
+
+    # delete
+    delete_ids = [op.photo_id for op in operations if isinstance(op, PhotoDeleteOperation)]
+    deleted_rows = []
+    if delete_ids:
+        deleted_rows = await _delete_owned_photos(db, current_user.id, delete_ids)
+        for row in deleted_rows:
+            statuses[row.id] = (status.HTTP_204_NO_CONTENT, None)
+
+    await db.commit()
+
+    if any(op.topic is not None for op in metadata_ops):
+        suggestion_index.invalidate(current_user)
+    else:
+        suggestion_index.record(current_user, removed=[row.topic for row in deleted_rows])
+    if deleted_rows:
+        background_tasks.add_task(_remove_upload_files, _file_urls(deleted_rows))
+
+    results = []
+    for op in operations:
+        code, detail = statuses.get(
+            op.photo_id, (status.HTTP_404_NOT_FOUND, "Photo not found")
+        )
+        results.append(
+            PhotoBatchItemResult(photo_id=op.photo_id, op=op.op, status=code, detail=detail)
+        )
+    return PhotoBatchResponse(results=results)
+
+
 @router.delete("/{photo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_photo(
     photo_id: UUID,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: CurrentUser = None,
 ):
-    """Delete a photo."""
-    result = await db.execute(
-        select(Photo).where(
-            Photo.id == photo_id,
-            Photo.user_id == current_user.id,
-        )
-    )
-    photo = result.scalar_one_or_none()
+    """Delete a photo and its edit history."""
+    rows = await _delete_owned_photos(db, current_user.id, [photo_id])
 
-    if not photo:
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found"
         )
 
-    # Delete file if it exists (with path traversal protection)
-    safe_path = _safe_resolve_path("uploads", photo.original_url)
-    if safe_path and os.path.exists(safe_path):
-        try:
-            os.remove(safe_path)
-        except OSError as e:
-            logger.warning("Failed to delete photo file %s: %s", safe_path, e)
-
-    # Delete edited file if it exists
-    if photo.edited_url:
-        safe_edited = _safe_resolve_path("uploads", photo.edited_url)
-        if safe_edited and os.path.exists(safe_edited):
-            try:
-                os.remove(safe_edited)
-            except OSError as e:
-                logger.warning("Failed to delete edited file %s: %s", safe_edited, e)
-
-    await db.delete(photo)
     await db.commit()
+    suggestion_index.record(current_user, removed=[row.topic for row in rows])
+
+    background_tasks.add_task(_remove_upload_files, _file_urls(rows))
 
     return None
@@ -0,0 +1,18 @@
+"""Teacher class feed schemas."""
+
+from pydantic import BaseModel
+
+from app.schemas.photo import PhotoResponse
+
+
+class ClassFeedPhoto(PhotoResponse):
+    """A student's photo with the student's name."""
+
+    student_name: str
+
+
+class ClassFeedResponse(BaseModel):
+    """One page of the feed, newest first; pass next_cursor to get the next."""
+
+    items: list[ClassFeedPhoto]
+    next_cursor: str | None = None
@@ -0,0 +1,27 @@
+"""Gallery facet count schemas."""
+
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class FacetCount(BaseModel):
+    """Number of photos with one topic, keyword or month ("YYYY-MM")."""
+
+    value: str
+    count: int
+
+
+class StudentFacetCount(BaseModel):
+    student_id: UUID
+    name: str
+    count: int
+
+
+class FacetsResponse(BaseModel):
+    """Photo counts per topic, session keyword, month and student."""
+
+    topics: list[FacetCount]
+    keywords: list[FacetCount]
+    months: list[FacetCount]
+    students: list[StudentFacetCount]
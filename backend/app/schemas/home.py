@@ -0,0 +1,17 @@
+"""Home screen schema."""
+
+from pydantic import BaseModel
+
+from app.schemas.photo import PhotoResponse
+from app.schemas.session import SessionResponse
+from app.schemas.user import UserResponse
+
+
+class HomeResponse(BaseModel):
+    """Profile, latest sessions and photos, and totals for the home screen."""
+
+    user: UserResponse
+    recent_sessions: list[SessionResponse]
+    recent_photos: list[PhotoResponse]
+    session_count: int
+    photo_count: int
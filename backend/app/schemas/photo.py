@@ -3,10 +3,13 @@
 """Photo schemas for API requests and responses."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Literal, Optional, Union
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.schemas.edit_history import EditHistoryResponse
+from app.schemas.filter import FilterResponse
+
 
 class PhotoBase(BaseModel):
     """Base photo schema with common fields."""
@@ -48,3 +51,62 @@ class PhotoResponse(PhotoInDB):
     """Photo schema for API responses."""
 
     pass
+
+
+class PhotoDeleteOperation(BaseModel):
+    """Batch operation: delete a photo."""
+
+    op: Literal["delete"]
+    photo_id: UUID
+
+
+class PhotoSetSessionOperation(BaseModel):
+    """Batch operation: move a photo to a session (null detaches it)."""
+
+    op: Literal["set_session"]
+    photo_id: UUID
+    session_id: Optional[UUID] = None
+
+
+class PhotoSetMetadataOperation(BaseModel):
+    """Batch operation: set title and/or topic. Omitted fields are kept."""
+
+    op: Literal["set_metadata"]
+    photo_id: UUID
+    title: Optional[str] = Field(None, max_length=255)
+    topic: Optional[str] = Field(None, max_length=100)
+
+
+PhotoBatchOperation = Annotated[
+    Union[PhotoDeleteOperation, PhotoSetSessionOperation, PhotoSetMetadataOperation],
+    Field(discriminator="op"),
+]
+
+
+class PhotoBatchRequest(BaseModel):
+    """Schema for POST /photos:batch."""
+
+    operations: list[PhotoBatchOperation] = Field(..., min_length=1, max_length=100)
+
+
+class PhotoBatchItemResult(BaseModel):
+    """Outcome of one batch operation."""
+
+    photo_id: UUID
+    op: str
+    status: int
+    detail: Optional[str] = None
+
+
+class PhotoBatchResponse(BaseModel):
+    """Per-item results, in request order."""
+
+    results: list[PhotoBatchItemResult]
+
+
+class PhotoEditorResponse(BaseModel):
+    """Everything the editor screen needs to open a photo."""
+
+    photo: PhotoResponse
+    filters: list[FilterResponse]
+    latest_edit: Optional[EditHistoryResponse] = None
@@ -23,6 +23,7 @@ class SessionResponse(BaseModel):
     location: str | None
     date: dt.date
     keywords: list[str]
+    photo_count: int
     created_at: dt.datetime
 
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,10 @@
+"""Autocomplete schemas."""
+
+from pydantic import BaseModel
+
+
+class SuggestionResponse(BaseModel):
+    """A keyword/topic completion and how often the class has used it."""
+
+    text: str
+    count: int
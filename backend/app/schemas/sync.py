@@ -0,0 +1,42 @@
+"""Delta sync schemas."""
+
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+from app.schemas.edit_history import EditHistoryResponse
+from app.schemas.photo import PhotoResponse
+from app.schemas.session import SessionResponse
+
+
+class PhotoChanges(BaseModel):
+    updated: list[PhotoResponse] = Field(default_factory=list)
+    deleted: list[UUID] = Field(default_factory=list)
+
+
+class SessionChanges(BaseModel):
+    updated: list[SessionResponse] = Field(default_factory=list)
+    deleted: list[UUID] = Field(default_factory=list)
+
+
+class EditHistoryChanges(BaseModel):
+    """Edit history entries are removed with their photo; no separate tombstones."""
+
+    updated: list[EditHistoryResponse] = Field(default_factory=list)
+    deleted: list[UUID] = Field(default_factory=list)
+
+
+class SyncResponse(BaseModel):
+    """Changes since the requested token, in the current state of each row."""
+
+    photos: PhotoChanges = Field(default_factory=PhotoChanges)
+    sessions: SessionChanges = Field(default_factory=SessionChanges)
+    edit_history: EditHistoryChanges = Field(default_factory=EditHistoryChanges)
+    next_token: str = Field(..., description="Pass as ?since= on the next sync")
+    has_more: bool = Field(
+        False, description="More changes are pending; sync again right away"
+    )
+    resync: bool = Field(
+        False,
+        description="The token predates the retained change log: refetch the full "
+        "lists, then continue from next_token",
+    )
@@ -36,6 +36,23 @@ class UserResponse(BaseModel):
     role: str
     teacher_id: Optional[UUID] = None
     is_active: bool
+    photo_count: int
+    bytes_used: int
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class StorageUsage(BaseModel):
+    """Stored photo bytes against the user's and class's quotas (None: no limit)."""
+
+    bytes_used: int
+    quota_bytes: Optional[int] = None
+    class_bytes_used: Optional[int] = None
+    class_quota_bytes: Optional[int] = None
+
+
+class UserMeResponse(UserResponse):
+    """The current user's profile with storage usage."""
+
+    storage: StorageUsage
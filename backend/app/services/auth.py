@@ -3,6 +3,7 @@
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.db.writes import insert_returning
 from app.models.user import User
 from app.schemas.auth import RegisterRequest
 from app.core.security import get_password_hash, verify_password, decode_token
@@ -56,16 +57,18 @@ async def verify_refresh_token(db: AsyncSession, refresh_token: str) -> User | N
 
 async def create_user(db: AsyncSession, user_in: RegisterRequest) -> User:
     """Create new user (teacher registration)."""
-    user = User(
-        name=user_in.name,
-        email=user_in.email,
-        password_hash=get_password_hash(user_in.password),
-        role="teacher",
-        is_active=True,
+    user = await insert_returning(
+        db,
+        User,
+        dict(
+            name=user_in.name,
+            email=user_in.email,
+            password_hash=get_password_hash(user_in.password),
+            role="teacher",
+            is_active=True,
+        ),
     )
-    db.add(user)
     await db.commit()
-    await db.refresh(user)
     return user
 
 
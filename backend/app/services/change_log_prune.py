@@ -0,0 +1,128 @@
+"""Retention for the delta sync change log.
+
+change_log grows with every write. This job deletes entries older than
+CHANGE_LOG_RETENTION_DAYS, walking the log in sync token order (txid, id),
+and records the newest deleted position in change_log_horizon in the same
+transaction. /sync answers tokens below the horizon with ``resync``, so a
+client offline for longer than the retention window refetches its lists
+instead of silently missing changes. Run it periodically, e.g. nightly:
+
+    python -m app.services.change_log_prune [batch_size]
+"""
+
+import asyncio
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import delete, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.change_log import ChangeLog, ChangeLogHorizon
+
+logger = logging.getLogger(__name__)
+
+# Oldest transaction still in flight; entries from it onwards are never pruned
+_SNAPSHOT_XMIN = literal_column("(pg_snapshot_xmin(pg_current_snapshot())::text)::bigint")
+
+
+async def _prune_boundary(db: AsyncSession, cutoff: datetime) -> tuple[int, int]:
+    """First (txid, id) to keep: the first entry newer than ``cutoff``.
+
+    Entries are walked in token order, so an old entry behind a newer one
+    is kept until everything before it is old too.
+    """
+    xmin = await db.scalar(select(_SNAPSHOT_XMIN))
+    first_kept = (
+        await db.execute(
+            select(ChangeLog.txid, ChangeLog.id)
+            .where(ChangeLog.created_at >= cutoff)
+            .order_by(ChangeLog.txid, ChangeLog.id)
+            .limit(1)
+        )
+    ).first()
+    if first_kept is None or (first_kept.txid, first_kept.id) > (xmin, 0):
+        return xmin, 0
+    return first_kept.txid, first_kept.id
+
+
+async def prune_change_log(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    retention_days: float | None = None,
+    batch_size: int = 5000,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """Delete change log entries older than the retention window.
+
+    Deletes ``batch_size`` entries per transaction in token order, each
+    together with the horizon update. ``progress(rows_pruned)`` is called
+    after each batch. Returns the number of entries deleted.
+    """
+    if retention_days is None:
+        retention_days = settings.CHANGE_LOG_RETENTION_DAYS
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=retention_days)
+    rows_pruned = 0
+
+    async with sessionmaker() as db:
+        boundary = await _prune_boundary(db, cutoff)
+
+    while True:
+        async with sessionmaker() as db:
+            batch = (
+                select(ChangeLog.id)
+                .where(tuple_(ChangeLog.txid, ChangeLog.id) < tuple_(*boundary))
+                .order_by(ChangeLog.txid, ChangeLog.id)
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = await db.execute(
+                delete(ChangeLog)
+                .where(ChangeLog.id.in_(batch))
+                .returning(ChangeLog.txid, ChangeLog.id)
+            )
+            deleted = result.all()
+            if not deleted:
+                break
+            txid, log_id = max((row.txid, row.id) for row in deleted)
+            statement = insert(ChangeLogHorizon).values(id=1, txid=txid, log_id=log_id)
+            await db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[ChangeLogHorizon.id],
+                    set_={
+                        "txid": statement.excluded.txid,
+                        "log_id": statement.excluded.log_id,
+                        "pruned_at": statement.excluded.pruned_at,
+                    },
+                    where=tuple_(ChangeLogHorizon.txid, ChangeLogHorizon.log_id)
+                    < tuple_(statement.excluded.txid, statement.excluded.log_id),
+                )
+            )
+            await db.commit()
+
+        rows_pruned += len(deleted)
+        if progress is not None:
+            progress(rows_pruned)
+
+    if rows_pruned:
+        logger.info("Pruned %d change log entries older than %s", rows_pruned, cutoff)
+    return rows_pruned
+
+
+async def _main(batch_size: int) -> None:
+    from app.db.database import AsyncSessionLocal, engine
+
+    def report(rows_pruned: int) -> None:
+        print(f"  {rows_pruned} change log entries pruned")
+
+    rows_pruned = await prune_change_log(
+        AsyncSessionLocal, batch_size=batch_size, progress=report
+    )
+    print(f"Done: {rows_pruned} change log entries pruned")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
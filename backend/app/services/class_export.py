@@ -0,0 +1,118 @@
+"""Streaming NDJSON export of a teacher's class.
+
+Emits one JSON object per line, ``{"type": ..., "data": ...}``, for every
+student, then their sessions, photos and edit history entries. Each type is
+read with one server-side cursor (``stream_scalars`` + ``yield_per``) in
+key order, so rows are fetched in batches and released once written; the
+session's identity map only holds weak references to unmodified objects.
+Compacted edit history entries are rebuilt on the fly: entries arrive in
+(photo_id, created_at) order, so the previous state is all that is kept.
+"""
+
+import zlib
+from typing import Any, AsyncIterator
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.edit_history import EditHistory
+from app.models.photo import Photo
+from app.models.session import Session
+from app.models.user import User
+from app.schemas.edit_history import EditHistoryResponse
+from app.schemas.photo import PhotoResponse
+from app.schemas.session import SessionResponse
+from app.schemas.user import UserResponse
+from app.services.edit_compaction import apply_delta
+
+YIELD_PER = 500
+# Lines are buffered up to this size before compressing and sending
+FLUSH_BYTES = 64 * 1024
+
+_EDIT_FIELDS = ("filter_name", "adjustments", "crop_data")
+
+
+def _line(kind: bytes, schema: type[BaseModel], obj: Any) -> bytes:
+    data = schema.__pydantic_serializer__.to_json(schema.model_validate(obj))
+    return b'{"type":"' + kind + b'","data":' + data + b"}\n"
+
+
+def _class_queries(teacher_id: UUID) -> list[tuple[bytes, type[BaseModel], Select]]:
+    in_class = (User.teacher_id == teacher_id, User.role == "student")
+    return [
+        (b"student", UserResponse, select(User).where(*in_class).order_by(User.id)),
+        (
+            b"session",
+            SessionResponse,
+            select(Session)
+            .join(User, User.id == Session.user_id)
+            .where(*in_class)
+            .order_by(Session.user_id, Session.id),
+        ),
+        (
+            b"photo",
+            PhotoResponse,
+            select(Photo)
+            .join(User, User.id == Photo.user_id)
+            .where(*in_class)
+            .order_by(Photo.user_id, Photo.id),
+        ),
+    ]
+
+
+async def _edit_history_lines(db: AsyncSession, teacher_id: UUID) -> AsyncIterator[bytes]:
+    entries = await db.stream_scalars(
+        select(EditHistory)
+        .join(Photo, Photo.id == EditHistory.photo_id)
+        .join(User, User.id == Photo.user_id)
+        .where(User.teacher_id == teacher_id, User.role == "student")
+        .order_by(EditHistory.photo_id, EditHistory.created_at, EditHistory.id)
+        .execution_options(yield_per=YIELD_PER)
+    )
+    photo_id = None
+    state: dict[str, Any] = {}
+    async for entry in entries:
+        if entry.photo_id != photo_id:
+            photo_id, state = entry.photo_id, {field: None for field in _EDIT_FIELDS}
+        if entry.delta is not None:
+            state = apply_delta(state, entry.delta)
+        else:
+            state = {field: getattr(entry, field) for field in _EDIT_FIELDS}
+        yield _line(
+            b"edit",
+            EditHistoryResponse,
+            EditHistoryResponse(
+                id=entry.id, photo_id=entry.photo_id, created_at=entry.created_at, **state
+            ),
+        )
+
+
+async def _ndjson_lines(db: AsyncSession, teacher_id: UUID) -> AsyncIterator[bytes]:
+    for kind, schema, query in _class_queries(teacher_id):
+        rows = await db.stream_scalars(query.execution_options(yield_per=YIELD_PER))
+        async for obj in rows:
+            yield _line(kind, schema, obj)
+    async for line in _edit_history_lines(db, teacher_id):
+        yield line
+
+
+async def stream_class_export(
+    db: AsyncSession, teacher_id: UUID, gzip: bool = True
+) -> AsyncIterator[bytes]:
+    """Yield the export in ~FLUSH_BYTES pieces, gzip-compressed if asked."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    buffer = bytearray()
+    async for line in _ndjson_lines(db, teacher_id):
+        buffer += line
+        if len(buffer) >= FLUSH_BYTES:
+            chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+            buffer.clear()
+            if chunk:
+                yield chunk
+    tail = bytes(buffer)
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
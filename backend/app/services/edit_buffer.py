@@ -0,0 +1,191 @@
+"""Write-behind buffer for editor autosave edits.
+
+Autosave edits are coalesced per photo (latest state wins, the entry id stays
+stable within a window) and written with one multi-row INSERT ... SELECT per
+flush, which also writes their change log entries. Entries whose photo has
+been deleted in the meantime are dropped by the join against ``photos``.
+Pending entries are lost if the process dies before a flush; set
+EDIT_HISTORY_WRITE_MODE=sync to write every edit immediately instead.
+"""
+
+import asyncio
+import logging
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import DateTime, String, column, insert, literal, select
+from sqlalchemy import values as sa_values
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.base import utc_now_naive
+from app.db.change_log import UPSERT
+from app.db.database import AsyncSessionLocal
+from app.db.replica import replica_router, write_mark_statement
+from app.models.change_log import ChangeLog
+from app.models.edit_history import EditHistory
+from app.models.photo import Photo
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = ["id", "photo_id", "filter_name", "adjustments", "crop_data", "created_at"]
+
+# Verified photo owners kept before the cache is reset
+_MAX_KNOWN_OWNERS = 10000
+
+
+class EditHistoryBuffer:
+    """Coalesces edit history rows in memory and flushes them in batches."""
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        window_seconds: float,
+        max_pending: int,
+    ):
+        self.sessionmaker = sessionmaker
+        self.window_seconds = window_seconds
+        self.max_pending = max_pending
+        self._pending: dict[UUID, dict[str, Any]] = {}
+        self._owners: dict[UUID, UUID] = {}
+        self._flusher: asyncio.Task | None = None
+        self._overflow_flushes: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def has_pending(self, photo_id: UUID) -> bool:
+        return photo_id in self._pending
+
+    def pending(self, photo_id: UUID) -> dict[str, Any] | None:
+        """The photo's buffered edit (newer than anything stored), if any."""
+        return self._pending.get(photo_id)
+
+    def is_owner(self, photo_id: UUID, user_id: UUID) -> bool:
+        """Whether ownership of the photo was already verified for this user."""
+        return self._owners.get(photo_id) == user_id
+
+    def remember_owner(self, photo_id: UUID, user_id: UUID) -> None:
+        if len(self._owners) >= _MAX_KNOWN_OWNERS:
+            self._owners.clear()
+        self._owners[photo_id] = user_id
+
+    def add(
+        self,
+        photo_id: UUID,
+        filter_name: str | None,
+        adjustments: dict[str, object] | None,
+        crop_data: dict[str, object] | None,
+    ) -> dict[str, Any]:
+        """Buffer an edit; replaces any pending edit for the same photo."""
+        previous = self._pending.get(photo_id)
+        row = {
+            "id": previous["id"] if previous else uuid4(),
+            "photo_id": photo_id,
+            "filter_name": filter_name,
+            "adjustments": adjustments,
+            "crop_data": crop_data,
+            "created_at": utc_now_naive(),
+        }
+        self._pending[photo_id] = row
+
+        if len(self._pending) >= self.max_pending:
+            task = asyncio.get_running_loop().create_task(self.flush())
+            self._overflow_flushes.add(task)
+            task.add_done_callback(self._overflow_flushes.discard)
+        elif self._flusher is None:
+            self._flusher = asyncio.get_running_loop().create_task(self._run())
+        return row
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.window_seconds)
+                await self.flush()
+                if not self._pending:
+                    return
+        finally:
+            self._flusher = None
+
+    async def flush(self) -> int:
+        """Write all pending edits in one statement. Returns rows inserted."""
+        async with self._lock:
+            if not self._pending:
+                return 0
+            rows = list(self._pending.values())
+            self._pending.clear()
+
+            pending = sa_values(
+                column("id", PG_UUID(as_uuid=True)),
+                column("photo_id", PG_UUID(as_uuid=True)),
+                column("filter_name", String),
+                column("adjustments", JSONB),
+                column("crop_data", JSONB),
+                column("created_at", DateTime),
+                name="pending",
+            ).data([tuple(row[name] for name in _COLUMNS) for row in rows])
+            # Joining photos drops edits for photos deleted in the meantime
+            inserted = (
+                insert(EditHistory)
+                .from_select(
+                    _COLUMNS,
+                    select(*(pending.c[name] for name in _COLUMNS)).join(
+                        Photo, Photo.id == pending.c.photo_id
+                    ),
+                )
+                .returning(EditHistory.id, EditHistory.photo_id)
+                .cte("inserted")
+            )
+            logged = (
+                insert(ChangeLog)
+                .from_select(
+                    ["user_id", "entity", "entity_id", "op"],
+                    select(
+                        Photo.user_id,
+                        literal(EditHistory.__tablename__),
+                        inserted.c.id,
+                        literal(UPSERT),
+                    ).join(Photo, Photo.id == inserted.c.photo_id),
+                )
+                .returning(ChangeLog.user_id)
+                .cte("inserted_log")
+            )
+            stmt = select(logged.c.user_id)
+            try:
+                async with self.sessionmaker() as db:
+                    logged_owners = list((await db.execute(stmt)).scalars())
+                    writers = set(logged_owners)
+                    for user_id in writers:
+                        if (mark := write_mark_statement(user_id)) is not None:
+                            await db.execute(mark)
+                    await db.commit()
+            except Exception:
+                logger.exception("Failed to flush %d buffered edits", len(rows))
+                # Keep them for the next flush unless a newer edit replaced them
+                for row in rows:
+                    self._pending.setdefault(row["photo_id"], row)
+                return 0
+            # The owners now read their edits from the primary for a while
+            # (on other workers through the NOTIFY above)
+            for user_id in writers:
+                replica_router.mark_write(user_id)
+            return len(logged_owners)
+
+    async def close(self) -> None:
+        """Stop the background flusher and write whatever is pending."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+
+edit_history_buffer = EditHistoryBuffer(
+    AsyncSessionLocal,
+    window_seconds=settings.EDIT_BUFFER_WINDOW_SECONDS,
+    max_pending=settings.EDIT_BUFFER_MAX_PENDING,
+)
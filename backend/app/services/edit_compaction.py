@@ -0,0 +1,264 @@
+# @SPEC docs/planning/04-database-design.md#edit-history-table
+"""Edit history compaction.
+
+Per photo, the latest EDIT_HISTORY_KEEP_LATEST entries and every
+EDIT_HISTORY_CHECKPOINT_EVERY-th entry (counted from the oldest) keep their
+full state. Every other entry is rewritten as a delta against its
+predecessor: ``filter_name``/``adjustments``/``crop_data`` are cleared and
+the ``delta`` column holds only what changed. Readers rebuild full states
+with ``expand_edit_entries``.
+
+Run as a job: python -m app.services.edit_compaction [batch_size]
+"""
+
+import asyncio
+import logging
+import sys
+from typing import Any, Callable
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.edit_history import EditHistory
+from app.schemas.edit_history import EditHistoryResponse
+
+logger = logging.getLogger(__name__)
+
+_FIELDS = ("filter_name", "adjustments", "crop_data")
+
+
+def _has_none(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, dict):
+        return any(_has_none(v) for v in value.values())
+    return False
+
+
+def _merge_patch(old: dict, new: dict) -> dict:
+    """RFC 7386 merge patch turning ``old`` into ``new``."""
+    patch: dict[str, Any] = {}
+    for key in old.keys() - new.keys():
+        patch[key] = None
+    for key, value in new.items():
+        previous = old.get(key)
+        if key in old and previous == value:
+            continue
+        if isinstance(previous, dict) and isinstance(value, dict):
+            patch[key] = _merge_patch(previous, value)
+        else:
+            patch[key] = value
+    return patch
+
+
+def _apply_merge_patch(old: dict, patch: dict) -> dict:
+    result = dict(old)
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        elif isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = _apply_merge_patch(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+def make_delta(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """Describe ``current`` relative to ``previous`` (both full states).
+
+    Unchanged fields are omitted. Dict fields are stored as a merge patch
+    when possible and as ``{"value": ...}`` otherwise (e.g. when the new
+    value contains nulls, which a merge patch cannot express).
+    """
+    delta: dict[str, Any] = {}
+    for field in _FIELDS:
+        old, new = previous.get(field), current.get(field)
+        if old == new:
+            continue
+        if field == "filter_name":
+            delta[field] = new
+        elif isinstance(old, dict) and isinstance(new, dict) and not _has_none(new):
+            delta[field] = {"patch": _merge_patch(old, new)}
+        else:
+            delta[field] = {"value": new}
+    return delta
+
+
+def apply_delta(previous: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    """Inverse of make_delta."""
+    state = dict(previous)
+    for field in _FIELDS:
+        if field not in delta:
+            continue
+        change = delta[field]
+        if field == "filter_name":
+            state[field] = change
+        elif "patch" in change:
+            state[field] = _apply_merge_patch(previous.get(field) or {}, change["patch"])
+        else:
+            state[field] = change["value"]
+    return state
+
+
+def _state(entry: EditHistory) -> dict[str, Any]:
+    return {field: getattr(entry, field) for field in _FIELDS}
+
+
+async def expand_edit_entries(
+    db: AsyncSession, photo_id: UUID, entries: list[EditHistory]
+) -> list[EditHistoryResponse]:
+    """Return full states for a page of one photo's entries.
+
+    Delta entries are rebuilt by replaying from the nearest full entry
+    before them, which compaction keeps at most EDIT_HISTORY_CHECKPOINT_EVERY
+    rows away.
+    """
+    deltas = [e for e in entries if e.delta is not None]
+    if not deltas:
+        return [EditHistoryResponse.model_validate(e) for e in entries]
+
+    oldest = min(deltas, key=lambda e: (e.created_at, e.id))
+    newest = max(entries, key=lambda e: (e.created_at, e.id))
+    base = await db.execute(
+        select(EditHistory.created_at, EditHistory.id)
+        .where(
+            EditHistory.photo_id == photo_id,
+            EditHistory.delta.is_(None),
+            EditHistory.created_at <= oldest.created_at,
+        )
+        .order_by(EditHistory.created_at.desc(), EditHistory.id.desc())
+        .limit(1)
+    )
+    base_row = base.one_or_none()
+    lower = base_row.created_at if base_row else oldest.created_at
+    chain = await db.execute(
+        select(EditHistory)
+        .where(
+            EditHistory.photo_id == photo_id,
+            EditHistory.created_at >= lower,
+            EditHistory.created_at <= newest.created_at,
+        )
+        .order_by(EditHistory.created_at.asc(), EditHistory.id.asc())
+    )
+
+    states: dict[UUID, dict[str, Any]] = {}
+    state: dict[str, Any] = {field: None for field in _FIELDS}
+    for entry in chain.scalars():
+        state = apply_delta(state, entry.delta) if entry.delta is not None else _state(entry)
+        states[entry.id] = state
+
+    return [
+        EditHistoryResponse(
+            id=e.id, photo_id=e.photo_id, created_at=e.created_at, **states.get(e.id, _state(e))
+        )
+        for e in entries
+    ]
+
+
+def _compaction_updates(
+    entries: list[EditHistory], keep_latest: int, checkpoint_every: int
+) -> list[dict[str, Any]]:
+    """Rows (oldest first) that should become deltas, with their new delta."""
+    updates = []
+    previous: dict[str, Any] = {field: None for field in _FIELDS}
+    cutoff = len(entries) - keep_latest
+    for index, entry in enumerate(entries):
+        state = (
+            apply_delta(previous, entry.delta) if entry.delta is not None else _state(entry)
+        )
+        is_checkpoint = index % checkpoint_every == 0
+        if entry.delta is None and index < cutoff and not is_checkpoint:
+            updates.append({"id": entry.id, "delta": make_delta(previous, state)})
+        previous = state
+    return updates
+
+
+async def compact_edit_history(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    batch_size: int = 100,
+    keep_latest: int | None = None,
+    checkpoint_every: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> tuple[int, int]:
+    """Compact all photos, ``batch_size`` photos per transaction.
+
+    Photos are walked in photo_id order (keyset pagination), so the job can
+    be interrupted and rerun. ``progress(photos_done, rows_compacted)`` is
+    called after each batch. Returns the final totals.
+    """
+    keep_latest = keep_latest or settings.EDIT_HISTORY_KEEP_LATEST
+    checkpoint_every = checkpoint_every or settings.EDIT_HISTORY_CHECKPOINT_EVERY
+    photos_done = rows_compacted = 0
+    last_photo_id: UUID | None = None
+
+    while True:
+        async with sessionmaker() as db:
+            query = (
+                select(EditHistory.photo_id)
+                .group_by(EditHistory.photo_id)
+                # Only photos with more full rows than the latest N + checkpoints
+                .having(
+                    func.count().filter(EditHistory.delta.is_(None))
+                    > keep_latest
+                    + (func.count() - keep_latest + checkpoint_every - 1) // checkpoint_every
+                )
+                .order_by(EditHistory.photo_id)
+                .limit(batch_size)
+            )
+            if last_photo_id is not None:
+                query = query.where(EditHistory.photo_id > last_photo_id)
+            photo_ids = list((await db.execute(query)).scalars())
+            if not photo_ids:
+                break
+
+            result = await db.execute(
+                select(EditHistory)
+                .where(EditHistory.photo_id.in_(photo_ids))
+                .order_by(
+                    EditHistory.photo_id, EditHistory.created_at.asc(), EditHistory.id.asc()
+                )
+            )
+            by_photo: dict[UUID, list[EditHistory]] = {}
+            for entry in result.scalars():
+                by_photo.setdefault(entry.photo_id, []).append(entry)
+
+            updates = []
+            for entries in by_photo.values():
+                updates.extend(_compaction_updates(entries, keep_latest, checkpoint_every))
+            if updates:
+                # Bulk UPDATE by primary key (executemany)
+                await db.execute(
+                    update(EditHistory),
+                    [
+                        dict(row, filter_name=None, adjustments=None, crop_data=None)
+                        for row in updates
+                    ],
+                )
+            await db.commit()
+
+        photos_done += len(photo_ids)
+        rows_compacted += len(updates)
+        last_photo_id = photo_ids[-1]
+        if progress is not None:
+            progress(photos_done, rows_compacted)
+
+    return photos_done, rows_compacted
+
+
+async def _main(batch_size: int) -> None:
+    from app.db.database import AsyncSessionLocal, engine
+
+    def report(photos_done: int, rows_compacted: int) -> None:
+        print(f"  {photos_done} photos scanned, {rows_compacted} entries compacted")
+
+    photos_done, rows_compacted = await compact_edit_history(
+        AsyncSessionLocal, batch_size=batch_size, progress=report
+    )
+    print(f"Done: {photos_done} photos, {rows_compacted} entries compacted")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(int(sys.argv[1]) if len(sys.argv) > 1 else 100))
@@ -0,0 +1,293 @@
+"""Live class events (new photos, saved edits) for teachers' event streams.
+
+Writes publish a small event for the writer's class after they commit.
+``event_hub`` fans events out to the open streams of the class's teacher,
+each through its own bounded queue: a stream that stops reading is
+dropped (its client reconnects) instead of letting its queue grow.
+
+The hub is per worker process. With EVENTS_PG_NOTIFY, events are sent with
+Postgres NOTIFY instead and every worker LISTENs, so a teacher connected to
+one worker sees uploads handled by another. The same channel carries cache
+invalidations (``EventHub.invalidate``) so per-worker caches of a user's
+data are dropped on every worker when the user writes.
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import Select, func, select
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.models.edit_history import EditHistory
+from app.models.photo import Photo
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+PHOTO_CREATED = "photo.created"
+EDIT_CREATED = "edit.created"
+
+NOTIFY_CHANNEL = "storylens_class_events"
+BRIDGE_RETRY_SECONDS = 5.0
+
+# Sent to a stream's queue when it is dropped
+_DROPPED = None
+
+
+def _invalidation_payload(cache: str, key: UUID) -> str:
+    return json.dumps({"invalidate": cache, "key": str(key)})
+
+
+def format_sse(event_type: str, data: dict[str, Any]) -> bytes:
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+class Subscription:
+    """One open stream: a bounded queue of SSE-formatted events."""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize)
+        self.dropped = False
+
+    def drop(self) -> None:
+        self.dropped = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(_DROPPED)
+
+
+class _PgBridge:
+    """NOTIFY on publish, LISTEN and deliver to the local hub."""
+
+    def __init__(self, hub: "EventHub", database_url: str):
+        self._hub = hub
+        self._dsn = make_url(database_url).set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self._notify_conn: asyncpg.Connection | None = None
+        self._notify_lock = asyncio.Lock()
+        self._listener: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                conn = await asyncpg.connect(self._dsn)
+                try:
+                    closed = asyncio.get_running_loop().create_future()
+                    conn.add_termination_listener(
+                        lambda _conn: closed.done() or closed.set_result(None)
+                    )
+                    await conn.add_listener(NOTIFY_CHANNEL, self._on_notify)
+                    await closed
+                finally:
+                    await conn.close()
+                logger.warning("Event bridge connection lost; reconnecting")
+            except Exception:
+                # Connection errors, but also asyncpg.InterfaceError and the
+                # like: the listener must outlive anything but cancellation
+                logger.warning("Event bridge failed; retrying", exc_info=True)
+                await asyncio.sleep(BRIDGE_RETRY_SECONDS)
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        # Called by asyncpg's protocol; an exception here would be lost
+        try:
+            message = json.loads(payload)
+            if "invalidate" in message:
+                self._hub.invalidate_local(message["invalidate"], UUID(message["key"]))
+            else:
+                self._hub.deliver(
+                    UUID(message["teacher_id"]), message["type"], message["data"]
+                )
+        except Exception:
+            logger.exception("Dropping malformed class event %r", payload)
+
+    def notify(self, teacher_id: UUID, event_type: str, data: dict[str, Any]) -> None:
+        payload = json.dumps({"teacher_id": str(teacher_id), "type": event_type, "data": data})
+        # At least this worker's streams get it if NOTIFY fails
+        self._start_send(payload, lambda: self._hub.deliver(teacher_id, event_type, data))
+
+    def notify_invalidate(self, cache: str, key: UUID) -> None:
+        self._start_send(_invalidation_payload(cache, key), None)
+
+    def _start_send(self, payload: str, fallback: Callable[[], None] | None) -> None:
+        task = asyncio.create_task(self._send(payload, fallback))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _send(self, payload: str, fallback: Callable[[], None] | None) -> None:
+        try:
+            async with self._notify_lock:
+                if self._notify_conn is None or self._notify_conn.is_closed():
+                    self._notify_conn = await asyncpg.connect(self._dsn)
+                await self._notify_conn.execute(
+                    "SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, payload
+                )
+        except Exception:
+            # Reconnect on the next send
+            logger.warning("Event NOTIFY failed", exc_info=True)
+            conn, self._notify_conn = self._notify_conn, None
+            if conn is not None:
+                conn.terminate()
+            if fallback is not None:
+                fallback()
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+        await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._notify_conn is not None:
+            await self._notify_conn.close()
+
+
+class EventHub:
+    """In-process pub/sub of class events, keyed by teacher id.
+
+    Not thread-safe; it is only used from the event loop.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: dict[UUID, set[Subscription]] = {}
+        self._invalidators: dict[str, Callable[[UUID], None]] = {}
+        self._bridge: _PgBridge | None = None
+
+    def subscriber_count(self, teacher_id: UUID) -> int:
+        return len(self._subscribers.get(teacher_id, ()))
+
+    @contextmanager
+    def subscribe(self, teacher_id: UUID) -> Iterator[Subscription]:
+        subscription = Subscription(self.queue_size)
+        self._subscribers.setdefault(teacher_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(teacher_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[teacher_id]
+
+    def publish(self, teacher_id: UUID, event_type: str, data: dict[str, Any]) -> None:
+        """Send an event to the teacher's streams (on every worker if bridged)."""
+        if self._bridge is not None:
+            self._bridge.notify(teacher_id, event_type, data)
+        else:
+            self.deliver(teacher_id, event_type, data)
+
+    def deliver(self, teacher_id: UUID, event_type: str, data: dict[str, Any]) -> None:
+        """Queue an event for this worker's streams, dropping full ones."""
+        subscribers = self._subscribers.get(teacher_id)
+        if not subscribers:
+            return
+        # Encoded once, shared by every stream
+        message = format_sse(event_type, data)
+        for subscription in list(subscribers):
+            if subscription.dropped:
+                continue
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.info("Dropping slow event stream of teacher %s", teacher_id)
+                subscription.drop()
+
+    def register_invalidator(self, cache: str, invalidate: Callable[[UUID], None]) -> None:
+        """Make ``invalidate(cache, key)`` call ``invalidate(key)`` on every worker."""
+        self._invalidators[cache] = invalidate
+
+    def invalidate(self, cache: str, key: UUID) -> None:
+        """Drop a cache entry here at once, and on the other workers if bridged."""
+        self.invalidate_local(cache, key)
+        if self._bridge is not None:
+            self._bridge.notify_invalidate(cache, key)
+
+    def invalidate_on_commit(self, cache: str, key: UUID) -> Select | None:
+        """NOTIFY to run inside a writing transaction, or None without the bridge.
+
+        Postgres delivers it when the transaction commits, so other workers
+        drop the entry before the writer's response is even sent.
+        """
+        if self._bridge is None:
+            return None
+        return select(func.pg_notify(NOTIFY_CHANNEL, _invalidation_payload(cache, key)))
+
+    def invalidate_local(self, cache: str, key: UUID) -> None:
+        invalidator = self._invalidators.get(cache)
+        if invalidator is not None:
+            invalidator(key)
+
+    def start_bridge(self, database_url: str) -> None:
+        self._bridge = _PgBridge(self, database_url)
+        self._bridge.start()
+
+    async def close(self) -> None:
+        if self._bridge is not None:
+            bridge, self._bridge = self._bridge, None
+            await bridge.close()
+
+
+event_hub = EventHub(queue_size=settings.EVENTS_QUEUE_SIZE)
+
+
+def publish_photo_created(user: User, photo: Photo) -> None:
+    if user.teacher_id is None:
+        return
+    event_hub.publish(
+        user.teacher_id,
+        PHOTO_CREATED,
+        {
+            "photo_id": str(photo.id),
+            "student_id": str(user.id),
+            "session_id": str(photo.session_id) if photo.session_id else None,
+            "title": photo.title,
+            "thumbnail_url": photo.thumbnail_url,
+            "created_at": photo.created_at.isoformat(),
+        },
+    )
+
+
+def publish_edit_created(user: User, edit: EditHistory) -> None:
+    if user.teacher_id is None:
+        return
+    event_hub.publish(
+        user.teacher_id,
+        EDIT_CREATED,
+        {
+            "edit_id": str(edit.id),
+            "photo_id": str(edit.photo_id),
+            "student_id": str(user.id),
+            "created_at": edit.created_at.isoformat(),
+        },
+    )
+
+
+async def sse_stream(
+    subscription: Subscription, heartbeat_seconds: float
+) -> AsyncIterator[bytes]:
+    """Format queued events as Server-Sent Events until the stream is dropped.
+
+    A comment line is sent when nothing happened for ``heartbeat_seconds``
+    so proxies keep the connection open.
+    """
+    yield b"retry: 3000\n\n"
+    while True:
+        try:
+            # asyncio.timeout rather than wait_for: no task per event
+            async with asyncio.timeout(heartbeat_seconds):
+                event = await subscription.queue.get()
+        except TimeoutError:
+            yield b": ping\n\n"
+            continue
+        if event is _DROPPED:
+            return
+        yield event
@@ -0,0 +1,131 @@
+"""Reconciliation of the photo_facets summary table.
+
+photo_facets is maintained by triggers on photos and sessions (see
+models/photo_facet.py). This job recomputes each user's facet counts from
+photos and sessions and rewrites the rows that drifted; rows whose facet no
+longer has photos are set to 0. Run it periodically, e.g. nightly:
+
+    python -m app.services.facet_counts [batch_size]
+"""
+
+import asyncio
+import logging
+import sys
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import and_, exists, func, literal, select, text, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.photo import Photo
+from app.models.photo_facet import KEYWORD, MONTH, TOPIC, TOTAL, PhotoFacet
+from app.models.session import Session
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def _fix_facets(user_ids: list[UUID]):
+    """Upsert the batch's recomputed counts where they differ."""
+    owned = Photo.user_id.in_(user_ids)
+    keyword = func.jsonb_array_elements_text(Session.keywords).table_valued("value")
+    photo_keywords = (
+        select(Photo.id, Photo.user_id, keyword.c.value)
+        .distinct()
+        .join(Session, Session.id == Photo.session_id)
+        .join(keyword, literal(True))
+        .where(owned)
+        .subquery()
+    )
+    facets = union_all(
+        select(Photo.user_id, literal(TOTAL).label("facet"), literal("").label("value"))
+        .where(owned),
+        select(Photo.user_id, literal(MONTH), func.to_char(Photo.created_at, "YYYY-MM"))
+        .where(owned),
+        select(Photo.user_id, literal(TOPIC), Photo.topic)
+        .where(owned, Photo.topic.is_not(None)),
+        select(photo_keywords.c.user_id, literal(KEYWORD), photo_keywords.c.value),
+    ).subquery()
+    expected = (
+        select(facets.c.user_id, facets.c.facet, facets.c.value, func.count().label("count"))
+        .group_by(facets.c.user_id, facets.c.facet, facets.c.value)
+        .cte("expected")
+    )
+    emptied = select(
+        PhotoFacet.user_id, PhotoFacet.facet, PhotoFacet.value, literal(0)
+    ).where(
+        PhotoFacet.user_id.in_(user_ids),
+        PhotoFacet.count != 0,
+        ~exists().where(
+            and_(
+                expected.c.user_id == PhotoFacet.user_id,
+                expected.c.facet == PhotoFacet.facet,
+                expected.c.value == PhotoFacet.value,
+            )
+        ),
+    )
+    statement = insert(PhotoFacet).from_select(
+        ["user_id", "facet", "value", "count"], union_all(select(expected), emptied)
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[PhotoFacet.user_id, PhotoFacet.facet, PhotoFacet.value],
+        set_={"count": statement.excluded.count},
+        where=PhotoFacet.count != statement.excluded.count,
+    )
+
+
+async def reconcile_photo_facets(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    batch_size: int = 500,
+    progress: Callable[[int, int], None] | None = None,
+) -> tuple[int, int]:
+    """Recompute the facet counts of all users.
+
+    Users are walked in id order, ``batch_size`` per transaction. Each batch
+    holds an EXCLUSIVE lock on photo_facets (reads continue, photo and
+    keyword writes wait) so no trigger update lands between the recount and
+    the upsert. ``progress(users_done, rows_fixed)`` is called after each
+    batch. Returns the final totals.
+    """
+    users_done = rows_fixed = 0
+    last_user_id: UUID | None = None
+
+    while True:
+        async with sessionmaker() as db:
+            query = select(User.id).order_by(User.id).limit(batch_size)
+            if last_user_id is not None:
+                query = query.where(User.id > last_user_id)
+            user_ids = list((await db.execute(query)).scalars())
+            if not user_ids:
+                break
+            await db.execute(text("LOCK TABLE photo_facets IN EXCLUSIVE MODE"))
+            fixed = (await db.execute(_fix_facets(user_ids))).rowcount
+            await db.commit()
+
+        if fixed:
+            logger.warning("Fixed %d drifted photo facet counts", fixed)
+        users_done += len(user_ids)
+        rows_fixed += fixed
+        last_user_id = user_ids[-1]
+        if progress is not None:
+            progress(users_done, rows_fixed)
+
+    return users_done, rows_fixed
+
+
+async def _main(batch_size: int) -> None:
+    from app.db.database import AsyncSessionLocal, engine
+
+    def report(users_done: int, rows_fixed: int) -> None:
+        print(f"  {users_done} users checked, {rows_fixed} facet counts fixed")
+
+    users_done, rows_fixed = await reconcile_photo_facets(
+        AsyncSessionLocal, batch_size=batch_size, progress=report
+    )
+    print(f"Done: {users_done} users, {rows_fixed} facet counts fixed")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,95 @@
+"""Home screen data: one aggregate query, cached per user.
+
+The user's recent sessions, recent photos and session total are read in a
+single statement (CTEs aggregated to JSON); the photo total is the
+trigger-maintained users.photo_count loaded with the user. The serialized
+response is cached per worker and dropped whenever a session carrying that
+user's writes commits. The aggregate is always loaded from the primary, as
+a replica lagging behind the write would otherwise be cached for the TTL.
+With EVENTS_PG_NOTIFY the drop reaches every worker, so users see their own
+changes wherever their next request lands; without it only the writing
+worker drops its copy, and other workers serve theirs for up to
+HOME_CACHE_TTL_SECONDS.
+"""
+
+from uuid import UUID
+
+from sqlalchemy import JSON, event, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as OrmSession
+
+from app.core.config import settings
+from app.core.shared_cache import SharedTTLCache
+from app.db.replica import WRITER_INFO_KEY
+from app.models.photo import Photo
+from app.models.session import Session
+from app.models.user import User
+from app.schemas.home import HomeResponse
+from app.schemas.user import UserResponse
+from app.services.events import event_hub
+
+RECENT_SESSIONS = 5
+RECENT_PHOTOS = 12
+
+HOME_CACHE = "home"
+
+home_cache: SharedTTLCache[bytes] = SharedTTLCache(
+    ttl_seconds=settings.HOME_CACHE_TTL_SECONDS, maxsize=settings.HOME_CACHE_SIZE
+)
+event_hub.register_invalidator(HOME_CACHE, home_cache.invalidate)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_user_home(session: OrmSession) -> None:
+    user_id = session.info.get(WRITER_INFO_KEY)
+    if user_id is not None:
+        event_hub.invalidate(HOME_CACHE, user_id)
+
+
+def _json_rows(cte, *order_by):
+    rows = func.json_agg(aggregate_order_by(cte.table_valued(), *order_by), type_=JSON)
+    return select(func.coalesce(rows, func.json_build_array(), type_=JSON)).scalar_subquery()
+
+
+def home_query(user_id: UUID):
+    sessions = (
+        select(Session)
+        .where(Session.user_id == user_id)
+        .order_by(Session.date.desc(), Session.created_at.desc())
+        .limit(RECENT_SESSIONS)
+        .cte("recent_sessions")
+    )
+    photos = (
+        select(Photo)
+        .where(Photo.user_id == user_id)
+        .order_by(Photo.created_at.desc())
+        .limit(RECENT_PHOTOS)
+        .cte("recent_photos")
+    )
+    session_count = (
+        select(func.count()).select_from(Session).where(Session.user_id == user_id)
+    ).scalar_subquery()
+    return select(
+        _json_rows(sessions, sessions.c.date.desc(), sessions.c.created_at.desc()),
+        _json_rows(photos, photos.c.created_at.desc()),
+        session_count,
+    )
+
+
+async def _load_home(db: AsyncSession, user: User) -> bytes:
+    result = await db.execute(home_query(user.id))
+    recent_sessions, recent_photos, session_count = result.one()
+    home = HomeResponse(
+        user=UserResponse.model_validate(user),
+        recent_sessions=recent_sessions,
+        recent_photos=recent_photos,
+        session_count=session_count,
+        photo_count=user.photo_count,
+    )
+    return home.model_dump_json().encode()
+
+
+async def get_home(db: AsyncSession, user: User) -> bytes:
+    """The user's home screen as JSON; ``db`` must be a primary session."""
+    return await home_cache.get_or_load(user.id, lambda: _load_home(db, user))
@@ -0,0 +1,71 @@
+"""Storage quotas per user and per teacher's class.
+
+Usage is read from the trigger-maintained users.bytes_used, so checking a
+quota costs one indexed lookup however many photos there are. A class is a
+teacher and their students; USER_STORAGE_QUOTA_BYTES and
+CLASS_STORAGE_QUOTA_BYTES cap them; both are off unless set.
+
+Uploads check the allowance before copying the file and after every chunk
+(see upload_photo); with both quotas off that costs no query at all. Uploads running concurrently each see the usage from
+before the others committed, so together they can overshoot a quota by at
+most their sizes.
+"""
+
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import BigInteger, cast, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.user import StorageUsage
+
+
+def _class_teacher_id(user: User) -> UUID | None:
+    return user.id if user.role == "teacher" else user.teacher_id
+
+
+async def _class_bytes_used(db: AsyncSession, teacher_id: UUID) -> int:
+    return await db.scalar(
+        select(cast(func.coalesce(func.sum(User.bytes_used), 0), BigInteger)).where(
+            or_(User.id == teacher_id, User.teacher_id == teacher_id)
+        )
+    )
+
+
+async def storage_usage(db: AsyncSession, user: User) -> StorageUsage:
+    """The user's stored bytes, and their class's, against the quotas."""
+    class_bytes_used = class_quota_bytes = None
+    teacher_id = _class_teacher_id(user)
+    if teacher_id is not None:
+        class_bytes_used = await _class_bytes_used(db, teacher_id)
+        class_quota_bytes = settings.CLASS_STORAGE_QUOTA_BYTES
+    return StorageUsage(
+        bytes_used=user.bytes_used,
+        quota_bytes=settings.USER_STORAGE_QUOTA_BYTES,
+        class_bytes_used=class_bytes_used,
+        class_quota_bytes=class_quota_bytes,
+    )
+
+
+async def upload_allowance(db: AsyncSession, user: User) -> int | None:
+    """Bytes the user may still upload, or None when no quota applies.
+
+    The class total is only summed when CLASS_STORAGE_QUOTA_BYTES is set.
+    """
+    remaining = []
+    if settings.USER_STORAGE_QUOTA_BYTES is not None:
+        remaining.append(settings.USER_STORAGE_QUOTA_BYTES - user.bytes_used)
+    teacher_id = _class_teacher_id(user)
+    if settings.CLASS_STORAGE_QUOTA_BYTES is not None and teacher_id is not None:
+        class_bytes_used = await _class_bytes_used(db, teacher_id)
+        remaining.append(settings.CLASS_STORAGE_QUOTA_BYTES - class_bytes_used)
+    return min(remaining, default=None)
+
+
+def quota_exceeded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail="Storage quota exceeded",
+    )
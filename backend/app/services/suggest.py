@@ -0,0 +1,154 @@
+"""Keyword and topic autocomplete from per-class in-memory prefix indexes.
+
+A class is a teacher plus their students. Its index holds every session
+keyword and photo topic used in the class with a usage count, and is built
+from the database on the first suggestion request. Creates add to the
+index as they happen; writes that replace a term without the old value at
+hand (keyword/topic edits) drop the index so it is rebuilt on next use.
+Indexes are per worker process and also expire after
+SUGGEST_INDEX_TTL_SECONDS so other workers' writes show up.
+"""
+
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from heapq import nlargest
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import func, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.photo import Photo
+from app.models.session import Session
+from app.models.user import User
+
+
+def _key(term: str) -> str:
+    return term.strip().casefold()
+
+
+class PrefixIndex:
+    """Sorted array of case-folded terms with usage counts."""
+
+    def __init__(self):
+        self._keys: list[str] = []
+        self._counts: dict[str, int] = {}
+        self._display: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, term: str, count: int = 1) -> None:
+        key = _key(term)
+        if not key:
+            return
+        if key not in self._counts:
+            insort(self._keys, key)
+            self._counts[key] = 0
+            self._display[key] = term.strip()
+        self._counts[key] += count
+
+    def remove(self, term: str, count: int = 1) -> None:
+        key = _key(term)
+        if key not in self._counts:
+            return
+        self._counts[key] -= count
+        if self._counts[key] <= 0:
+            del self._counts[key], self._display[key]
+            self._keys.pop(bisect_left(self._keys, key))
+
+    def complete(self, prefix: str, limit: int) -> list[tuple[str, int]]:
+        """Most used terms starting with ``prefix`` (case-insensitive)."""
+        prefix = _key(prefix)
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + "\U0010ffff", start)
+        best = nlargest(limit, self._keys[start:end], key=self._counts.__getitem__)
+        return [(self._display[key], self._counts[key]) for key in best]
+
+
+def class_id(user: User) -> UUID:
+    """The teacher whose class the user belongs to (or the user's own id)."""
+    if user.role == "teacher":
+        return user.id
+    return user.teacher_id or user.id
+
+
+async def _load_term_counts(db: AsyncSession, class_key: UUID) -> list[tuple[str, int]]:
+    members = select(User.id).where(or_(User.id == class_key, User.teacher_id == class_key))
+    terms = union_all(
+        select(func.jsonb_array_elements_text(Session.keywords).label("term")).where(
+            Session.user_id.in_(members)
+        ),
+        select(Photo.topic.label("term")).where(
+            Photo.user_id.in_(members), Photo.topic.is_not(None)
+        ),
+    ).subquery()
+    result = await db.execute(
+        select(terms.c.term, func.count()).group_by(terms.c.term)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+class SuggestionIndex:
+    """LRU of class PrefixIndexes, built lazily."""
+
+    def __init__(self, ttl_seconds: float, max_classes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_classes = max_classes
+        self._classes: OrderedDict[UUID, tuple[float, PrefixIndex]] = OrderedDict()
+
+    def _get(self, class_key: UUID) -> PrefixIndex | None:
+        entry = self._classes.get(class_key)
+        if entry is None:
+            return None
+        built_at, index = entry
+        if time.monotonic() - built_at > self.ttl_seconds:
+            del self._classes[class_key]
+            return None
+        self._classes.move_to_end(class_key)
+        return index
+
+    async def suggest(
+        self, db: AsyncSession, user: User, prefix: str, limit: int
+    ) -> list[tuple[str, int]]:
+        class_key = class_id(user)
+        index = self._get(class_key)
+        if index is None:
+            index = PrefixIndex()
+            # Spellings that differ only in case merge; the most used one is shown
+            for term, count in sorted(
+                await _load_term_counts(db, class_key), key=lambda tc: -tc[1]
+            ):
+                index.add(term, count)
+            self._classes[class_key] = (time.monotonic(), index)
+            while len(self._classes) > self.max_classes:
+                self._classes.popitem(last=False)
+        return index.complete(prefix, limit)
+
+    def record(
+        self, user: User, added: Iterable[str | None] = (), removed: Iterable[str | None] = ()
+    ) -> None:
+        """Apply committed writes to the class's index, if it is loaded."""
+        index = self._get(class_id(user))
+        if index is None:
+            return
+        for term in added:
+            if term:
+                index.add(term)
+        for term in removed:
+            if term:
+                index.remove(term)
+
+    def invalidate(self, user: User) -> None:
+        self._classes.pop(class_id(user), None)
+
+    def clear(self) -> None:
+        self._classes.clear()
+
+
+suggestion_index = SuggestionIndex(
+    ttl_seconds=settings.SUGGEST_INDEX_TTL_SECONDS,
+    max_classes=settings.SUGGEST_INDEX_MAX_CLASSES,
+)
@@ -0,0 +1,216 @@
+"""Reconciliation of the maintained photo counters.
+
+users.photo_count/bytes_used and sessions.photo_count/bytes_used are kept
+up to date by the photos_usage_sync trigger. This job recomputes them from
+the photos table and fixes any row that drifted (manual SQL, restores,
+trigger disabled during a bulk load). Run it periodically, e.g. nightly:
+
+    python -m app.services.usage_counters [batch_size]
+
+The counters sum photos.size_bytes, so they cannot fix a photo stored
+with size 0 (its file was missing during migration 010, or it was
+uploaded by code predating the column). Once the files are in place,
+fill those sizes in from the files; the trigger adjusts the counters:
+
+    python -m app.services.usage_counters --restat-sizes [batch_size]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.uploads import safe_resolve_path
+from app.models.photo import Photo
+from app.models.session import Session
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Original URLs are /uploads/photos/<user>/<file>, relative to the backend dir
+UPLOAD_ROOT = "uploads"
+
+
+def _fix_counters(model, photo_key, *conditions):
+    """UPDATE rows of ``model`` whose counters differ from their photos."""
+    photos = select(Photo).where(photo_key == model.id)
+    photo_count = photos.with_only_columns(func.count()).scalar_subquery()
+    bytes_used = photos.with_only_columns(
+        func.coalesce(func.sum(Photo.size_bytes), 0)
+    ).scalar_subquery()
+    return (
+        update(model)
+        .where(
+            *conditions,
+            or_(model.photo_count != photo_count, model.bytes_used != bytes_used),
+        )
+        .values(photo_count=photo_count, bytes_used=bytes_used)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_usage_counters(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    batch_size: int = 500,
+    progress: Callable[[int, int], None] | None = None,
+) -> tuple[int, int]:
+    """Recompute the counters of all users and their sessions.
+
+    Users are walked in id order, ``batch_size`` per transaction. A batch
+    first locks its users' sessions and then the users (the trigger's lock
+    order), so uploads, moves and deletes in flight wait for it instead
+    of being overwritten by counts computed just before they committed.
+    ``progress(users_done, rows_fixed)`` is called after each batch.
+    Returns the final totals.
+    """
+    users_done = rows_fixed = 0
+    last_user_id: UUID | None = None
+
+    while True:
+        async with sessionmaker() as db:
+            query = select(User.id).order_by(User.id).limit(batch_size)
+            if last_user_id is not None:
+                query = query.where(User.id > last_user_id)
+            user_ids = list((await db.execute(query)).scalars())
+            if not user_ids:
+                break
+            # Sessions before users, the trigger's lock order. FOR NO KEY
+            # UPDATE: photo inserts (FK checks) may still proceed up to the
+            # trigger's counter updates
+            await db.execute(
+                select(Session.id)
+                .where(Session.user_id.in_(user_ids))
+                .order_by(Session.id)
+                .with_for_update(key_share=True)
+            )
+            await db.execute(
+                select(User.id)
+                .where(User.id.in_(user_ids))
+                .order_by(User.id)
+                .with_for_update(key_share=True)
+            )
+
+            fixed = 0
+            for statement in (
+                _fix_counters(User, Photo.user_id, User.id.in_(user_ids)),
+                _fix_counters(Session, Photo.session_id, Session.user_id.in_(user_ids)),
+            ):
+                fixed += (await db.execute(statement)).rowcount
+            await db.commit()
+
+        if fixed:
+            logger.warning("Fixed %d drifted photo counters", fixed)
+        users_done += len(user_ids)
+        rows_fixed += fixed
+        last_user_id = user_ids[-1]
+        if progress is not None:
+            progress(users_done, rows_fixed)
+
+    return users_done, rows_fixed
+
+
+def _file_size(original_url: str) -> int:
+    path = safe_resolve_path(UPLOAD_ROOT, original_url)
+    try:
+        return os.path.getsize(path) if path is not None else 0
+    except OSError:
+        return 0
+
+
+async def restat_photo_sizes(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    batch_size: int = 500,
+    progress: Callable[[int, int], None] | None = None,
+) -> tuple[int, int]:
+    """Set size_bytes of photos stored with size 0 from their files.
+
+    Photos are walked in id order, ``batch_size`` per transaction. A batch
+    locks its photos' sessions and then their owners (the trigger's lock
+    order) before updating, so the trigger's counter updates cannot
+    deadlock with uploads. Files still missing stay at 0.
+    ``progress(photos_checked, photos_fixed)`` is called after each batch.
+    Returns the final totals.
+    """
+    photos_checked = photos_fixed = 0
+    last_photo_id: UUID | None = None
+
+    while True:
+        async with sessionmaker() as db:
+            query = (
+                select(Photo.id, Photo.user_id, Photo.session_id, Photo.original_url)
+                .where(Photo.size_bytes == 0)
+                .order_by(Photo.id)
+                .limit(batch_size)
+            )
+            if last_photo_id is not None:
+                query = query.where(Photo.id > last_photo_id)
+            photos = (await db.execute(query)).all()
+            if not photos:
+                break
+            sizes = {
+                photo.id: size for photo in photos if (size := _file_size(photo.original_url))
+            }
+            if sizes:
+                changed = [photo for photo in photos if photo.id in sizes]
+                await db.execute(
+                    select(Session.id)
+                    .where(Session.id.in_({p.session_id for p in changed} - {None}))
+                    .order_by(Session.id)
+                    .with_for_update(key_share=True)
+                )
+                await db.execute(
+                    select(User.id)
+                    .where(User.id.in_({p.user_id for p in changed}))
+                    .order_by(User.id)
+                    .with_for_update(key_share=True)
+                )
+                for photo_id, size in sizes.items():
+                    result = await db.execute(
+                        update(Photo)
+                        .where(Photo.id == photo_id, Photo.size_bytes == 0)
+                        .values(size_bytes=size)
+                        .execution_options(synchronize_session=False)
+                    )
+                    photos_fixed += result.rowcount
+                await db.commit()
+
+        photos_checked += len(photos)
+        last_photo_id = photos[-1].id
+        if progress is not None:
+            progress(photos_checked, photos_fixed)
+
+    return photos_checked, photos_fixed
+
+
+async def _main(batch_size: int, restat_sizes: bool) -> None:
+    from app.db.database import AsyncSessionLocal, engine
+
+    if restat_sizes:
+        def report(photos_checked: int, photos_fixed: int) -> None:
+            print(f"  {photos_checked} photos checked, {photos_fixed} sizes set")
+
+        photos_checked, photos_fixed = await restat_photo_sizes(
+            AsyncSessionLocal, batch_size=batch_size, progress=report
+        )
+        print(f"Done: {photos_checked} photos, {photos_fixed} sizes set")
+    else:
+        def report(users_done: int, rows_fixed: int) -> None:
+            print(f"  {users_done} users checked, {rows_fixed} counters fixed")
+
+        users_done, rows_fixed = await reconcile_usage_counters(
+            AsyncSessionLocal, batch_size=batch_size, progress=report
+        )
+        print(f"Done: {users_done} users, {rows_fixed} counters fixed")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    restat_sizes = "--restat-sizes" in args
+    args = [arg for arg in args if arg != "--restat-sizes"]
+    asyncio.run(_main(int(args[0]) if args else 500, restat_sizes))
@@ -0,0 +1,4 @@
+"""Micro-benchmarks.
+
+Run from the backend directory, e.g. ``python -m benchmarks.token_cache``.
+"""
@@ -0,0 +1,74 @@
+"""Throwaway data for benchmarks that run against DATABASE_URL."""
+
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import delete, insert
+
+from app.core.security import create_access_token
+from app.db.database import AsyncSessionLocal
+from app.models.edit_history import EditHistory
+from app.models.photo import Photo
+from app.models.session import Session
+from app.models.user import User
+
+
+@asynccontextmanager
+async def throwaway_user(
+    photos: int = 100, sessions: int = 10, role: str = "student", teacher_id=None
+):
+    """Create a user with photos/sessions; yield (user_id, access_token)."""
+    user_id = uuid4()
+    now = datetime(2026, 5, 1, 9, 0, 0)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(User).values(
+                id=user_id,
+                name="bench",
+                email=f"bench-{user_id}@storylens.com",
+                password_hash="x",
+                role=role,
+                teacher_id=teacher_id,
+            )
+        )
+        session_ids = [uuid4() for _ in range(sessions)]
+        if session_ids:
+            await db.execute(
+                insert(Session),
+                [
+                    dict(id=sid, user_id=user_id, date=date(2026, 5, 1) + timedelta(days=n),
+                         title=f"session {n}", keywords=["바다", "봄"])
+                    for n, sid in enumerate(session_ids)
+                ],
+            )
+        if photos:
+            await db.execute(
+                insert(Photo),
+                [
+                    dict(
+                        user_id=user_id,
+                        session_id=session_ids[n % sessions] if sessions else None,
+                        original_url=f"/uploads/photos/{user_id}/{n}.jpg",
+                        thumbnail_url=f"/uploads/photos/{user_id}/{n}_thumb.jpg",
+                        title=f"photo {n}",
+                        topic="바다",
+                        created_at=now + timedelta(minutes=n),
+                        updated_at=now + timedelta(minutes=n),
+                    )
+                    for n in range(photos)
+                ],
+            )
+        await db.commit()
+    try:
+        yield user_id, create_access_token(subject=str(user_id))
+    finally:
+        async with AsyncSessionLocal() as db:
+            photo_ids = Photo.__table__.select().with_only_columns(Photo.id).where(
+                Photo.user_id == user_id
+            )
+            await db.execute(delete(EditHistory).where(EditHistory.photo_id.in_(photo_ids)))
+            await db.execute(delete(Photo).where(Photo.user_id == user_id))
+            await db.execute(delete(Session).where(Session.user_id == user_id))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
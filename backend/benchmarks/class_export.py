@@ -0,0 +1,54 @@
+"""Benchmark: class NDJSON export time and peak Python memory by class size.
+
+Runs stream_class_export against DATABASE_URL with throwaway data; peak
+memory (tracemalloc) should not grow with the number of students.
+
+Usage: python -m benchmarks.class_export [photos_per_student]
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+from contextlib import AsyncExitStack
+
+from app.db.database import AsyncSessionLocal, engine
+from app.services.class_export import stream_class_export
+from benchmarks._data import throwaway_user
+
+
+async def _export(teacher_id) -> tuple[float, int, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = 0
+    async with AsyncSessionLocal() as db:
+        async for chunk in stream_class_export(db, teacher_id):
+            size += len(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+async def main(photos: int) -> None:
+    async with AsyncExitStack() as stack:
+        teacher_id, _ = await stack.enter_async_context(
+            throwaway_user(photos=0, sessions=0, role="teacher")
+        )
+        students = 0
+        for target in (5, 20, 40):
+            while students < target:
+                await stack.enter_async_context(
+                    throwaway_user(photos=photos, sessions=10, teacher_id=teacher_id)
+                )
+                students += 1
+            elapsed, peak, size = await _export(teacher_id)
+            print(
+                f"{students:>3} students ({students * photos} photos)  {elapsed * 1000:7.1f} ms  "
+                f"peak {peak / 1024:7.1f} KiB  {size / 1024:7.1f} KiB gzip"
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
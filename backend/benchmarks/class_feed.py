@@ -0,0 +1,89 @@
+"""Benchmark: class feed page latency, deep pages, and a refresh burst.
+
+Seeds a teacher with 30 students against DATABASE_URL, then times the
+first page, a page deep into the feed (keyset, so it should cost about
+the same) and 30 concurrent refreshes of the first page through the
+shared cache, counting the feed queries they needed.
+
+Usage: python -m benchmarks.class_feed [photos_per_student]
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import AsyncExitStack
+
+from sqlalchemy import select
+
+from app.api.v1 import class_feed
+from app.db.database import AsyncSessionLocal, engine
+from app.models.photo import Photo
+from app.models.user import User
+from benchmarks._data import throwaway_user
+
+STUDENTS = 30
+PAGE = 30
+
+
+async def _timed_page(teacher_id, after) -> tuple[float, bytes]:
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        body = await class_feed._load_page(db, teacher_id, after, PAGE)
+        return time.perf_counter() - start, body
+
+
+async def main(photos: int) -> None:
+    async with AsyncExitStack() as stack:
+        teacher_id, _ = await stack.enter_async_context(
+            throwaway_user(photos=0, sessions=0, role="teacher")
+        )
+        for _ in range(STUDENTS):
+            await stack.enter_async_context(
+                throwaway_user(photos=photos, sessions=5, teacher_id=teacher_id)
+            )
+        await _timed_page(teacher_id, None)  # warm up
+        first, _ = await _timed_page(teacher_id, None)
+        async with AsyncSessionLocal() as db:
+            row = (
+                await db.execute(
+                    select(Photo.created_at, Photo.id)
+                    .join(User, User.id == Photo.user_id)
+                    .where(User.teacher_id == teacher_id)
+                    .order_by(Photo.created_at.desc(), Photo.id.desc())
+                    .offset(STUDENTS * photos // 2)
+                    .limit(1)
+                )
+            ).one()
+        deep, _ = await _timed_page(teacher_id, tuple(row))
+        print(f"{STUDENTS * photos} photos: first page {first * 1000:.1f} ms, "
+              f"page at the middle {deep * 1000:.1f} ms")
+
+        loads = 0
+        original = class_feed._load_page
+
+        async def counting_load(*args):
+            nonlocal loads
+            loads += 1
+            return await original(*args)
+
+        class_feed._load_page = counting_load
+        class_feed.class_feed_cache.clear()
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    class_feed.class_feed_cache.get_or_load(
+                        (teacher_id, None, PAGE),
+                        lambda: class_feed._load_page(db, teacher_id, None, PAGE),
+                    )
+                    for _ in range(30)
+                )
+            )
+            burst = time.perf_counter() - start
+        class_feed._load_page = original
+        print(f"30 concurrent refreshes: {loads} feed queries, {burst * 1000:.1f} ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
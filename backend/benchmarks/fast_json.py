@@ -0,0 +1,73 @@
+"""Benchmark: response_model serialization vs. precompiled fast JSON path.
+
+Serializes unattached Photo objects (no database) the way FastAPI does for
+GET /photos (validate, dump to primitives, json.dumps) and with
+json_list_response.
+
+Usage: python -m benchmarks.fast_json [iterations]
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.core.fast_json import json_list_response
+from app.main import app
+from app.models.photo import Photo
+from app.schemas.photo import PhotoResponse
+
+
+def _photos(count: int) -> list[Photo]:
+    user_id, now = uuid4(), datetime.utcnow()
+    return [
+        Photo(
+            id=uuid4(),
+            user_id=user_id,
+            session_id=uuid4(),
+            original_url=f"/uploads/{user_id}/{i}.jpg",
+            edited_url=f"/uploads/{user_id}/{i}_edited.jpg",
+            thumbnail_url=f"/uploads/{user_id}/{i}_thumb.jpg",
+            title=f"사진 {i}",
+            topic="봄나들이",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+async def main(iterations: int) -> None:
+    route = next(
+        r for r in app.routes
+        if isinstance(r, APIRoute) and r.path == "/api/v1/photos" and "GET" in r.methods
+    )
+
+    async def default_path(photos: list[Photo]) -> bytes:
+        content = await serialize_response(field=route.response_field, response_content=photos)
+        return JSONResponse(content).body
+
+    async def fast_path(photos: list[Photo]) -> bytes:
+        return json_list_response(PhotoResponse, photos).body
+
+    for count in (50, 100):
+        photos = _photos(count)
+        for label, render in (("response_model", default_path), ("fast json", fast_path)):
+            for _ in range(50):
+                body = await render(photos)
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await render(photos)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{count:>3} items  {label:<15} {elapsed / iterations * 1e6:8.1f} µs/response  "
+                f"{len(body)} bytes"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
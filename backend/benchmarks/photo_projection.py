@@ -0,0 +1,44 @@
+"""Benchmark: full PhotoResponse page vs. fields= projection (100 items).
+
+Runs the real ASGI app against DATABASE_URL with throwaway data.
+
+Usage: python -m benchmarks.photo_projection [requests]
+"""
+
+import asyncio
+import sys
+import time
+
+from httpx import ASGITransport, AsyncClient
+
+from app.db.database import engine
+from app.main import app
+from benchmarks._data import throwaway_user
+
+GALLERY_FIELDS = "thumbnail_url,edited_url,created_at"
+
+
+async def main(requests: int) -> None:
+    async with throwaway_user(photos=100) as (_, token):
+        headers = {"Authorization": f"Bearer {token}"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for label, url in (
+                ("full PhotoResponse", "/api/v1/photos?limit=100"),
+                ("fields= projection", f"/api/v1/photos?limit=100&fields={GALLERY_FIELDS}"),
+            ):
+                for _ in range(20):
+                    await client.get(url, headers=headers)
+                start = time.perf_counter()
+                for _ in range(requests):
+                    response = await client.get(url, headers=headers)
+                    assert response.status_code == 200
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{label:<20} {requests / elapsed:8.1f} req/s  "
+                    f"{elapsed / requests * 1000:6.2f} ms/req  {len(response.content)} bytes"
+                )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 300))
@@ -0,0 +1,89 @@
+"""Benchmark: commit+refresh writes vs. single-statement RETURNING writes.
+
+Runs against DATABASE_URL (tables must exist). Creates one throwaway user
+and removes it again afterwards.
+
+Usage: python -m benchmarks.returning_writes [iterations]
+"""
+
+import asyncio
+import sys
+import time
+from uuid import uuid4
+
+from sqlalchemy import delete, select
+
+from app.db.database import AsyncSessionLocal, engine
+from app.db.writes import insert_returning, update_owned_returning
+from app.models.photo import Photo
+from app.models.user import User
+
+
+async def _legacy_insert(db, user_id):
+    photo = Photo(user_id=user_id, original_url="/uploads/photos/bench.jpg")
+    db.add(photo)
+    await db.commit()
+    await db.refresh(photo)
+
+
+async def _returning_insert(db, user_id):
+    await insert_returning(
+        db, Photo, dict(user_id=user_id, original_url="/uploads/photos/bench.jpg")
+    )
+    await db.commit()
+
+
+async def _legacy_update(db, user_id, photo_id, n):
+    result = await db.execute(
+        select(Photo).where(Photo.id == photo_id, Photo.user_id == user_id)
+    )
+    photo = result.scalar_one()
+    photo.title = f"title {n}"
+    await db.commit()
+    await db.refresh(photo)
+
+
+async def _returning_update(db, user_id, photo_id, n):
+    await update_owned_returning(db, Photo, photo_id, user_id, {"title": f"title {n}"})
+    await db.commit()
+
+
+async def main(iterations: int) -> None:
+    async with AsyncSessionLocal() as db:
+        user = User(
+            name="bench",
+            email=f"bench-{uuid4()}@storylens.com",
+            password_hash="x",
+            role="teacher",
+        )
+        db.add(user)
+        await db.commit()
+        photo = await insert_returning(
+            db, Photo, dict(user_id=user.id, original_url="/uploads/photos/bench.jpg")
+        )
+        await db.commit()
+
+        cases = {
+            "insert commit+refresh": lambda n: _legacy_insert(db, user.id),
+            "insert RETURNING": lambda n: _returning_insert(db, user.id),
+            "update select+commit+refresh": lambda n: _legacy_update(db, user.id, photo.id, n),
+            "update RETURNING": lambda n: _returning_update(db, user.id, photo.id, n),
+        }
+        try:
+            for label, case in cases.items():
+                for n in range(10):
+                    await case(n)
+                start = time.perf_counter()
+                for n in range(iterations):
+                    await case(n)
+                elapsed = time.perf_counter() - start
+                print(f"{label:<30} {elapsed / iterations * 1000:7.3f} ms/op")
+        finally:
+            await db.execute(delete(Photo).where(Photo.user_id == user.id))
+            await db.execute(delete(User).where(User.id == user.id))
+            await db.commit()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
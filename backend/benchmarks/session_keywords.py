@@ -0,0 +1,97 @@
+"""Benchmark: keyword filter on sessions, before/after the JSONB migration.
+
+Works on either schema: with the old JSON column the filter has to cast
+every row (keywords::jsonb @> ...); with JSONB it uses the jsonb_path_ops
+GIN index. Seeded rows stay until ``clean`` so a migration can run between
+measurements:
+
+    python -m benchmarks.session_keywords seed 200000
+    python -m benchmarks.session_keywords          # before
+    alembic upgrade head                           # times the backfill
+    python -m benchmarks.session_keywords          # after
+    python -m benchmarks.session_keywords clean
+"""
+
+import asyncio
+import random
+import sys
+import time
+
+from sqlalchemy import text
+
+from app.db.database import AsyncSessionLocal, engine
+
+EMAIL = "bench-keywords@storylens.com"
+KEYWORDS = [f"키워드{n}" for n in range(500)]
+
+
+async def seed(count: int) -> None:
+    async with AsyncSessionLocal() as db:
+        user_id = await db.scalar(
+            text(
+                "INSERT INTO users (id, name, email, password_hash, role, is_active, "
+                "created_at, updated_at) VALUES (gen_random_uuid(), 'bench', :email, 'x', "
+                "'student', true, now(), now()) RETURNING id"
+            ),
+            {"email": EMAIL},
+        )
+        # Three random keywords per session
+        await db.execute(
+            text(
+                "INSERT INTO sessions (id, user_id, date, title, keywords, created_at, updated_at) "
+                "SELECT gen_random_uuid(), :uid, date '2026-01-01' + (n % 365), 'bench ' || n, "
+                "json_build_array('키워드' || (n * 7 % 500), '키워드' || (n * 13 % 500), "
+                "'키워드' || (n * 31 % 500)), now(), now() FROM generate_series(1, :count) n"
+            ),
+            {"uid": user_id, "count": count},
+        )
+        await db.commit()
+    print(f"Seeded {count} sessions")
+
+
+async def clean() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            text("DELETE FROM sessions WHERE user_id IN (SELECT id FROM users WHERE email = :e)"),
+            {"e": EMAIL},
+        )
+        await db.execute(text("DELETE FROM users WHERE email = :e"), {"e": EMAIL})
+        await db.commit()
+
+
+async def measure(iterations: int) -> None:
+    async with AsyncSessionLocal() as db:
+        column_type = await db.scalar(
+            text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = 'sessions' AND column_name = 'keywords'"
+            )
+        )
+        expr = "keywords" if column_type == "jsonb" else "keywords::jsonb"
+        query = text(
+            f"SELECT id, title FROM sessions WHERE {expr} @> jsonb_build_array(CAST(:kw AS text))"
+        )
+        plan = await db.execute(
+            text(f"EXPLAIN {query.text}"), {"kw": KEYWORDS[0]}
+        )
+        print(f"keywords column: {column_type}")
+        print("  " + "\n  ".join(row[0] for row in plan))
+        for _ in range(5):
+            await db.execute(query, {"kw": random.choice(KEYWORDS)})
+        start = time.perf_counter()
+        rows = 0
+        for _ in range(iterations):
+            rows += len((await db.execute(query, {"kw": random.choice(KEYWORDS)})).all())
+        elapsed = time.perf_counter() - start
+        print(f"{elapsed / iterations * 1000:.2f} ms/query, {rows / iterations:.0f} rows/query")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "50"
+    if command == "seed":
+        asyncio.run(seed(int(sys.argv[2]) if len(sys.argv) > 2 else 200000))
+    elif command == "clean":
+        asyncio.run(clean())
+    else:
+        asyncio.run(measure(int(command)))
@@ -0,0 +1,90 @@
+"""Benchmark: maintained photo counters vs COUNT(*), and reconciliation.
+
+Seeds a student with many photos against DATABASE_URL, then times the
+per-user and per-session photo totals computed from photos against reading
+the maintained columns, the cost of single-photo inserts with the counter
+trigger, and a reconciliation pass (which should find nothing to fix).
+
+Usage: python -m benchmarks.usage_counters [photos]
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import func, insert, select
+
+from app.db.database import AsyncSessionLocal, engine
+from app.models.photo import Photo
+from app.models.session import Session
+from app.models.user import User
+from app.services.usage_counters import reconcile_usage_counters
+from benchmarks._data import throwaway_user
+
+RUNS = 50
+
+
+async def _timed(statement) -> float:
+    async with AsyncSessionLocal() as db:
+        await db.execute(statement)  # warm up
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            (await db.execute(statement)).all()
+        return (time.perf_counter() - start) / RUNS
+
+
+async def main(photos: int) -> None:
+    async with throwaway_user(photos=photos, sessions=60) as (user_id, _):
+        counted = await _timed(
+            select(func.count(), func.sum(Photo.size_bytes)).where(Photo.user_id == user_id)
+        )
+        stored = await _timed(
+            select(User.photo_count, User.bytes_used).where(User.id == user_id)
+        )
+        print(f"user total, {photos} photos: COUNT(*) {counted * 1000:.2f} ms, "
+              f"maintained {stored * 1000:.2f} ms")
+
+        counted = await _timed(
+            select(Photo.session_id, func.count())
+            .where(Photo.user_id == user_id)
+            .group_by(Photo.session_id)
+        )
+        stored = await _timed(
+            select(Session.id, Session.photo_count).where(Session.user_id == user_id)
+        )
+        print(f"per-session totals (calendar): GROUP BY {counted * 1000:.2f} ms, "
+              f"maintained {stored * 1000:.2f} ms")
+
+        async with AsyncSessionLocal() as db:
+            session_id = await db.scalar(
+                select(Session.id).where(Session.user_id == user_id).limit(1)
+            )
+            start = time.perf_counter()
+            for n in range(RUNS):
+                await db.execute(
+                    insert(Photo).values(
+                        user_id=user_id,
+                        session_id=session_id,
+                        original_url=f"/uploads/photos/{user_id}/extra-{n}.jpg",
+                        size_bytes=1000,
+                    )
+                )
+                await db.commit()
+            upload = (time.perf_counter() - start) / RUNS
+            user = (
+                await db.execute(
+                    select(User.photo_count, User.bytes_used).where(User.id == user_id)
+                )
+            ).one()
+        print(f"insert + commit with counter trigger: {upload * 1000:.2f} ms; "
+              f"counters now {tuple(user)}")
+
+        start = time.perf_counter()
+        users, fixed = await reconcile_usage_counters(AsyncSessionLocal)
+        print(f"reconciliation: {users} users, {fixed} fixed, "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
@@ -1,4 +1,6 @@
 """Authentication API tests."""
+import time
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -231,3 +233,71 @@ class TestRefreshToken:
         )
 
         assert response.status_code == 401
+
+
+class TestTokenClaimsCache:
+    """Test the verified-claims cache used by get_current_user."""
+
+    def test_put_and_get(self):
+        """Test cached claims are returned for the same token."""
+        from app.core.token_cache import TokenClaimsCache
+        cache = TokenClaimsCache(maxsize=4)
+        claims = {"sub": "abc", "type": "access", "exp": int(time.time()) + 60}
+
+        cache.put("token-a", claims)
+
+        assert cache.get("token-a") == claims
+        assert cache.get("token-b") is None
+
+    def test_expired_entry_is_dropped(self):
+        """Test claims past their exp are never returned."""
+        from app.core.token_cache import TokenClaimsCache
+        cache = TokenClaimsCache(maxsize=4)
+        cache.put("token-a", {"sub": "abc", "exp": int(time.time()) + 60})
+        cache._entries[next(iter(cache._entries))] = (time.time() - 1, {"sub": "abc"})
+
+        assert cache.get("token-a") is None
+        assert len(cache) == 0
+
+    def test_tokens_without_exp_are_not_cached(self):
+        """Test claims without exp are skipped."""
+        from app.core.token_cache import TokenClaimsCache
+        cache = TokenClaimsCache(maxsize=4)
+        cache.put("token-a", {"sub": "abc"})
+
+        assert len(cache) == 0
+
+    def test_bounded_size(self):
+        """Test the least recently used entry is evicted."""
+        from app.core.token_cache import TokenClaimsCache
+        cache = TokenClaimsCache(maxsize=2)
+        exp = int(time.time()) + 60
+        cache.put("a", {"exp": exp})
+        cache.put("b", {"exp": exp})
+        cache.get("a")
+        cache.put("c", {"exp": exp})
+
+        assert len(cache) == 2
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+
+    @pytest.mark.asyncio
+    async def test_authenticated_request_populates_cache(
+        self, client: AsyncClient, teacher_token: str
+    ):
+        """Test repeat requests with the same token reuse cached claims."""
+        from app.core.token_cache import token_claims_cache
+        token_claims_cache.clear()
+
+        first = await client.get(
+            "/api/v1/users/me", headers={"Authorization": f"Bearer {teacher_token}"}
+        )
+        assert token_claims_cache.get(teacher_token) is not None
+
+        second = await client.get(
+            "/api/v1/users/me", headers={"Authorization": f"Bearer {teacher_token}"}
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.json()["id"] == second.json()["id"]
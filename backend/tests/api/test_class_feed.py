@@ -0,0 +1,147 @@
+"""Tests for the teacher class feed."""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.class_feed import class_feed_cache
+from app.core.security import get_password_hash
+from app.core.shared_cache import SharedTTLCache
+from app.models.photo import Photo
+from app.models.user import User
+
+
+@pytest.fixture
+async def class_photos(db_session: AsyncSession, test_teacher, test_student, teacher_token):
+    class_feed_cache.clear()
+    other = User(
+        name="다른 학생",
+        email="student2@storylens.com",
+        password_hash=get_password_hash("password123"),
+        role="student",
+        teacher_id=test_teacher.id,
+    )
+    db_session.add(other)
+    await db_session.flush()
+    start = datetime(2024, 5, 1, 9)
+    photos = [
+        Photo(
+            user_id=(test_student, other)[n % 2].id,
+            original_url=f"/uploads/photos/{n}.jpg",
+            created_at=start + timedelta(minutes=n),
+        )
+        for n in range(5)
+    ]
+    # The teacher's own photo is not part of the class feed
+    photos.append(
+        Photo(user_id=test_teacher.id, original_url="/uploads/photos/t.jpg", created_at=start)
+    )
+    db_session.add_all(photos)
+    await db_session.commit()
+    yield [str(photo.id) for photo in photos[4::-1]]
+    class_feed_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_class_feed_paginates_newest_first(
+    client: AsyncClient, teacher_token: str, test_student, class_photos
+):
+    """Test the feed spans all students and follows next_cursor."""
+    headers = {"Authorization": f"Bearer {teacher_token}"}
+    first = await client.get("/api/v1/class/photos", params={"limit": 3}, headers=headers)
+
+    assert first.status_code == 200
+    page = first.json()
+    assert [p["id"] for p in page["items"]] == class_photos[:3]
+    assert page["items"][0]["student_name"] == test_student.name
+    assert page["items"][1]["student_name"] == "다른 학생"
+
+    second = await client.get(
+        "/api/v1/class/photos",
+        params={"limit": 3, "cursor": page["next_cursor"]},
+        headers=headers,
+    )
+    assert [p["id"] for p in second.json()["items"]] == class_photos[3:]
+    assert second.json()["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_class_feed_cached(
+    client: AsyncClient, db_session: AsyncSession, teacher_token: str, test_student, class_photos
+):
+    """Test a repeated request is served from the cache without the feed query."""
+    headers = {"Authorization": f"Bearer {teacher_token}"}
+    first = await client.get("/api/v1/class/photos", headers=headers)
+    assert 'desc="2 queries"' in first.headers["server-timing"]
+
+    db_session.add(Photo(user_id=test_student.id, original_url="/uploads/photos/new.jpg"))
+    await db_session.commit()
+
+    cached = await client.get("/api/v1/class/photos", headers=headers)
+    assert 'desc="1 queries"' in cached.headers["server-timing"]
+    assert cached.json() == first.json()
+
+
+@pytest.mark.asyncio
+async def test_class_feed_teachers_only(
+    client: AsyncClient, student_token: str, teacher_token: str
+):
+    """Test students are refused and malformed cursors rejected."""
+    response = await client.get(
+        "/api/v1/class/photos", headers={"Authorization": f"Bearer {student_token}"}
+    )
+    assert response.status_code == 403
+
+    response = await client.get(
+        "/api/v1/class/photos",
+        params={"cursor": "not-a-cursor"},
+        headers={"Authorization": f"Bearer {teacher_token}"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_single_flight():
+    """Test concurrent misses share one load and a failed load is retried."""
+    cache: SharedTTLCache[int] = SharedTTLCache(ttl_seconds=60)
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    assert await asyncio.gather(*(cache.get_or_load("k", load) for _ in range(30))) == [1] * 30
+    assert calls == 1
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("other", fail)
+    assert await cache.get_or_load("other", load) == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_invalidated_during_load():
+    """Test a value loaded across an invalidation is returned but not cached."""
+    cache: SharedTTLCache[str] = SharedTTLCache(ttl_seconds=60)
+    started = asyncio.Event()
+
+    async def slow_load():
+        started.set()
+        await asyncio.sleep(0.01)
+        return "before write"
+
+    loading = asyncio.create_task(cache.get_or_load("k", slow_load))
+    await started.wait()
+    cache.invalidate("k")
+    assert await loading == "before write"
+
+    async def fresh_load():
+        return "after write"
+
+    assert await cache.get_or_load("k", fresh_load) == "after write"
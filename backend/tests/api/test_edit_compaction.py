@@ -0,0 +1,122 @@
+"""Edit history compaction tests."""
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.models.edit_history import EditHistory
+from app.models.photo import Photo
+from app.services.edit_compaction import apply_delta, compact_edit_history, make_delta
+
+
+def _states(count: int) -> list[dict]:
+    states = []
+    for n in range(count):
+        states.append({
+            "filter_name": "warm" if n % 3 else "cool",
+            "adjustments": {"brightness": n, "contrast": 10},
+            "crop_data": {"x": 0, "y": n // 4} if n % 5 else None,
+        })
+    return states
+
+
+async def _seed_history(db: AsyncSession, photo: Photo, states: list[dict]) -> None:
+    start = datetime(2026, 5, 1, 9, 0, 0)
+    db.add_all(
+        EditHistory(photo_id=photo.id, created_at=start + timedelta(seconds=n), **state)
+        for n, state in enumerate(states)
+    )
+    await db.commit()
+
+
+class TestDelta:
+    """Test delta encoding round trips."""
+
+    def test_round_trip(self):
+        """Test apply_delta(make_delta(a, b)) == b."""
+        states = _states(8) + [
+            {"filter_name": None, "adjustments": {"brightness": None}, "crop_data": {}},
+            {"filter_name": "calm", "adjustments": None, "crop_data": {"x": {"y": 1}}},
+            {"filter_name": "calm", "adjustments": {}, "crop_data": {"x": {}}},
+        ]
+        previous = {"filter_name": None, "adjustments": None, "crop_data": None}
+        for state in states:
+            assert apply_delta(previous, make_delta(previous, state)) == state
+            previous = state
+
+    def test_unchanged_fields_omitted(self):
+        """Test only changed fields are stored."""
+        previous = {"filter_name": "warm", "adjustments": {"a": 1, "b": 2}, "crop_data": None}
+        current = {"filter_name": "warm", "adjustments": {"a": 1, "b": 3}, "crop_data": None}
+
+        assert make_delta(previous, current) == {"adjustments": {"patch": {"b": 3}}}
+
+
+@pytest.mark.asyncio
+async def test_compaction_keeps_latest_and_checkpoints(
+    db_session: AsyncSession, test_engine: AsyncEngine, test_photo: Photo
+):
+    """Test older entries become deltas while latest N and checkpoints stay full."""
+    await _seed_history(db_session, test_photo, _states(25))
+    sessionmaker = async_sessionmaker(test_engine, expire_on_commit=False)
+    progress = []
+
+    photos, compacted = await compact_edit_history(
+        sessionmaker,
+        batch_size=1,
+        keep_latest=5,
+        checkpoint_every=4,
+        progress=lambda *args: progress.append(args),
+    )
+
+    # 20 older entries, of which 0, 4, 8, 12, 16 are checkpoints
+    assert (photos, compacted) == (1, 15)
+    assert progress == [(1, 15)]
+
+    db_session.expunge_all()
+    rows = (
+        await db_session.execute(
+            select(EditHistory)
+            .where(EditHistory.photo_id == test_photo.id)
+            .order_by(EditHistory.created_at)
+        )
+    ).scalars().all()
+    full = [n for n, row in enumerate(rows) if row.delta is None]
+    assert full == [0, 4, 8, 12, 16, 20, 21, 22, 23, 24]
+
+    # Rerunning finds nothing left to do
+    assert await compact_edit_history(sessionmaker, keep_latest=5, checkpoint_every=4) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_list_returns_full_states_after_compaction(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    test_engine: AsyncEngine,
+    test_photo: Photo,
+    student_token: str,
+):
+    """Test the API rebuilds compacted entries transparently."""
+    states = _states(25)
+    await _seed_history(db_session, test_photo, states)
+    await compact_edit_history(
+        async_sessionmaker(test_engine, expire_on_commit=False),
+        keep_latest=5,
+        checkpoint_every=4,
+    )
+    db_session.expunge_all()
+
+    response = await client.get(
+        f"/api/photos/{test_photo.id}/edits?skip=3&limit=15",
+        headers={"Authorization": f"Bearer {student_token}"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    expected = list(reversed(states))[3:18]
+    assert [
+        {key: item[key] for key in ("filter_name", "adjustments", "crop_data")}
+        for item in data
+    ] == expected
@@ -81,6 +81,24 @@ async def test_create_edit_with_all_fields(
     assert data["crop_data"]["flip_h"] is False
 
 
+@pytest.mark.asyncio
+async def test_create_edit_history_single_statement(
+    client: AsyncClient,
+    test_photo: Photo,
+    student_token: str
+):
+    """Test the ownership check and insert happen in one statement."""
+    response = await client.post(
+        f"/api/photos/{test_photo.id}/edits",
+        json={"filter_name": "warm", "adjustments": {"brightness": 5}},
+        headers={"Authorization": f"Bearer {student_token}"}
+    )
+
+    assert response.status_code == 201
+    # User lookup + INSERT ... SELECT ... RETURNING
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+
+
 @pytest.mark.asyncio
 async def test_get_edit_history_list(
     client: AsyncClient,
@@ -200,3 +218,165 @@ async def test_edit_history_photo_not_found(
 
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
+
+
+@pytest.fixture
+async def edit_buffer(test_engine, monkeypatch):
+    """Write-behind buffer bound to the test database."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    from app.routes import edit_history as edit_history_routes
+    from app.routes import photos as photo_routes
+    from app.services.edit_buffer import EditHistoryBuffer
+
+    buffer = EditHistoryBuffer(
+        async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False),
+        window_seconds=60,
+        max_pending=100,
+    )
+    monkeypatch.setattr(edit_history_routes, "edit_history_buffer", buffer)
+    monkeypatch.setattr(photo_routes, "edit_history_buffer", buffer)
+    yield buffer
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_autosave_edits_are_coalesced(
+    client: AsyncClient,
+    test_photo: Photo,
+    student_token: str,
+    edit_buffer
+):
+    """Test autosave edits are buffered and coalesced per photo."""
+    ids = set()
+    for brightness in (10, 20, 30):
+        response = await client.post(
+            f"/api/photos/{test_photo.id}/edits?autosave=true",
+            json={"filter_name": "warm", "adjustments": {"brightness": brightness}},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        assert response.status_code == 202
+        ids.add(response.json()["id"])
+
+    # One pending entry, nothing written yet
+    assert len(ids) == 1
+    assert len(edit_buffer) == 1
+
+    # Reading the history flushes pending autosaves first
+    response = await client.get(
+        f"/api/photos/{test_photo.id}/edits",
+        headers={"Authorization": f"Bearer {student_token}"}
+    )
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["id"] in ids
+    assert data[0]["adjustments"]["brightness"] == 30
+    assert len(edit_buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_editor_returns_pending_autosave(
+    client: AsyncClient,
+    test_photo: Photo,
+    student_token: str,
+    edit_buffer
+):
+    """Test the editor bootstrap shows a buffered autosave without flushing it."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    saved = await client.post(
+        f"/api/photos/{test_photo.id}/edits?autosave=true",
+        json={"filter_name": "happy", "adjustments": {"brightness": 10}},
+        headers=headers
+    )
+
+    response = await client.get(f"/api/v1/photos/{test_photo.id}/editor", headers=headers)
+    edit = response.json()["latest_edit"]
+    assert edit["id"] == saved.json()["id"]
+    assert edit["adjustments"] == {"brightness": 10}
+    assert len(edit_buffer) == 1
+
+
+@pytest.mark.asyncio
+async def test_autosave_checks_ownership(
+    client: AsyncClient,
+    test_photo: Photo,
+    teacher_token: str,
+    edit_buffer
+):
+    """Test buffered autosaves are still limited to the photo owner."""
+    response = await client.post(
+        f"/api/photos/{test_photo.id}/edits?autosave=true",
+        json={"filter_name": "warm"},
+        headers={"Authorization": f"Bearer {teacher_token}"}
+    )
+
+    assert response.status_code == 403
+    assert len(edit_buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_autosave_sync_mode(
+    client: AsyncClient,
+    test_photo: Photo,
+    student_token: str,
+    edit_buffer,
+    monkeypatch
+):
+    """Test EDIT_HISTORY_WRITE_MODE=sync writes autosaves immediately."""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "EDIT_HISTORY_WRITE_MODE", "sync")
+
+    response = await client.post(
+        f"/api/photos/{test_photo.id}/edits?autosave=true",
+        json={"filter_name": "warm"},
+        headers={"Authorization": f"Bearer {student_token}"}
+    )
+
+    assert response.status_code == 201
+    assert len(edit_buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_buffer_flush_skips_deleted_photos(
+    db_session,
+    test_photo: Photo,
+    edit_buffer
+):
+    """Test a flush writes one multi-row insert and drops edits for missing photos."""
+    from uuid import uuid4
+    from sqlalchemy import select
+    from app.models.edit_history import EditHistory
+
+    edit_buffer.add(test_photo.id, "calm", {"contrast": 5}, None)
+    edit_buffer.add(uuid4(), "warm", None, None)
+
+    assert await edit_buffer.flush() == 1
+
+    result = await db_session.execute(
+        select(EditHistory).where(EditHistory.photo_id == test_photo.id)
+    )
+    assert [e.filter_name for e in result.scalars()] == ["calm"]
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_after_window(test_photo: Photo, edit_buffer):
+    """Test pending edits are written by the background flusher."""
+    import asyncio
+
+    edit_buffer.window_seconds = 0.05
+    edit_buffer.add(test_photo.id, "memory", None, None)
+    await asyncio.sleep(0.3)
+
+    assert len(edit_buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_buffer_flush_marks_owner_write(test_photo: Photo, edit_buffer, monkeypatch):
+    """Test flushed edits send their owner's reads to the primary."""
+    from app.db.replica import replica_router
+
+    monkeypatch.setattr(replica_router, "_last_write", {})
+    edit_buffer.add(test_photo.id, "calm", None, None)
+    assert not replica_router.is_sticky(test_photo.user_id)
+
+    assert await edit_buffer.flush() == 1
+    assert replica_router.is_sticky(test_photo.user_id)
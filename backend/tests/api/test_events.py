@@ -0,0 +1,229 @@
+"""Tests for live class events (hub, SSE formatting and the stream endpoint)."""
+
+import asyncio
+import json
+import pytest
+from io import BytesIO
+from uuid import uuid4
+from httpx import AsyncClient
+
+from app.main import app
+from app.services.events import (
+    EDIT_CREATED,
+    PHOTO_CREATED,
+    EventHub,
+    event_hub,
+    format_sse,
+    sse_stream,
+)
+
+
+def _parse(message: bytes) -> tuple[str, dict]:
+    event_line, data_line = message.decode().strip().split("\n")
+    return event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))
+
+
+@pytest.mark.asyncio
+async def test_hub_routes_by_teacher_and_drops_slow_streams():
+    """Test events reach only the teacher's streams and full queues are dropped."""
+    hub = EventHub(queue_size=2)
+    teacher_id, other_id = uuid4(), uuid4()
+    with hub.subscribe(teacher_id) as slow, hub.subscribe(other_id) as other:
+        for n in range(3):
+            hub.deliver(teacher_id, PHOTO_CREATED, {"n": n})
+
+        assert slow.dropped
+        assert other.queue.empty()
+        stream = sse_stream(slow, heartbeat_seconds=60)
+        assert await stream.__anext__() == b"retry: 3000\n\n"
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+    assert hub.subscriber_count(teacher_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_formats_events_and_heartbeats():
+    """Test event framing and the keep-alive comment."""
+    hub = EventHub(queue_size=10)
+    teacher_id = uuid4()
+    with hub.subscribe(teacher_id) as subscription:
+        stream = sse_stream(subscription, heartbeat_seconds=0.01)
+        await stream.__anext__()
+        assert await stream.__anext__() == b": ping\n\n"
+
+        hub.deliver(teacher_id, EDIT_CREATED, {"edit_id": "e1"})
+        assert await stream.__anext__() == b'event: edit.created\ndata: {"edit_id": "e1"}\n\n'
+
+
+@pytest.mark.asyncio
+async def test_writes_publish_to_teacher(
+    client: AsyncClient, student_token: str, test_student, test_teacher, test_photo
+):
+    """Test uploads and saved edits publish events to the student's teacher."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    with event_hub.subscribe(test_teacher.id) as subscription:
+        uploaded = await client.post(
+            "/api/v1/photos",
+            headers=headers,
+            files={"file": ("test.jpg", BytesIO(b"fake-image-data"), "image/jpeg")},
+            data={"title": "새 사진"},
+        )
+        edited = await client.post(
+            f"/api/photos/{test_photo.id}/edits",
+            headers=headers,
+            json={"filter_name": "warm"},
+        )
+
+        event_type, data = _parse(subscription.queue.get_nowait())
+        assert event_type == PHOTO_CREATED
+        assert data["photo_id"] == uploaded.json()["id"]
+        assert data["student_id"] == str(test_student.id)
+        assert data["title"] == "새 사진"
+
+        event_type, data = _parse(subscription.queue.get_nowait())
+        assert event_type == EDIT_CREATED
+        assert data["edit_id"] == edited.json()["id"]
+        assert data["photo_id"] == str(test_photo.id)
+
+
+@pytest.mark.asyncio
+async def test_event_stream_endpoint(
+    client: AsyncClient, teacher_token: str, student_token: str, test_teacher
+):
+    """Test the endpoint streams events and unsubscribes on disconnect."""
+    forbidden = await client.get(
+        "/api/v1/events", headers={"Authorization": f"Bearer {student_token}"}
+    )
+    assert forbidden.status_code == 403
+
+    # httpx buffers whole ASGI responses, so drive the endpoint directly
+    sent: list[dict] = []
+    disconnected = asyncio.Event()
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+        if b"event: photo.created" in message.get("body", b""):
+            disconnected.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/events",
+        "raw_path": b"/api/v1/events",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"authorization", f"Bearer {teacher_token}".encode())],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    task = asyncio.create_task(app(scope, receive, send))
+    for _ in range(100):
+        if event_hub.subscriber_count(test_teacher.id):
+            break
+        await asyncio.sleep(0.01)
+    event_hub.publish(test_teacher.id, PHOTO_CREATED, {"photo_id": "p1"})
+    await asyncio.wait_for(task, 5)
+
+    start = sent[0]
+    assert start["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    assert format_sse(PHOTO_CREATED, {"photo_id": "p1"}) in body
+    assert event_hub.subscriber_count(test_teacher.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_pg_bridge_relays_between_hubs():
+    """Test LISTEN/NOTIFY carries an event published on one worker to another."""
+    from tests.conftest import TEST_DATABASE_URL
+
+    publisher, listener = EventHub(queue_size=10), EventHub(queue_size=10)
+    publisher.start_bridge(TEST_DATABASE_URL)
+    listener.start_bridge(TEST_DATABASE_URL)
+    teacher_id = uuid4()
+    try:
+        with listener.subscribe(teacher_id) as subscription:
+            event = None
+            # The listeners connect in the background; publish until one is up
+            for _ in range(50):
+                publisher.publish(teacher_id, PHOTO_CREATED, {"photo_id": "p1"})
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), 0.1)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+            assert event == format_sse(PHOTO_CREATED, {"photo_id": "p1"})
+    finally:
+        await publisher.close()
+        await listener.close()
+
+
+@pytest.mark.asyncio
+async def test_pg_bridge_survives_bad_payload_and_broken_connection():
+    """Test a malformed NOTIFY is skipped and a failed send is delivered locally."""
+    import asyncpg
+    from app.services.events import NOTIFY_CHANNEL, _PgBridge
+    from tests.conftest import TEST_DATABASE_URL
+
+    hub = EventHub(queue_size=10)
+    bridge = _PgBridge(hub, TEST_DATABASE_URL)
+    teacher_id = uuid4()
+    with hub.subscribe(teacher_id) as subscription:
+        bridge._on_notify(None, 0, NOTIFY_CHANNEL, "not json")
+        bridge._on_notify(None, 0, NOTIFY_CHANNEL, json.dumps({"teacher_id": "x"}))
+        assert subscription.queue.empty()
+
+        class BrokenConnection:
+            terminated = False
+
+            def is_closed(self):
+                return False
+
+            async def execute(self, *args):
+                raise asyncpg.InterfaceError("connection is closed")
+
+            def terminate(self):
+                self.terminated = True
+
+        broken = bridge._notify_conn = BrokenConnection()
+        bridge.notify(teacher_id, PHOTO_CREATED, {"photo_id": "p1"})
+        event = await asyncio.wait_for(subscription.queue.get(), 1)
+        assert event == format_sse(PHOTO_CREATED, {"photo_id": "p1"})
+        assert broken.terminated and bridge._notify_conn is None
+    await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_pg_bridge_broadcasts_cache_invalidations():
+    """Test an invalidation runs at once locally and reaches the other worker."""
+    from tests.conftest import TEST_DATABASE_URL
+
+    writer, reader = EventHub(queue_size=10), EventHub(queue_size=10)
+    local, remote = [], asyncio.Queue()
+    writer.register_invalidator("home", local.append)
+    reader.register_invalidator("home", remote.put_nowait)
+    writer.start_bridge(TEST_DATABASE_URL)
+    reader.start_bridge(TEST_DATABASE_URL)
+    user_id = uuid4()
+    try:
+        received = None
+        # The listeners connect in the background; invalidate until one is up
+        for _ in range(50):
+            writer.invalidate("home", user_id)
+            try:
+                received = await asyncio.wait_for(remote.get(), 0.1)
+                break
+            except asyncio.TimeoutError:
+                pass
+        assert received == user_id
+        assert local and set(local) == {user_id}
+    finally:
+        await writer.close()
+        await reader.close()
@@ -0,0 +1,196 @@
+"""Tests for the gallery facets endpoint and its summary table."""
+
+import asyncio
+import pytest
+from datetime import date, datetime
+from httpx import AsyncClient
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.models.photo import Photo
+from app.models.photo_facet import PhotoFacet
+from app.models.session import Session
+from app.services.facet_counts import reconcile_photo_facets
+
+
+@pytest.fixture
+async def faceted_photos(db_session: AsyncSession, test_student):
+    trip = Session(
+        user_id=test_student.id, date=date(2024, 7, 1), title="여름", keywords=["바다", "여름"]
+    )
+    db_session.add(trip)
+    await db_session.flush()
+    photos = [
+        Photo(
+            user_id=test_student.id,
+            original_url=f"/uploads/photos/{n}.jpg",
+            topic=topic,
+            session_id=trip.id if in_trip else None,
+            created_at=created_at,
+        )
+        for n, (topic, in_trip, created_at) in enumerate(
+            [
+                ("바다", True, datetime(2024, 7, 1, 10)),
+                ("바다", True, datetime(2024, 7, 2, 10)),
+                ("산", False, datetime(2024, 8, 1, 10)),
+                (None, False, datetime(2024, 8, 2, 10)),
+            ]
+        )
+    ]
+    db_session.add_all(photos)
+    await db_session.commit()
+    return trip, photos
+
+
+def _counts(entries):
+    return {entry["value"]: entry["count"] for entry in entries}
+
+
+@pytest.mark.asyncio
+async def test_facets_counts(
+    client: AsyncClient, student_token: str, test_student, faceted_photos
+):
+    """Test topic, keyword, month and student counts for the user's photos."""
+    response = await client.get(
+        "/api/v1/facets", headers={"Authorization": f"Bearer {student_token}"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["topics"] == [{"value": "바다", "count": 2}, {"value": "산", "count": 1}]
+    assert _counts(data["keywords"]) == {"바다": 2, "여름": 2}
+    assert data["months"] == [{"value": "2024-08", "count": 2}, {"value": "2024-07", "count": 2}]
+    assert data["students"] == [
+        {"student_id": str(test_student.id), "name": test_student.name, "count": 4}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_facets_follow_writes(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    student_token: str,
+    test_student,
+    faceted_photos,
+):
+    """Test photo and session writes keep the summary table exact."""
+    trip, photos = faceted_photos
+    headers = {"Authorization": f"Bearer {student_token}"}
+
+    updated = await client.put(
+        f"/api/v1/photos/{photos[2].id}", headers=headers, json={"topic": "바다"}
+    )
+    assert updated.status_code == 200
+    deleted = await client.delete(f"/api/v1/photos/{photos[0].id}", headers=headers)
+    assert deleted.status_code == 204
+    batch = await client.post(
+        "/api/v1/photos:batch",
+        headers=headers,
+        json={
+            "operations": [
+                {"op": "set_session", "photo_id": str(photos[3].id), "session_id": str(trip.id)},
+                {"op": "set_metadata", "photo_id": str(photos[1].id), "topic": "파도"},
+            ]
+        },
+    )
+    assert [r["status"] for r in batch.json()["results"]] == [200, 200]
+    renamed = await client.patch(
+        f"/api/v1/sessions/{trip.id}/keywords", headers=headers, json={"keywords": ["바다", "파도"]}
+    )
+    assert renamed.status_code == 200
+
+    data = (await client.get("/api/v1/facets", headers=headers)).json()
+    assert _counts(data["topics"]) == {"바다": 1, "파도": 1}
+    assert _counts(data["keywords"]) == {"바다": 2, "파도": 2}
+    assert _counts(data["months"]) == {"2024-07": 1, "2024-08": 2}
+    assert data["students"][0]["count"] == 3
+
+    stored = await db_session.execute(
+        select(func.sum(PhotoFacet.count)).where(
+            PhotoFacet.user_id == test_student.id, PhotoFacet.facet == "total"
+        )
+    )
+    assert stored.scalar_one() == 3
+
+
+@pytest.mark.asyncio
+async def test_facets_class_scope(
+    client: AsyncClient, student_token: str, teacher_token: str, faceted_photos
+):
+    """Test teachers see their class's counts; students cannot."""
+    response = await client.get(
+        "/api/v1/facets",
+        params={"scope": "class"},
+        headers={"Authorization": f"Bearer {teacher_token}"},
+    )
+    data = response.json()
+    assert _counts(data["topics"]) == {"바다": 2, "산": 1}
+    assert [s["count"] for s in data["students"]] == [4]
+
+    mine = await client.get(
+        "/api/v1/facets", headers={"Authorization": f"Bearer {teacher_token}"}
+    )
+    assert mine.json()["students"] == []
+
+    forbidden = await client.get(
+        "/api/v1/facets",
+        params={"scope": "class"},
+        headers={"Authorization": f"Bearer {student_token}"},
+    )
+    assert forbidden.status_code == 403
+
+
+async def _stored_facets(db: AsyncSession, user_id) -> dict[tuple[str, str], int]:
+    result = await db.execute(
+        select(PhotoFacet.facet, PhotoFacet.value, PhotoFacet.count).where(
+            PhotoFacet.user_id == user_id, PhotoFacet.count != 0
+        )
+    )
+    return {(facet, value): count for facet, value, count in result}
+
+
+@pytest.mark.asyncio
+async def test_photo_insert_waits_for_keyword_update(
+    db_session: AsyncSession, test_engine: AsyncEngine, test_student, faceted_photos
+):
+    """Test a photo added during a keyword change counts under the new keywords."""
+    trip, _ = faceted_photos
+    sessionmaker = async_sessionmaker(test_engine, expire_on_commit=False)
+    async with sessionmaker() as renaming, sessionmaker() as uploading:
+        await renaming.execute(
+            update(Session).where(Session.id == trip.id).values(keywords=["산"])
+        )
+        uploading.add(
+            Photo(user_id=test_student.id, session_id=trip.id, original_url="/uploads/photos/x.jpg")
+        )
+        upload = asyncio.create_task(uploading.commit())
+        await asyncio.sleep(0.2)
+        assert not upload.done()
+        await renaming.commit()
+        await upload
+
+    facets = await _stored_facets(db_session, test_student.id)
+    assert {v: c for (f, v), c in facets.items() if f == "keyword"} == {"산": 3}
+
+
+@pytest.mark.asyncio
+async def test_reconciliation_fixes_facet_drift(
+    db_session: AsyncSession, test_engine: AsyncEngine, test_student, faceted_photos
+):
+    """Test the job restores drifted, missing and stale rows and is idempotent."""
+    expected = await _stored_facets(db_session, test_student.id)
+    await db_session.execute(
+        update(PhotoFacet)
+        .where(PhotoFacet.facet == "topic", PhotoFacet.value == "바다")
+        .values(count=7)
+    )
+    await db_session.execute(delete(PhotoFacet).where(PhotoFacet.facet == "month"))
+    db_session.add(PhotoFacet(user_id=test_student.id, facet="keyword", value="유령", count=2))
+    await db_session.commit()
+
+    sessionmaker = async_sessionmaker(test_engine, expire_on_commit=False)
+    users, fixed = await reconcile_photo_facets(sessionmaker, batch_size=1)
+
+    assert (users, fixed) == (2, 4)
+    assert await _stored_facets(db_session, test_student.id) == expected
+    assert await reconcile_photo_facets(sessionmaker) == (2, 0)
@@ -0,0 +1,114 @@
+"""Tests for the home screen aggregate endpoint."""
+
+import pytest
+from datetime import date, datetime, timedelta
+from io import BytesIO
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.photo import Photo
+from app.models.session import Session
+from app.services.home import RECENT_PHOTOS, home_cache
+
+
+@pytest.fixture
+async def home_data(db_session: AsyncSession, test_student):
+    sessions = [
+        Session(user_id=test_student.id, date=date(2024, 3, day), title=f"s{day}", keywords=["봄"])
+        for day in range(1, 8)
+    ]
+    db_session.add_all(sessions)
+    start = datetime(2024, 3, 1, 9)
+    db_session.add_all(
+        Photo(
+            user_id=test_student.id,
+            original_url=f"/uploads/photos/{n}.jpg",
+            created_at=start + timedelta(minutes=n),
+        )
+        for n in range(RECENT_PHOTOS + 3)
+    )
+    await db_session.commit()
+    # The client shares this session; reload the trigger-maintained counters
+    await db_session.refresh(test_student)
+    yield
+    home_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_home_aggregates_in_one_query(
+    client: AsyncClient, student_token: str, test_student, home_data
+):
+    """Test profile, recent lists and totals come from one query after auth."""
+    response = await client.get(
+        "/api/v1/home", headers={"Authorization": f"Bearer {student_token}"}
+    )
+
+    assert response.status_code == 200
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+    data = response.json()
+    assert data["user"]["id"] == str(test_student.id)
+    assert [s["title"] for s in data["recent_sessions"]] == ["s7", "s6", "s5", "s4", "s3"]
+    assert data["recent_sessions"][0]["keywords"] == ["봄"]
+    photos = data["recent_photos"]
+    assert len(photos) == RECENT_PHOTOS
+    assert photos[0]["original_url"] == f"/uploads/photos/{RECENT_PHOTOS + 2}.jpg"
+    assert data["session_count"] == 7
+    assert data["photo_count"] == RECENT_PHOTOS + 3
+
+
+@pytest.mark.asyncio
+async def test_home_cached_until_user_writes(
+    client: AsyncClient, db_session: AsyncSession, student_token: str, test_student, home_data
+):
+    """Test repeat loads skip the query and the user's own upload invalidates."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    first = await client.get("/api/v1/home", headers=headers)
+    cached = await client.get("/api/v1/home", headers=headers)
+    assert 'desc="1 queries"' in cached.headers["server-timing"]
+    assert cached.json() == first.json()
+
+    uploaded = await client.post(
+        "/api/v1/photos",
+        headers=headers,
+        files={"file": ("test.jpg", BytesIO(b"fake-image-data"), "image/jpeg")},
+    )
+    db_session.expire(test_student)
+    refreshed = await client.get("/api/v1/home", headers=headers)
+    assert 'desc="2 queries"' in refreshed.headers["server-timing"]
+    assert refreshed.json()["recent_photos"][0]["id"] == uploaded.json()["id"]
+    assert refreshed.json()["photo_count"] == first.json()["photo_count"] + 1
+
+
+@pytest.mark.asyncio
+async def test_home_empty_user(client: AsyncClient, teacher_token: str):
+    """Test a user without sessions or photos gets empty lists and zero totals."""
+    response = await client.get(
+        "/api/v1/home", headers={"Authorization": f"Bearer {teacher_token}"}
+    )
+    data = response.json()
+    assert data["recent_sessions"] == [] and data["recent_photos"] == []
+    assert data["session_count"] == 0 and data["photo_count"] == 0
+    home_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_home_loads_from_primary(
+    client: AsyncClient, student_token: str, home_data, monkeypatch
+):
+    """Test a cache miss never reads (and caches) a possibly lagging replica."""
+    from app.core import deps
+
+    async def use_replica(user_id):
+        return True
+
+    def replica_session():
+        raise AssertionError("home read the replica")
+
+    monkeypatch.setattr(deps.replica_router, "use_replica", use_replica)
+    monkeypatch.setattr(deps.replica_router, "sessionmaker", replica_session)
+
+    response = await client.get(
+        "/api/v1/home", headers={"Authorization": f"Bearer {student_token}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["session_count"] == 7
@@ -0,0 +1,74 @@
+"""Internal operational endpoint tests."""
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.db.pool_metrics import PoolMetrics
+
+
+class TestDbPoolStats:
+    """Test GET /internal/db-pool endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_pool_stats(self, client: AsyncClient):
+        """Test pool stats expose live pool state and wait statistics."""
+        response = await client.get("/internal/db-pool")
+
+        assert response.status_code == 200
+        data = response.json()
+        for key in (
+            "pid",
+            "size",
+            "checked_out",
+            "overflow",
+            "checkouts",
+            "checkout_timeouts",
+            "wait_histogram",
+        ):
+            assert key in data
+        assert data["size"] == settings.DB_POOL_SIZE
+
+    @pytest.mark.asyncio
+    async def test_hidden_in_production_without_token(
+        self, client: AsyncClient, monkeypatch
+    ):
+        """Test the endpoint is not reachable in production without a token."""
+        monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+        monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", None)
+
+        response = await client.get("/internal/db-pool")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_requires_matching_token(self, client: AsyncClient, monkeypatch):
+        """Test X-Internal-Token must match INTERNAL_API_TOKEN when set."""
+        monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "ops-secret")
+
+        denied = await client.get(
+            "/internal/db-pool", headers={"X-Internal-Token": "wrong"}
+        )
+        allowed = await client.get(
+            "/internal/db-pool", headers={"X-Internal-Token": "ops-secret"}
+        )
+
+        assert denied.status_code == 404
+        assert allowed.status_code == 200
+
+
+class TestPoolMetrics:
+    """Test checkout wait-time accounting."""
+
+    def test_wait_histogram(self):
+        """Test waits land in the right bucket."""
+        metrics = PoolMetrics()
+        metrics.observe_wait(0.0005)
+        metrics.observe_wait(0.020)
+        metrics.observe_wait(10.0)
+        metrics.record_timeout()
+
+        assert metrics.checkouts == 3
+        assert metrics.checkout_timeouts == 1
+        assert metrics.wait_histogram[0] == 1
+        assert metrics.wait_histogram[PoolMetrics.BUCKETS_MS.index(25)] == 1
+        assert metrics.wait_histogram[-1] == 1
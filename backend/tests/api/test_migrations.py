@@ -0,0 +1,96 @@
+"""Tests that the migrations and the models' create_all DDL agree."""
+
+import os
+import subprocess
+import sys
+
+import asyncpg
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.conftest import TEST_DATABASE_URL
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+SCRATCH_DATABASE = "story_lens_migrations"
+
+# Trigger functions the models install for create_all (tests) and the
+# migrations install in production
+TRIGGER_FUNCTIONS = [
+    "photo_facets_bump",
+    "photos_facets_sync",
+    "sessions_facets_sync",
+    "photos_usage_sync",
+    "change_log_session_upsert",
+]
+
+_FUNCTION_DEFS = (
+    "SELECT p.proname, pg_get_functiondef(p.oid) FROM pg_proc p "
+    "JOIN pg_namespace n ON n.oid = p.pronamespace "
+    "WHERE n.nspname = 'public' AND p.proname = ANY($1)"
+)
+_TRIGGER_DEFS = (
+    "SELECT tgname, pg_get_triggerdef(oid) FROM pg_trigger "
+    "WHERE NOT tgisinternal AND tgfoid IN (SELECT oid FROM pg_proc WHERE proname = ANY($1))"
+)
+
+
+def _dsn(url: str, **changes) -> str:
+    return make_url(url).set(drivername="postgresql", **changes).render_as_string(
+        hide_password=False
+    )
+
+
+async def _definitions(dsn: str) -> tuple[dict[str, str], dict[str, str]]:
+    """Function and trigger definitions, whitespace-normalized (indentation differs)."""
+    conn = await asyncpg.connect(dsn)
+    try:
+        return tuple(
+            {name: " ".join(definition.split()) for name, definition in rows}
+            for rows in (
+                await conn.fetch(_FUNCTION_DEFS, TRIGGER_FUNCTIONS),
+                await conn.fetch(_TRIGGER_DEFS, TRIGGER_FUNCTIONS),
+            )
+        )
+    finally:
+        await conn.close()
+
+
+@pytest.fixture
+async def migrated_dsn():
+    """A scratch database upgraded to head with alembic."""
+    admin = await asyncpg.connect(_dsn(TEST_DATABASE_URL, database="postgres"))
+    try:
+        if not await admin.fetchval(
+            "SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"
+        ):
+            pytest.skip("migration 006 needs the pg_trgm extension")
+        await admin.execute(f"DROP DATABASE IF EXISTS {SCRATCH_DATABASE} WITH (FORCE)")
+        await admin.execute(f"CREATE DATABASE {SCRATCH_DATABASE}")
+        scratch_url = make_url(TEST_DATABASE_URL).set(database=SCRATCH_DATABASE)
+        subprocess.run(
+            [sys.executable, "-m", "alembic", "upgrade", "head"],
+            cwd=BACKEND_DIR,
+            env={
+                **os.environ,
+                "DATABASE_URL": scratch_url.render_as_string(hide_password=False),
+            },
+            check=True,
+            capture_output=True,
+        )
+        yield _dsn(TEST_DATABASE_URL, database=SCRATCH_DATABASE)
+    finally:
+        await admin.execute(f"DROP DATABASE IF EXISTS {SCRATCH_DATABASE} WITH (FORCE)")
+        await admin.close()
+
+
+@pytest.mark.asyncio
+async def test_model_triggers_match_migrations(db_session: AsyncSession, migrated_dsn: str):
+    """Test create_all installs the same trigger functions and triggers as alembic."""
+    modeled_functions, modeled_triggers = await _definitions(_dsn(TEST_DATABASE_URL))
+    migrated_functions, migrated_triggers = await _definitions(migrated_dsn)
+
+    assert sorted(modeled_functions) == sorted(TRIGGER_FUNCTIONS)
+    for name in TRIGGER_FUNCTIONS:
+        assert modeled_functions[name] == migrated_functions.get(name), name
+    assert modeled_triggers == migrated_triggers
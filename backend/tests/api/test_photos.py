@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 from io import BytesIO
 from uuid import uuid4
+from app.core.config import settings
 
 
 @pytest.mark.asyncio
@@ -98,6 +99,32 @@ async def test_get_photos_list(
     assert data[0]["title"] == "Photo 1"
 
 
+@pytest.mark.asyncio
+async def test_get_photos_conditional_get(client: AsyncClient, student_token: str):
+    """Test a matching If-None-Match gets a 304 without fetching the page."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    files = {"file": ("test.jpg", BytesIO(b"fake-image-data"), "image/jpeg")}
+    upload = await client.post("/api/v1/photos", headers=headers, files=files)
+    photo_id = upload.json()["id"]
+
+    first = await client.get("/api/v1/photos", headers=headers)
+    etag = first.headers["etag"]
+    # The version rides along on the page query
+    assert 'desc="2 queries"' in first.headers["server-timing"]
+
+    cached = await client.get("/api/v1/photos", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    # User lookup plus the version aggregate; no page query
+    assert 'desc="2 queries"' in cached.headers["server-timing"]
+
+    await client.delete(f"/api/v1/photos/{photo_id}", headers=headers)
+    changed = await client.get("/api/v1/photos", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json() == []
+    assert changed.headers["etag"] != etag
+
+
 @pytest.mark.asyncio
 async def test_get_photo_detail(
     client: AsyncClient, db_session: AsyncSession, student_token: str
@@ -191,6 +218,31 @@ async def test_update_photo(
     assert data["edited_url"] == "/uploads/photos/edited123.jpg"
 
 
+@pytest.mark.asyncio
+async def test_update_photo_single_statement(
+    client: AsyncClient, student_token: str, teacher_token: str, test_photo
+):
+    """Test update is one ownership-checked UPDATE ... RETURNING."""
+    response = await client.put(
+        f"/api/v1/photos/{test_photo.id}",
+        headers={"Authorization": f"Bearer {student_token}"},
+        json={"title": "한 번에"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "한 번에"
+    # User lookup + UPDATE ... RETURNING
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+
+    # Another user's photo is indistinguishable from a missing one
+    response = await client.put(
+        f"/api/v1/photos/{test_photo.id}",
+        headers={"Authorization": f"Bearer {teacher_token}"},
+        json={"title": "남의 사진"},
+    )
+    assert response.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_delete_photo(
     client: AsyncClient, db_session: AsyncSession, student_token: str
@@ -224,6 +276,65 @@ async def test_delete_photo(
     assert get_response.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_delete_photo_with_edit_history(
+    client: AsyncClient, db_session: AsyncSession, student_token: str
+):
+    """Test deleting a photo removes its edit history and files in one request."""
+    import os
+    from sqlalchemy import select
+    from app.models.edit_history import EditHistory
+
+    files = {"file": ("test.jpg", BytesIO(b"fake-image-data"), "image/jpeg")}
+    upload_response = await client.post(
+        "/api/v1/photos",
+        headers={"Authorization": f"Bearer {student_token}"},
+        files=files,
+    )
+    photo = upload_response.json()
+    file_path = photo["original_url"].lstrip("/")
+    assert os.path.exists(file_path)
+
+    for filter_name in ("warm", "cool"):
+        await client.post(
+            f"/api/photos/{photo['id']}/edits",
+            json={"filter_name": filter_name},
+            headers={"Authorization": f"Bearer {student_token}"},
+        )
+
+    response = await client.delete(
+        f"/api/v1/photos/{photo['id']}",
+        headers={"Authorization": f"Bearer {student_token}"},
+    )
+
+    assert response.status_code == 204
+    # User lookup + one DELETE ... RETURNING
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+    assert not os.path.exists(file_path)
+    remaining = await db_session.execute(
+        select(EditHistory).where(EditHistory.photo_id == photo["id"])
+    )
+    assert remaining.scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_delete_photo_not_own(
+    client: AsyncClient, student_token: str, teacher_token: str, test_photo
+):
+    """Test deleting another user's photo returns 404 and keeps it."""
+    response = await client.delete(
+        f"/api/v1/photos/{test_photo.id}",
+        headers={"Authorization": f"Bearer {teacher_token}"},
+    )
+    assert response.status_code == 404
+
+    response = await client.get(
+        f"/api/v1/photos/{test_photo.id}",
+        headers={"Authorization": f"Bearer {student_token}"},
+    )
+    assert response.status_code == 200
+
+
 @pytest.mark.asyncio
 async def test_photos_without_auth(client: AsyncClient):
     """Test accessing photos without authentication returns 401."""
@@ -233,3 +344,173 @@ async def test_photos_without_auth(client: AsyncClient):
     fake_photo_id = str(uuid4())
     response = await client.get(f"/api/v1/photos/{fake_photo_id}")
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_batch_photo_operations(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    student_token: str,
+    test_student,
+    test_session,
+):
+    """Test delete, move and metadata operations in one batch request."""
+    from app.models.photo import Photo
+
+    photos = [
+        Photo(user_id=test_student.id, original_url=f"/uploads/photos/{n}.jpg", title=f"p{n}")
+        for n in range(3)
+    ]
+    db_session.add_all(photos)
+    await db_session.commit()
+    missing_id = str(uuid4())
+
+    response = await client.post(
+        "/api/v1/photos:batch",
+        headers={"Authorization": f"Bearer {student_token}"},
+        json={
+            "operations": [
+                {"op": "delete", "photo_id": str(photos[0].id)},
+                {
+                    "op": "set_session",
+                    "photo_id": str(photos[1].id),
+                    "session_id": str(test_session.id),
+                },
+                {"op": "set_metadata", "photo_id": str(photos[2].id), "topic": " 바다 "},
+                {"op": "delete", "photo_id": missing_id},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [204, 200, 200, 404]
+    assert results[3]["photo_id"] == missing_id
+
+    listing = await client.get(
+        "/api/v1/photos", headers={"Authorization": f"Bearer {student_token}"}
+    )
+    by_id = {p["id"]: p for p in listing.json()}
+    assert str(photos[0].id) not in by_id
+    assert by_id[str(photos[1].id)]["session_id"] == str(test_session.id)
+    assert by_id[str(photos[2].id)]["topic"] == "바다"
+    assert by_id[str(photos[2].id)]["title"] == "p2"
+
+
+@pytest.mark.asyncio
+async def test_batch_scoped_to_owner(
+    client: AsyncClient, teacher_token: str, student_token: str, test_photo
+):
+    """Test batch operations never touch another user's photos or sessions."""
+    response = await client.post(
+        "/api/v1/photos:batch",
+        headers={"Authorization": f"Bearer {teacher_token}"},
+        json={"operations": [{"op": "delete", "photo_id": str(test_photo.id)}]},
+    )
+    assert response.json()["results"][0]["status"] == 404
+
+    response = await client.post(
+        "/api/v1/photos:batch",
+        headers={"Authorization": f"Bearer {student_token}"},
+        json={
+            "operations": [
+                {"op": "set_session", "photo_id": str(test_photo.id), "session_id": str(uuid4())}
+            ]
+        },
+    )
+    assert response.json()["results"][0]["status"] == 404
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_duplicate_photos(
+    client: AsyncClient, student_token: str, test_photo
+):
+    """Test a photo may appear only once per batch."""
+    response = await client.post(
+        "/api/v1/photos:batch",
+        headers={"Authorization": f"Bearer {student_token}"},
+        json={
+            "operations": [
+                {"op": "delete", "photo_id": str(test_photo.id)},
+                {"op": "set_metadata", "photo_id": str(test_photo.id), "title": "x"},
+            ]
+        },
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_photos_sparse_fields(
+    client: AsyncClient, student_token: str, test_photo
+):
+    """Test fields= returns only the requested columns, serialized like PhotoResponse."""
+    full = await client.get(
+        "/api/v1/photos", headers={"Authorization": f"Bearer {student_token}"}
+    )
+    response = await client.get(
+        "/api/v1/photos?fields=thumbnail_url,edited_url,created_at",
+        headers={"Authorization": f"Bearer {student_token}"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert list(data[0]) == ["id", "thumbnail_url", "edited_url", "created_at"]
+    assert data[0] == {key: full.json()[0][key] for key in data[0]}
+
+
+@pytest.mark.asyncio
+async def test_get_photos_unknown_field(client: AsyncClient, student_token: str):
+    """Test unknown fields are rejected."""
+    response = await client.get(
+        "/api/v1/photos?fields=id,password_hash",
+        headers={"Authorization": f"Bearer {student_token}"},
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_photos_fast_json_matches_default(
+    client: AsyncClient, student_token: str, monkeypatch
+):
+    """Test FAST_JSON_RESPONSES produces the same body as the response_model path."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    for title in ("Fast 1", "Fast 2"):
+        files = {"file": ("test.jpg", BytesIO(b"fake-image-data"), "image/jpeg")}
+        await client.post("/api/v1/photos", headers=headers, files=files, data={"title": title})
+
+    default = await client.get("/api/v1/photos", headers=headers)
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    fast = await client.get("/api/v1/photos", headers=headers)
+
+    assert fast.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == default.json()
+
+
+@pytest.mark.asyncio
+async def test_photo_editor_bootstrap(
+    client: AsyncClient, student_token: str, teacher_token: str, test_photo
+):
+    """Test the editor endpoint returns photo, filters and latest edit in one query."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    url = f"/api/v1/photos/{test_photo.id}/editor"
+
+    empty = await client.get(url, headers=headers)
+    assert empty.status_code == 200
+    assert empty.json()["photo"]["id"] == str(test_photo.id)
+    assert [f["id"] for f in empty.json()["filters"]][:2] == ["warm", "cool"]
+    assert empty.json()["latest_edit"] is None
+    assert 'desc="2 queries"' in empty.headers["server-timing"]
+
+    for filter_name in ("warm", "calm"):
+        await client.post(
+            f"/api/photos/{test_photo.id}/edits", headers=headers, json={"filter_name": filter_name}
+        )
+    response = await client.get(url, headers=headers)
+    assert response.json()["latest_edit"]["filter_name"] == "calm"
+
+    forbidden = await client.get(url, headers={"Authorization": f"Bearer {teacher_token}"})
+    assert forbidden.status_code == 404
+
@@ -0,0 +1,140 @@
+"""Tests for per-user and per-class storage quotas."""
+
+import os
+import pytest
+from io import BytesIO
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.photo import Photo
+from app.routes.photos import UPLOAD_DIR
+
+MB = 1024 * 1024
+
+
+def _upload(client: AsyncClient, token: str, size: int):
+    return client.post(
+        "/api/v1/photos",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("test.jpg", BytesIO(b"x" * size), "image/jpeg")},
+    )
+
+
+@pytest.mark.asyncio
+async def test_upload_aborted_when_user_quota_crossed(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    student_token: str,
+    test_student,
+    monkeypatch,
+):
+    """Test the copy stops at the crossing chunk and leaves nothing behind."""
+    monkeypatch.setattr(settings, "USER_STORAGE_QUOTA_BYTES", 3 * MB // 2)
+
+    response = await _upload(client, student_token, 3 * MB)
+
+    assert response.status_code == 413
+    assert response.json()["detail"] == "Storage quota exceeded"
+    assert os.listdir(os.path.join(UPLOAD_DIR, str(test_student.id))) == []
+    assert await db_session.scalar(select(func.count()).select_from(Photo)) == 0
+
+    assert (await _upload(client, student_token, MB)).status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_class_quota_refuses_before_copy(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    student_token: str,
+    teacher_token: str,
+    test_student,
+    test_teacher,
+    monkeypatch,
+):
+    """Test a full class refuses uploads and /users/me reports the usage."""
+    db_session.add(
+        Photo(user_id=test_teacher.id, original_url="/uploads/photos/t.jpg", size_bytes=850)
+    )
+    await db_session.commit()
+    monkeypatch.setattr(settings, "CLASS_STORAGE_QUOTA_BYTES", 1000)
+
+    assert (await _upload(client, student_token, 150)).status_code == 201
+    response = await _upload(client, student_token, 100)
+    assert response.status_code == 413
+    assert len(os.listdir(os.path.join(UPLOAD_DIR, str(test_student.id)))) == 1
+
+    # The client shares db_session; reload the trigger-maintained counters
+    await db_session.refresh(test_student)
+    me = await client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {student_token}"}
+    )
+    assert me.json()["storage"] == {
+        "bytes_used": 150,
+        "quota_bytes": settings.USER_STORAGE_QUOTA_BYTES,
+        "class_bytes_used": 1000,
+        "class_quota_bytes": 1000,
+    }
+    assert (await _upload(client, teacher_token, 1)).status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_unlimited_without_class(
+    client: AsyncClient, db_session: AsyncSession, test_teacher, monkeypatch
+):
+    """Test a student outside any class reports no class usage."""
+    from app.core.security import create_access_token, get_password_hash
+    from app.models.user import User
+
+    loner = User(
+        name="혼자",
+        email="loner@storylens.com",
+        password_hash=get_password_hash("password123"),
+        role="student",
+    )
+    db_session.add(loner)
+    await db_session.commit()
+    monkeypatch.setattr(settings, "USER_STORAGE_QUOTA_BYTES", None)
+    token = create_access_token(subject=str(loner.id))
+
+    assert (await _upload(client, token, MB)).status_code == 201
+    await db_session.refresh(loner)
+    me = await client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert me.json()["storage"] == {
+        "bytes_used": MB,
+        "quota_bytes": None,
+        "class_bytes_used": None,
+        "class_quota_bytes": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_upload_skips_usage_queries_without_quotas(
+    client: AsyncClient, student_token: str, monkeypatch
+):
+    """Test quotas that are off cost no query, and the class sum only its own."""
+    import re
+
+    def queries(response) -> int:
+        return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"])[1])
+
+    unlimited = await _upload(client, student_token, 100)
+    monkeypatch.setattr(settings, "USER_STORAGE_QUOTA_BYTES", MB)
+    user_quota = await _upload(client, student_token, 100)
+    monkeypatch.setattr(settings, "CLASS_STORAGE_QUOTA_BYTES", MB)
+    class_quota = await _upload(client, student_token, 100)
+
+    assert queries(user_quota) == queries(unlimited)
+    assert queries(class_quota) == queries(unlimited) + 1
+
+
+def test_empty_quota_setting_means_unlimited(monkeypatch):
+    """Test an empty quota env var loads as no limit."""
+    from app.core.config import Settings
+
+    monkeypatch.setenv("USER_STORAGE_QUOTA_BYTES", "")
+    monkeypatch.setenv("CLASS_STORAGE_QUOTA_BYTES", "2048")
+    loaded = Settings()
+    assert loaded.USER_STORAGE_QUOTA_BYTES is None
+    assert loaded.CLASS_STORAGE_QUOTA_BYTES == 2048
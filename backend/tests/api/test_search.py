@@ -0,0 +1,124 @@
+"""Tests for the photo search endpoint."""
+
+import pytest
+from datetime import date
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.photo import Photo
+from app.models.session import Session
+
+
+@pytest.fixture
+async def searchable_photos(db_session: AsyncSession, test_student):
+    trip = Session(user_id=test_student.id, date=date(2024, 7, 1), title="여름", keywords=["바다"])
+    db_session.add(trip)
+    await db_session.flush()
+    photos = {
+        name: Photo(user_id=test_student.id, original_url=f"/uploads/photos/{name}.jpg", **fields)
+        for name, fields in {
+            "exact": {"title": "바다"},
+            "prefix": {"title": "바다 풍경"},
+            "topic": {"title": "모래", "topic": "바다"},
+            "keyword": {"title": "조개", "session_id": trip.id},
+            "contains": {"title": "푸른 바다 위"},
+            "other": {"title": "산", "topic": "등산"},
+        }.items()
+    }
+    db_session.add_all(photos.values())
+    await db_session.commit()
+    return {name: str(photo.id) for name, photo in photos.items()}
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_matches(
+    client: AsyncClient, student_token: str, searchable_photos
+):
+    """Test exact title > exact topic > keyword > prefix > substring."""
+    response = await client.get(
+        "/api/v1/search", params={"q": "바다"}, headers={"Authorization": f"Bearer {student_token}"}
+    )
+
+    assert response.status_code == 200
+    ids = [photo["id"] for photo in response.json()]
+    expected = ["exact", "topic", "keyword", "prefix", "contains"]
+    assert ids == [searchable_photos[name] for name in expected]
+
+
+@pytest.mark.asyncio
+async def test_search_paginates_and_escapes(
+    client: AsyncClient, student_token: str, searchable_photos
+):
+    """Test skip/limit and that LIKE wildcards in the term are literal."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    page = await client.get(
+        "/api/v1/search", params={"q": "바다", "skip": 1, "limit": 2}, headers=headers
+    )
+    assert [p["id"] for p in page.json()] == [
+        searchable_photos["topic"],
+        searchable_photos["keyword"],
+    ]
+
+    wildcard = await client.get("/api/v1/search", params={"q": "%"}, headers=headers)
+    assert wildcard.json() == []
+
+
+@pytest.mark.asyncio
+async def test_search_class_scope(
+    client: AsyncClient,
+    student_token: str,
+    teacher_token: str,
+    searchable_photos,
+):
+    """Test teachers can search their class; students cannot."""
+    response = await client.get(
+        "/api/v1/search",
+        params={"q": "등산", "scope": "class"},
+        headers={"Authorization": f"Bearer {teacher_token}"},
+    )
+    assert [p["id"] for p in response.json()] == [searchable_photos["other"]]
+
+    mine = await client.get(
+        "/api/v1/search", params={"q": "등산"}, headers={"Authorization": f"Bearer {teacher_token}"}
+    )
+    assert mine.json() == []
+
+    forbidden = await client.get(
+        "/api/v1/search",
+        params={"q": "등산", "scope": "class"},
+        headers={"Authorization": f"Bearer {student_token}"},
+    )
+    assert forbidden.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_search_short_terms_match_prefixes_and_words(
+    client: AsyncClient, student_token: str, searchable_photos
+):
+    """Test terms too short for trigrams match prefixes and whole title words only."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+
+    prefix = await client.get("/api/v1/search", params={"q": "바"}, headers=headers)
+    assert {p["id"] for p in prefix.json()} == {
+        searchable_photos[name] for name in ("exact", "prefix", "topic")
+    }
+
+    infix = await client.get("/api/v1/search", params={"q": "다"}, headers=headers)
+    assert infix.json() == []
+
+    # "바다" is a whole word of "푸른 바다 위"
+    word = await client.get("/api/v1/search", params={"q": "바다"}, headers=headers)
+    assert searchable_photos["contains"] in [p["id"] for p in word.json()]
+
+
+@pytest.mark.asyncio
+async def test_search_long_terms_match_substrings(
+    client: AsyncClient, student_token: str, searchable_photos
+):
+    """Test terms of trigram length still match inside words."""
+    response = await client.get(
+        "/api/v1/search",
+        params={"q": "른 바"},
+        headers={"Authorization": f"Bearer {student_token}"},
+    )
+    assert [p["id"] for p in response.json()] == [searchable_photos["contains"]]
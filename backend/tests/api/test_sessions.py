@@ -1,5 +1,9 @@
 """Tests for Sessions API endpoints."""
 
+import csv
+import io
+import zipfile
+
 import pytest
 from httpx import AsyncClient
 
@@ -198,6 +202,26 @@ async def test_list_sessions_filter_by_year_and_month(
     assert all(item["date"].startswith("2024-03") for item in data)
 
 
+@pytest.mark.asyncio
+async def test_list_sessions_filter_by_keyword(
+    client: AsyncClient,
+    teacher_token: str,
+):
+    """Test filtering sessions by an exact keyword."""
+    headers = {"Authorization": f"Bearer {teacher_token}"}
+    for title, keywords in (("바다 촬영", ["바다", "여름"]), ("산 촬영", ["산"]), ("바닷가", ["바닷가"])):
+        await client.post(
+            "/api/v1/sessions",
+            json={"title": title, "date": "2024-07-01", "keywords": keywords},
+            headers=headers,
+        )
+
+    response = await client.get("/api/v1/sessions?keyword=바다", headers=headers)
+
+    assert response.status_code == 200
+    assert [s["title"] for s in response.json()] == ["바다 촬영"]
+
+
 @pytest.mark.asyncio
 async def test_list_sessions_filter_month_requires_year(
     client: AsyncClient,
@@ -241,6 +265,46 @@ async def test_update_session_keywords(
     assert data["keywords"] == ["여름", "미소"]
 
 
+@pytest.mark.asyncio
+async def test_list_sessions_conditional_get(
+    client: AsyncClient,
+    teacher_token: str,
+):
+    """Test If-None-Match returns 304 until a session changes."""
+    headers = {"Authorization": f"Bearer {teacher_token}"}
+    create_response = await client.post(
+        "/api/v1/sessions",
+        json={"title": "ETag 테스트", "date": "2024-06-10", "keywords": ["초기"]},
+        headers=headers,
+    )
+    session_id = create_response.json()["id"]
+
+    first = await client.get("/api/v1/sessions", headers=headers)
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert "last-modified" in first.headers
+
+    cached = await client.get("/api/v1/sessions", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    # Different query parameters are a different representation
+    other = await client.get(
+        "/api/v1/sessions?year=2024", headers={**headers, "If-None-Match": etag}
+    )
+    assert other.status_code == 200
+
+    await client.patch(
+        f"/api/v1/sessions/{session_id}/keywords",
+        json={"keywords": ["여름"]},
+        headers=headers,
+    )
+    changed = await client.get("/api/v1/sessions", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()[0]["keywords"] == ["여름"]
+
+
 @pytest.mark.asyncio
 async def test_create_session_invalid_date_format(
     client: AsyncClient,
@@ -281,3 +345,90 @@ async def test_create_session_missing_required_field(
     )
 
     assert response.status_code == 422  # Validation error
+
+
+@pytest.mark.asyncio
+async def test_export_session_zip(client: AsyncClient, student_token: str):
+    """Test the export streams stored photos plus a manifest."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    session = await client.post(
+        "/api/v1/sessions",
+        json={"title": "현장학습", "date": "2024-04-12", "keywords": []},
+        headers=headers,
+    )
+    session_id = session.json()["id"]
+    for name, content, title in (
+        ("a.jpg", b"first-image", "연못"),
+        ("b.png", b"second-image", None),
+    ):
+        await client.post(
+            "/api/v1/photos",
+            headers=headers,
+            files={"file": (name, io.BytesIO(content), "image/jpeg")},
+            data={"session_id": session_id, "topic": "봄", **({"title": title} if title else {})},
+        )
+
+    response = await client.get(f"/api/v1/sessions/{session_id}/export.zip", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    assert 'filename="session-2024-04-12.zip"' in response.headers["content-disposition"]
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    names = archive.namelist()
+    assert names[0] == "001_연못.jpg"
+    assert names[1].startswith("002_") and names[1].endswith(".png")
+    assert names[2] == "manifest.csv"
+    assert all(i.compress_type == zipfile.ZIP_STORED for i in archive.infolist()[:2])
+    assert archive.read(names[0]) == b"first-image"
+    assert archive.read(names[1]) == b"second-image"
+    manifest = list(csv.DictReader(io.StringIO(archive.read("manifest.csv").decode("utf-8-sig"))))
+    assert [row["title"] for row in manifest] == ["연못", ""]
+    assert [row["topic"] for row in manifest] == ["봄", "봄"]
+
+
+@pytest.mark.asyncio
+async def test_export_student_session_as_teacher(
+    client: AsyncClient, student_token: str, teacher_token: str
+):
+    """Test a teacher can export a session of one of their students."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    session = await client.post(
+        "/api/v1/sessions",
+        json={"title": "현장학습", "date": "2024-04-12", "keywords": []},
+        headers=headers,
+    )
+    session_id = session.json()["id"]
+    await client.post(
+        "/api/v1/photos",
+        headers=headers,
+        files={"file": ("a.jpg", io.BytesIO(b"student-image"), "image/jpeg")},
+        data={"session_id": session_id},
+    )
+
+    response = await client.get(
+        f"/api/v1/sessions/{session_id}/export.zip",
+        headers={"Authorization": f"Bearer {teacher_token}", "Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.read(archive.namelist()[0]) == b"student-image"
+
+
+@pytest.mark.asyncio
+async def test_export_session_zip_not_own(
+    client: AsyncClient, student_token: str, teacher_token: str
+):
+    """Test other users' sessions cannot be exported."""
+    session = await client.post(
+        "/api/v1/sessions",
+        json={"title": "남의 세션", "date": "2024-04-12", "keywords": []},
+        headers={"Authorization": f"Bearer {teacher_token}"},
+    )
+
+    response = await client.get(
+        f"/api/v1/sessions/{session.json()['id']}/export.zip",
+        headers={"Authorization": f"Bearer {student_token}"},
+    )
+    assert response.status_code == 404
@@ -0,0 +1,78 @@
+"""Per-request SQL instrumentation tests."""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.instrumentation import (
+    LazyLoadDetected,
+    QueryBudgetExceeded,
+    QueryStats,
+    _current_stats,
+)
+from app.models.photo import Photo
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(
+    client: AsyncClient, student_token: str, test_photo
+):
+    """Test responses report query count and DB time."""
+    response = await client.get(
+        "/api/v1/photos", headers={"Authorization": f"Bearer {student_token}"}
+    )
+
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    # One query for the user, one for the photo page
+    assert 'desc="2 queries"' in timing
+
+
+@pytest.mark.asyncio
+async def test_query_budget_enforced(db_session: AsyncSession, test_photo):
+    """Test strict mode raises once a request exceeds its query budget."""
+    token = _current_stats.set(QueryStats(budget=1))
+    try:
+        await db_session.execute(select(Photo))
+        with pytest.raises(QueryBudgetExceeded):
+            await db_session.execute(select(Photo))
+    finally:
+        _current_stats.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_lazy_load_detected(db_session: AsyncSession, test_photo):
+    """Test strict mode raises when a relationship is lazily loaded."""
+    photo_id = test_photo.id
+    db_session.expunge_all()
+    photo = (await db_session.execute(select(Photo).where(Photo.id == photo_id))).scalar_one()
+
+    token = _current_stats.set(QueryStats(budget=settings.SQL_QUERY_BUDGET))
+    try:
+        with pytest.raises(LazyLoadDetected):
+            await db_session.run_sync(lambda _: photo.session)
+    finally:
+        _current_stats.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_lazy_load_recorded_without_strict_mode(
+    db_session: AsyncSession, test_photo, monkeypatch
+):
+    """Test lazy loads are only recorded when strict mode is off."""
+    monkeypatch.setattr(settings, "SQL_STRICT_MODE", False)
+    photo_id = test_photo.id
+    db_session.expunge_all()
+    photo = (await db_session.execute(select(Photo).where(Photo.id == photo_id))).scalar_one()
+
+    stats = QueryStats(budget=settings.SQL_QUERY_BUDGET)
+    token = _current_stats.set(stats)
+    try:
+        session = await db_session.run_sync(lambda _: photo.session)
+    finally:
+        _current_stats.reset(token)
+
+    assert session.id == test_photo.session_id
+    assert len(stats.lazy_loads) == 1
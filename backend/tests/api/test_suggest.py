@@ -0,0 +1,74 @@
+"""Tests for keyword/topic autocomplete."""
+
+import pytest
+from httpx import AsyncClient
+from io import BytesIO
+
+from app.services.suggest import PrefixIndex
+
+
+def test_prefix_index_ranks_by_count():
+    """Test completions are case-insensitive and ordered by usage."""
+    index = PrefixIndex()
+    for term in ("바다", "바다", "바닷가", "Beach", "beach", "산"):
+        index.add(term)
+    index.remove("바닷가")
+
+    assert index.complete("바", 10) == [("바다", 2)]
+    assert index.complete("BE", 10) == [("Beach", 2)]
+    assert index.complete("x", 10) == []
+    assert len(index) == 3
+
+
+async def _suggest(client: AsyncClient, token: str, prefix: str) -> list:
+    response = await client.get(
+        "/api/v1/suggest",
+        params={"prefix": prefix},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_suggest_from_class_terms(
+    client: AsyncClient, student_token: str, teacher_token: str
+):
+    """Test suggestions come from keywords and topics across the class."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    for keywords in (["바다", "여름"], ["바다"]):
+        await client.post(
+            "/api/v1/sessions",
+            json={"title": "촬영", "date": "2024-07-01", "keywords": keywords},
+            headers=headers,
+        )
+    files = {"file": ("a.jpg", BytesIO(b"fake-image-data"), "image/jpeg")}
+    await client.post("/api/v1/photos", headers=headers, files=files, data={"topic": "바닷가"})
+
+    assert await _suggest(client, student_token, "바") == [
+        {"text": "바다", "count": 2},
+        {"text": "바닷가", "count": 1},
+    ]
+    # The teacher shares the class index
+    assert await _suggest(client, teacher_token, "여") == [{"text": "여름", "count": 1}]
+
+
+@pytest.mark.asyncio
+async def test_suggest_updates_on_writes(client: AsyncClient, student_token: str):
+    """Test creates and deletes after the index is built are reflected."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    assert await _suggest(client, student_token, "가") == []
+
+    await client.post(
+        "/api/v1/sessions",
+        json={"title": "가을", "date": "2024-10-01", "keywords": ["가을"]},
+        headers=headers,
+    )
+    files = {"file": ("a.jpg", BytesIO(b"fake-image-data"), "image/jpeg")}
+    photo = await client.post(
+        "/api/v1/photos", headers=headers, files=files, data={"topic": "가을"}
+    )
+    assert await _suggest(client, student_token, "가") == [{"text": "가을", "count": 2}]
+
+    await client.delete(f"/api/v1/photos/{photo.json()['id']}", headers=headers)
+    assert await _suggest(client, student_token, "가") == [{"text": "가을", "count": 1}]
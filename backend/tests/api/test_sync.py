@@ -0,0 +1,167 @@
+"""Tests for the delta sync endpoint."""
+
+import pytest
+from httpx import AsyncClient
+from io import BytesIO
+
+
+async def _sync(client: AsyncClient, headers: dict, since: str | None = None) -> dict:
+    params = {"since": since} if since is not None else {}
+    response = await client.get("/api/v1/sync", headers=headers, params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_sync_returns_changes_since_token(client: AsyncClient, student_token: str):
+    """Test sync reports created, updated and deleted rows after the token."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    start = await _sync(client, headers)
+    assert start["photos"] == {"updated": [], "deleted": []}
+
+    session = await client.post(
+        "/api/v1/sessions",
+        json={"title": "동기화", "date": "2024-05-01", "keywords": []},
+        headers=headers,
+    )
+    files = {"file": ("a.jpg", BytesIO(b"fake-image-data"), "image/jpeg")}
+    kept = await client.post("/api/v1/photos", headers=headers, files=files)
+    files = {"file": ("b.jpg", BytesIO(b"fake-image-data"), "image/jpeg")}
+    removed = await client.post("/api/v1/photos", headers=headers, files=files)
+    await client.put(
+        f"/api/v1/photos/{kept.json()['id']}", headers=headers, json={"title": "새 제목"}
+    )
+    edit = await client.post(
+        f"/api/photos/{kept.json()['id']}/edits",
+        headers=headers,
+        json={"filter_name": "vintage"},
+    )
+    await client.delete(f"/api/v1/photos/{removed.json()['id']}", headers=headers)
+
+    data = await _sync(client, headers, start["next_token"])
+
+    assert [p["id"] for p in data["photos"]["updated"]] == [kept.json()["id"]]
+    assert data["photos"]["updated"][0]["title"] == "새 제목"
+    assert data["photos"]["deleted"] == [removed.json()["id"]]
+    assert [s["id"] for s in data["sessions"]["updated"]] == [session.json()["id"]]
+    assert [e["id"] for e in data["edit_history"]["updated"]] == [edit.json()["id"]]
+    assert data["has_more"] is False
+
+    # Nothing new since the returned token
+    again = await _sync(client, headers, data["next_token"])
+    assert again["photos"] == {"updated": [], "deleted": []}
+    assert again["next_token"] == data["next_token"]
+
+
+@pytest.mark.asyncio
+async def test_sync_pages_with_limit(client: AsyncClient, student_token: str):
+    """Test has_more and next_token page through the change log."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    start = await _sync(client, headers)
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        files = {"file": (name, BytesIO(b"fake-image-data"), "image/jpeg")}
+        await client.post("/api/v1/photos", headers=headers, files=files)
+
+    seen = []
+    token = start["next_token"]
+    for _ in range(3):
+        response = await client.get(
+            "/api/v1/sync", headers=headers, params={"since": token, "limit": 2}
+        )
+        data = response.json()
+        seen += [p["id"] for p in data["photos"]["updated"]]
+        token = data["next_token"]
+        if not data["has_more"]:
+            break
+    assert len(seen) == 3
+
+
+@pytest.mark.asyncio
+async def test_sync_scoped_to_user(
+    client: AsyncClient, student_token: str, teacher_token: str
+):
+    """Test other users' changes are not returned."""
+    start = await _sync(client, {"Authorization": f"Bearer {student_token}"})
+    files = {"file": ("a.jpg", BytesIO(b"fake-image-data"), "image/jpeg")}
+    await client.post(
+        "/api/v1/photos", headers={"Authorization": f"Bearer {teacher_token}"}, files=files
+    )
+
+    data = await _sync(
+        client, {"Authorization": f"Bearer {student_token}"}, start["next_token"]
+    )
+    assert data["photos"]["updated"] == []
+
+
+@pytest.mark.asyncio
+async def test_sync_invalid_token(client: AsyncClient, student_token: str):
+    """Test malformed tokens are rejected."""
+    response = await client.get(
+        "/api/v1/sync",
+        headers={"Authorization": f"Bearer {student_token}"},
+        params={"since": "not-a-token"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_sync_reports_session_photo_count(
+    client: AsyncClient, db_session, student_token: str, test_session
+):
+    """Test uploads into a session sync the session's new photo_count."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    start = await _sync(client, headers)
+    for name in ("a.jpg", "b.jpg"):
+        files = {"file": (name, BytesIO(b"fake-image-data"), "image/jpeg")}
+        await client.post(
+            "/api/v1/photos",
+            headers=headers,
+            files=files,
+            data={"session_id": str(test_session.id)},
+        )
+
+    # The client shares db_session; drop its pre-trigger copy of the session
+    db_session.expire(test_session)
+    data = await _sync(client, headers, start["next_token"])
+    assert [s["id"] for s in data["sessions"]["updated"]] == [str(test_session.id)]
+    assert data["sessions"]["updated"][0]["photo_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_prune_keeps_window_and_asks_old_tokens_to_resync(
+    client: AsyncClient, db_session, test_engine, student_token: str
+):
+    """Test pruning drops old entries and /sync answers older tokens with resync."""
+    from datetime import datetime, timedelta
+    from sqlalchemy import func, select, update
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from app.models.change_log import ChangeLog
+    from app.services.change_log_prune import prune_change_log
+
+    headers = {"Authorization": f"Bearer {student_token}"}
+    old_token = (await _sync(client, headers))["next_token"]
+    files = {"file": ("a.jpg", BytesIO(b"fake-image-data"), "image/jpeg")}
+    await client.post("/api/v1/photos", headers=headers, files=files)
+    await db_session.execute(
+        update(ChangeLog).values(created_at=datetime.utcnow() - timedelta(days=40))
+    )
+    await db_session.commit()
+    recent_token = (await _sync(client, headers))["next_token"]
+    files = {"file": ("b.jpg", BytesIO(b"fake-image-data"), "image/jpeg")}
+    recent = await client.post("/api/v1/photos", headers=headers, files=files)
+
+    sessionmaker = async_sessionmaker(test_engine, expire_on_commit=False)
+    progress = []
+    assert await prune_change_log(
+        sessionmaker, retention_days=30, batch_size=1, progress=progress.append
+    ) == 1
+    assert progress == [1]
+    assert await db_session.scalar(select(func.count()).select_from(ChangeLog)) == 1
+    assert await prune_change_log(sessionmaker, retention_days=30) == 0
+
+    stale = await _sync(client, headers, old_token)
+    assert stale["resync"] is True
+    assert stale["photos"] == {"updated": [], "deleted": []}
+    current = await _sync(client, headers, recent_token)
+    assert current["resync"] is False
+    assert [p["id"] for p in current["photos"]["updated"]] == [recent.json()["id"]]
@@ -0,0 +1,171 @@
+"""Tests for the maintained photo_count/bytes_used counters."""
+
+import asyncio
+import pytest
+from io import BytesIO
+from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.models.photo import Photo
+from app.models.session import Session
+from app.models.user import User
+from app.services.usage_counters import reconcile_usage_counters, restat_photo_sizes
+
+
+async def _counters(db: AsyncSession, model, row_id) -> tuple[int, int]:
+    result = await db.execute(
+        select(model.photo_count, model.bytes_used).where(model.id == row_id)
+    )
+    return tuple(result.one())
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_upload_move_and_delete(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    student_token: str,
+    test_student,
+    test_session,
+):
+    """Test users and sessions counters change in the writing transaction."""
+    headers = {"Authorization": f"Bearer {student_token}"}
+    uploaded = await client.post(
+        "/api/v1/photos",
+        headers=headers,
+        files={"file": ("test.jpg", BytesIO(b"x" * 1000), "image/jpeg")},
+        data={"session_id": str(test_session.id)},
+    )
+    photo_id = uploaded.json()["id"]
+    await client.post(
+        "/api/v1/photos",
+        headers=headers,
+        files={"file": ("test.jpg", BytesIO(b"x" * 500), "image/jpeg")},
+    )
+
+    assert await _counters(db_session, User, test_student.id) == (2, 1500)
+    assert await _counters(db_session, Session, test_session.id) == (1, 1000)
+    # The client shares db_session; drop its pre-trigger copy of the session
+    db_session.expire(test_session)
+    sessions = await client.get("/api/v1/sessions", headers=headers)
+    assert sessions.json()[0]["photo_count"] == 1
+
+    other = Session(user_id=test_student.id, date=test_session.date, title="다른 세션")
+    db_session.add(other)
+    await db_session.commit()
+    await client.post(
+        "/api/v1/photos:batch",
+        headers=headers,
+        json={
+            "operations": [
+                {"op": "set_session", "photo_id": photo_id, "session_id": str(other.id)}
+            ]
+        },
+    )
+    assert await _counters(db_session, Session, test_session.id) == (0, 0)
+    assert await _counters(db_session, Session, other.id) == (1, 1000)
+    assert await _counters(db_session, User, test_student.id) == (2, 1500)
+
+    response = await client.delete(f"/api/v1/photos/{photo_id}", headers=headers)
+    assert response.status_code == 204
+    assert await _counters(db_session, User, test_student.id) == (1, 500)
+    assert await _counters(db_session, Session, other.id) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_reconciliation_fixes_drift(
+    db_session: AsyncSession, test_engine: AsyncEngine, test_student, test_teacher, test_session
+):
+    """Test the job rewrites only drifted counters and is idempotent."""
+    db_session.add_all(
+        Photo(
+            user_id=test_student.id,
+            session_id=test_session.id,
+            original_url=f"/uploads/photos/{n}.jpg",
+            size_bytes=100,
+        )
+        for n in range(3)
+    )
+    await db_session.commit()
+    await db_session.execute(
+        update(User).where(User.id == test_student.id).values(photo_count=7, bytes_used=0)
+    )
+    await db_session.execute(update(Session).values(bytes_used=-5))
+    await db_session.commit()
+
+    sessionmaker = async_sessionmaker(test_engine, expire_on_commit=False)
+    progress = []
+    users, fixed = await reconcile_usage_counters(
+        sessionmaker, batch_size=1, progress=lambda *args: progress.append(args)
+    )
+
+    assert (users, fixed) == (2, 2)
+    assert len(progress) == 2
+    assert await _counters(db_session, User, test_student.id) == (3, 300)
+    assert await _counters(db_session, User, test_teacher.id) == (0, 0)
+    assert await _counters(db_session, Session, test_session.id) == (3, 300)
+    assert await reconcile_usage_counters(sessionmaker) == (2, 0)
+
+
+@pytest.mark.asyncio
+async def test_upload_and_keyword_update_do_not_deadlock(
+    db_session: AsyncSession, test_engine: AsyncEngine, test_student, test_session
+):
+    """Test the photo triggers lock the session before facet rows."""
+    await db_session.execute(
+        update(Session).where(Session.id == test_session.id).values(keywords=["봄"])
+    )
+    db_session.add(
+        Photo(user_id=test_student.id, session_id=test_session.id, original_url="/a.jpg")
+    )
+    await db_session.commit()
+
+    sessionmaker = async_sessionmaker(test_engine, expire_on_commit=False)
+    async with sessionmaker() as renaming, sessionmaker() as uploading:
+        # A keyword update holds the session row, then needs the facet rows
+        await renaming.execute(
+            select(Session.id)
+            .where(Session.id == test_session.id)
+            .with_for_update(key_share=True)
+        )
+        uploading.add(
+            Photo(user_id=test_student.id, session_id=test_session.id, original_url="/b.jpg")
+        )
+        upload = asyncio.create_task(uploading.commit())
+        await asyncio.sleep(0.2)
+        await renaming.execute(
+            update(Session).where(Session.id == test_session.id).values(keywords=["여름"])
+        )
+        await renaming.commit()
+        await upload
+
+    assert await _counters(db_session, Session, test_session.id) == (2, 0)
+
+
+@pytest.mark.asyncio
+async def test_restat_fills_zero_sizes_from_files(
+    db_session: AsyncSession, test_engine: AsyncEngine, test_student, test_session
+):
+    """Test zero-size photos get their file size and the counters follow."""
+    import os
+    from app.routes.photos import UPLOAD_DIR
+
+    user_dir = os.path.join(UPLOAD_DIR, str(test_student.id))
+    os.makedirs(user_dir, exist_ok=True)
+    with open(os.path.join(user_dir, "found.jpg"), "wb") as f:
+        f.write(b"x" * 300)
+    db_session.add_all(
+        Photo(
+            user_id=test_student.id,
+            session_id=test_session.id,
+            original_url=f"/uploads/photos/{test_student.id}/{name}",
+        )
+        for name in ("found.jpg", "missing.jpg")
+    )
+    await db_session.commit()
+
+    sessionmaker = async_sessionmaker(test_engine, expire_on_commit=False)
+    assert await restat_photo_sizes(sessionmaker, batch_size=1) == (2, 1)
+    assert await _counters(db_session, User, test_student.id) == (2, 300)
+    assert await _counters(db_session, Session, test_session.id) == (2, 300)
+    assert await restat_photo_sizes(sessionmaker) == (1, 0)
@@ -3,6 +3,8 @@
 @TASK P1-R2-T1 - Users API
 RED phase: Write tests that should fail
 """
+import json
+
 import pytest
 from httpx import AsyncClient
 from app.models.user import User
@@ -162,3 +164,59 @@ class TestListStudents:
         """Unauthenticated request should return 401."""
         response = await client.get("/api/v1/users")
         assert response.status_code == 401
+
+
+class TestExportClass:
+    """Test GET /api/v1/users/export.ndjson endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_export_class_as_teacher(
+        self, client: AsyncClient, db_session, teacher_token: str, test_student: User, test_photo
+    ):
+        """Teacher gets every student's rows as NDJSON, gzip-compressed."""
+        from app.models.edit_history import EditHistory
+
+        db_session.add_all(
+            [
+                EditHistory(photo_id=test_photo.id, filter_name="vintage"),
+                EditHistory(photo_id=test_photo.id, delta={"filter_name": "mono"}),
+            ]
+        )
+        await db_session.commit()
+
+        response = await client.get(
+            "/api/v1/users/export.ndjson",
+            headers={"Authorization": f"Bearer {teacher_token}", "Accept-Encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["type"] for line in lines] == ["student", "session", "photo", "edit", "edit"]
+        assert lines[0]["data"]["id"] == str(test_student.id)
+        assert lines[2]["data"]["id"] == str(test_photo.id)
+        # Delta entries are exported as full states
+        assert [line["data"]["filter_name"] for line in lines[3:]] == ["vintage", "mono"]
+
+    @pytest.mark.asyncio
+    async def test_export_class_uncompressed(
+        self, client: AsyncClient, teacher_token: str, test_student: User
+    ):
+        """Without gzip in Accept-Encoding the body is plain NDJSON."""
+        response = await client.get(
+            "/api/v1/users/export.ndjson",
+            headers={"Authorization": f"Bearer {teacher_token}", "Accept-Encoding": "identity"},
+        )
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert json.loads(response.content.splitlines()[0])["type"] == "student"
+
+    @pytest.mark.asyncio
+    async def test_export_class_as_student_forbidden(
+        self, client: AsyncClient, student_token: str
+    ):
+        """Students cannot export."""
+        response = await client.get(
+            "/api/v1/users/export.ndjson",
+            headers={"Authorization": f"Bearer {student_token}"},
+        )
+        assert response.status_code == 403